@@ -29,6 +29,8 @@ resource "aws_ecs_task_definition" "demo_api" {
       cpu       = 256
       memory    = 512
       essential = true
+      # SIGTERM から SIGKILL までの猶予。アプリの停止時間（登録解除待ち 10 + graceful 10 + ドレイン 5 = 25秒）より長くする
+      stopTimeout = 30
       portMappings = [
         {
           containerPort = 8080
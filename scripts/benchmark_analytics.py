@@ -0,0 +1,155 @@
+"""
+分析スナップショットとORMループの比較計測（1テナント100万行）
+
+目的: GET /{tenant_id}/items/analytics の計算について、列形式スナップショット（services/analytics_service.py）と、
+      一覧をORMオブジェクトで取得して Python でループする方式の時間・メモリを比較する
+影響範囲: なし（開発・計測用ツール）
+前提条件: requirements.txt の依存関係（numpy）、benchmark_observability.py（同ディレクトリ）
+
+方式:
+    - アプリのプロセス内（src を import）で計測する。DB は既定で一時ディレクトリの SQLite
+    - テナントに --rows 件を直接投入する（既に --rows 件以上ある場合は投入しない）
+    - orm_loop: 指標ごとに session.query(Item)（作成日時順）で全件取得し、Python のループで値を作り、
+      statistics.quantiles でパーセンタイルを求める（1リクエストあたりの処理に相当）
+    - snapshot_build: スナップショットの全件読み込み（起動後・ANALYTICS_REBUILD_SECONDS ごとの最初のリクエスト）
+    - snapshot: 読み込み済みスナップショットからの計算（ANALYTICS_REFRESH_SECONDS 以内のリクエスト）
+    - 時間は --repeat 回の最小値（snapshot_build は1回）
+    - --memory を指定すると tracemalloc のピークも計測する（計測中は処理が遅くなるため時間とは別に実行）
+
+使用例（リポジトリのルートで実行）:
+    python scripts/benchmark_analytics.py
+    python scripts/benchmark_analytics.py --rows 100000 --memory
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmark_observability import SRC_DIR, bulk_seed
+
+PERCENTILES = [50, 90, 99]
+
+
+def orm_values(metric: str, tenant_id: str) -> List[float]:
+    """
+    ORMオブジェクトを全件取得し、Python のループで指標の値を作る
+    """
+    from models.item import Item
+    from repositories.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        items = db.query(Item).filter(Item.tenant_id == tenant_id).order_by(Item.created_at, Item.id).all()
+        if metric == "name_length":
+            return [float(len(item.name)) for item in items]
+        if metric == "create_gap_seconds":
+            return [
+                (current.created_at - previous.created_at).total_seconds()
+                for previous, current in zip(items, items[1:])
+            ]
+        hours = Counter(int(item.created_at.timestamp()) // 3600 for item in items)
+        if not hours:
+            return []
+        first, last = min(hours), max(hours)
+        return [float(hours.get(hour, 0)) for hour in range(first, last + 1)]
+    finally:
+        db.close()
+
+
+def orm_loop(metric: str, tenant_id: str) -> Dict[str, Any]:
+    values = orm_values(metric, tenant_id)
+    points = statistics.quantiles(values, n=100) if len(values) > 1 else values * 99
+    return {f"p{p}": points[p - 1] for p in PERCENTILES}
+
+
+def timed(func: Callable[[], Any], repeat: int, memory: bool) -> Dict[str, Any]:
+    """
+    func の実行時間（ms、repeat 回の最小値）と、memory=True の場合は tracemalloc のピーク（MB）
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    result: Dict[str, Any] = {"ms": round(best * 1000, 2)}
+    if memory:
+        tracemalloc.start()
+        func()
+        result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+        tracemalloc.stop()
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare the analytics snapshot with an ORM loop")
+    parser.add_argument("--rows", type=int, default=1000000, help="テナントの件数")
+    parser.add_argument("--metrics", default="name_length,create_gap_seconds,hourly_creates")
+    parser.add_argument("--repeat", type=int, default=3, help="計測の繰り返し回数（最小値を採る）")
+    parser.add_argument("--tenant", default="tenant-a")
+    parser.add_argument("--database-url", default=None, help="省略時は一時ディレクトリの SQLite")
+    parser.add_argument("--memory", action="store_true", help="tracemalloc のピークも計測")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="analytics-bench-")
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    # 設定は import 時に環境変数から読み込まれるため、src の import より前に設定する
+    os.environ.update({
+        "DATABASE_URL": database_url,
+        "DD_TRACE_ENABLED": "false",
+        "DD_METRICS_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+        # 計測中に差分読み込み・全件読み直しを行わない
+        "ANALYTICS_REFRESH_SECONDS": "3600",
+        "ANALYTICS_REBUILD_SECONDS": "3600",
+        "ANALYTICS_MAX_ROWS": str(max(5000000, args.rows)),
+    })
+    sys.path.insert(0, SRC_DIR)
+
+    from repositories.database import init_db
+    from services.analytics_service import AnalyticsService
+
+    init_db()
+    print(f"seeding {args.tenant}: {args.rows} items", file=sys.stderr)
+    bulk_seed(database_url, args.tenant, args.rows)
+
+    metrics = [metric.strip() for metric in args.metrics.split(",") if metric.strip()]
+    results: List[Dict[str, Any]] = []
+
+    print("building snapshot", file=sys.stderr)
+    build = timed(lambda: AnalyticsService._snapshots.clear() or AnalyticsService.get_snapshot(args.tenant), 1, args.memory)
+    snapshot = AnalyticsService.get_snapshot(args.tenant)
+    results.append({"method": "snapshot_build", "metric": "-", "rows": snapshot.size,
+                    "snapshot_bytes": snapshot.nbytes, **build})
+
+    for metric in metrics:
+        print(f"measuring {metric}", file=sys.stderr)
+        analyzed = timed(lambda: AnalyticsService.analyze(args.tenant, metric, PERCENTILES), args.repeat, args.memory)
+        results.append({"method": "snapshot", "metric": metric, "rows": snapshot.size, **analyzed})
+        looped = timed(lambda: orm_loop(metric, args.tenant), args.repeat, args.memory)
+        results.append({"method": "orm_loop", "metric": metric, "rows": snapshot.size, **looped})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    header = f"{'method':<15} {'metric':<19} {'rows':>9} {'ms':>11}" + (f" {'peak MB':>9}" if args.memory else "")
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        line = f"{result['method']:<15} {result['metric']:<19} {result['rows']:>9} {result['ms']:>11.2f}"
+        if args.memory:
+            line += f" {result['peak_mb']:>9.1f}"
+        print(line)
+    print(f"\nスナップショット {results[0]['snapshot_bytes'] / 1e6:.1f} MB（{results[0]['rows']} 行）")
+
+
+if __name__ == "__main__":
+    main()
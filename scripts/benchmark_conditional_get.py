@@ -0,0 +1,147 @@
+"""
+条件付きGET（ETag / 304）のポーリング計測
+
+目的: 一覧を定期的にポーリングするクライアントについて、If-None-Match を送る場合と送らない場合の
+      1ポーリングあたりの転送量・サーバーCPU時間・レイテンシを比較する
+影響範囲: なし（開発・計測用ツール）
+前提条件: requirements.txt の依存関係、benchmark_observability.py（同ディレクトリ）
+
+方式:
+    - アプリを uvicorn のサブプロセスで起動し、テナントに --items 件を直接投入する
+    - full: If-None-Match なしで GET /{tenant_id}/items を --polls 回
+    - etag: 直前のレスポンスの ETag を If-None-Match に付けて --polls 回（未変更なら304）
+    - --change-every N を指定すると N ポーリングごとに1件作成する（ETag が変わり、次のポーリングは200）
+    - bytes/poll はステータス行・ヘッダ・本体の合計（圧縮なし: Accept-Encoding は identity）
+    - server CPU ms/poll はアプリのプロセスのCPU時間（/proc、Linux のみ）の増分をポーリング数で割ったもの
+
+使用例（リポジトリのルートで実行）:
+    python scripts/benchmark_conditional_get.py --items 1000 --polls 2000
+    python scripts/benchmark_conditional_get.py --items 1000 --polls 2000 --change-every 10
+"""
+
+import argparse
+import http.client
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmark_observability import app_server, bulk_seed, process_cpu_seconds
+
+MODES = ("full", "etag")
+
+
+def poll(port: int, path: str, polls: int, use_etag: bool, change_every: int, tenant_id: str) -> Dict[str, Any]:
+    """
+    1本の keep-alive 接続で polls 回ポーリングする
+
+    Returns:
+        Dict[str, Any]: {"polls", "not_modified", "bytes_per_poll", "p50_ms", "p99_ms"}
+    """
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    etag: Optional[str] = None
+    latencies: List[float] = []
+    total_bytes = 0
+    not_modified = 0
+    for index in range(polls):
+        if change_every and index and index % change_every == 0:
+            body = json.dumps({"name": f"poll-change-{index}"}).encode("utf-8")
+            connection.request("POST", f"/{tenant_id}/items", body=body, headers={"Content-Type": "application/json"})
+            connection.getresponse().read()
+
+        headers = {"Accept-Encoding": "identity"}
+        if use_etag and etag:
+            headers["If-None-Match"] = etag
+        started = time.perf_counter()
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        body = response.read()
+        latencies.append(time.perf_counter() - started)
+
+        status_line = f"HTTP/1.1 {response.status} {response.reason}\r\n"
+        total_bytes += len(status_line) + len(str(response.headers)) + len(body)
+        if response.status == 304:
+            not_modified += 1
+        elif response.status != 200:
+            raise RuntimeError(f"GET {path} returned {response.status}")
+        etag = response.getheader("ETag") or etag
+    connection.close()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "polls": polls,
+        "not_modified": not_modified,
+        "bytes_per_poll": round(total_bytes / polls),
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare polling bandwidth and CPU with and without ETag/304")
+    parser.add_argument("--items", type=int, default=1000, help="テナントの件数")
+    parser.add_argument("--polls", type=int, default=2000, help="モードごとのポーリング回数")
+    parser.add_argument("--change-every", type=int, default=0, help="N ポーリングごとに1件作成（0 で変更なし）")
+    parser.add_argument("--tenant", default="tenant-a")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--database-url", default=None, help="省略時は一時ディレクトリの SQLite")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    parser.add_argument("--verbose", action="store_true", help="アプリの標準エラー出力を表示")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="etag-bench-")
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    env = {
+        "DATABASE_URL": database_url,
+        "DD_TRACE_ENABLED": "false",
+        "DD_PATCH_MODULES": "",
+        "DD_METRICS_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+    }
+    path = f"/{args.tenant}/items"
+
+    results = []
+    with app_server(args.port, env, verbose=args.verbose) as process:
+        bulk_seed(database_url, args.tenant, args.items)
+        for mode in MODES:
+            use_etag = mode == "etag"
+            # ウォームアップ（接続・初回のコード実行を計測から除く）
+            poll(args.port, path, min(50, args.polls), use_etag, 0, args.tenant)
+            cpu_before = process_cpu_seconds(process.pid)
+            result = poll(args.port, path, args.polls, use_etag, args.change_every, args.tenant)
+            cpu_after = process_cpu_seconds(process.pid)
+            result["mode"] = mode
+            result["server_cpu_ms_per_poll"] = (
+                round((cpu_after - cpu_before) / args.polls * 1000, 3)
+                if cpu_before is not None and cpu_after is not None else None
+            )
+            results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    header = f"{'mode':<6} {'polls':>6} {'304':>6} {'bytes/poll':>11} {'cpu ms/poll':>12} {'p50 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        cpu = result["server_cpu_ms_per_poll"]
+        print(
+            f"{result['mode']:<6} {result['polls']:>6} {result['not_modified']:>6} {result['bytes_per_poll']:>11} "
+            f"{cpu if cpu is not None else '-':>12} {result['p50_ms']:>8.3f} {result['p99_ms']:>8.3f}"
+        )
+    full, etag = results
+    print(
+        f"\n{args.items} 件のテナント。etag は full に対して転送量 {etag['bytes_per_poll'] / full['bytes_per_poll']:.1%}"
+        + (
+            f"、サーバーCPU {etag['server_cpu_ms_per_poll'] / full['server_cpu_ms_per_poll']:.1%}"
+            if full["server_cpu_ms_per_poll"] and etag["server_cpu_ms_per_poll"] is not None else ""
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
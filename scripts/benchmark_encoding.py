@@ -0,0 +1,125 @@
+"""
+レスポンスエンコーディングの計測（エンコード時間・ペイロードサイズ）
+
+目的: 一覧レスポンス（100 / 10,000 / 100,000 件）について、JSON、MessagePack、圧縮した JSON（gzip / brotli）の
+      エンコード時間と本体サイズを比較する（帯域 ⇔ CPU のトレードオフの確認）
+影響範囲: なし（開発・計測用ツール）
+前提条件: requirements.txt の依存関係（msgpack、brotli）
+
+方式:
+    - 一覧の要素は Item.to_dict() と同じ形の辞書（変換済み。DB読み込み・to_dict の時間は含めない）
+    - json: JSONResponse.render（アプリの JSON レスポンスと同じ変換）
+    - msgpack: msgpack.packb（render() と同じ引数）
+    - json+gzip / json+br: JSON への変換 + compress_body（RESPONSE_GZIP_LEVEL / RESPONSE_BROTLI_QUALITY、
+      CompressionMiddleware と同じ圧縮）。--gzip-level / --brotli-quality で変更可能
+    - 時間は --repeat 回の最小値
+
+使用例（リポジトリのルートで実行）:
+    python scripts/benchmark_encoding.py
+    python scripts/benchmark_encoding.py --sizes 100,10000 --brotli-quality 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+import msgpack  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from config.settings import settings  # noqa: E402
+from infrastructure.response_encoding import compress_body  # noqa: E402
+
+FORMATS = ("json", "msgpack", "json+gzip", "json+br")
+
+
+def build_items(count: int) -> List[Dict[str, Any]]:
+    """
+    一覧レスポンスの要素（Item.to_dict() と同じキー・値の形）
+    """
+    base = datetime(2025, 1, 1)
+    return [
+        {
+            "id": index + 1,
+            "tenant_id": "tenant-a",
+            "name": f"Sample Item {index + 1}",
+            "description": f"Benchmark item {index + 1} for response encoding",
+            "created_at": (base + timedelta(seconds=index)).isoformat() + "Z",
+            "updated_at": (base + timedelta(seconds=index)).isoformat() + "Z",
+        }
+        for index in range(count)
+    ]
+
+
+def encoders(gzip_level: int, brotli_quality: int) -> Dict[str, Callable[[List[Dict[str, Any]]], bytes]]:
+    def to_json(content: List[Dict[str, Any]]) -> bytes:
+        return JSONResponse(content).body
+
+    return {
+        "json": to_json,
+        "msgpack": lambda content: msgpack.packb(content, use_bin_type=True),
+        "json+gzip": lambda content: compress_body(to_json(content), "gzip", gzip_level, brotli_quality),
+        "json+br": lambda content: compress_body(to_json(content), "br", gzip_level, brotli_quality),
+    }
+
+
+def measure(encode: Callable[[List[Dict[str, Any]]], bytes], items: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    """
+    エンコード時間（ms、最小値）と本体サイズ（バイト）
+    """
+    body = encode(items)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encode(items)
+        best = min(best, time.perf_counter() - started)
+    return {"encode_ms": round(best * 1000, 3), "bytes": len(body)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare encode time and payload size of JSON, MessagePack and compressed JSON")
+    parser.add_argument("--sizes", default="100,10000,100000", help="一覧の件数（カンマ区切り）")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数（最小値を採る）")
+    parser.add_argument("--gzip-level", type=int, default=settings.RESPONSE_GZIP_LEVEL)
+    parser.add_argument("--brotli-quality", type=int, default=settings.RESPONSE_BROTLI_QUALITY)
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    formats = encoders(args.gzip_level, args.brotli_quality)
+
+    results = []
+    for size in sizes:
+        items = build_items(size)
+        for name in FORMATS:
+            # 大きい一覧は1回が長いため繰り返しを減らす
+            repeat = args.repeat if size <= 10000 else max(1, args.repeat // 2)
+            result = measure(formats[name], items, repeat)
+            result.update({"items": size, "format": name})
+            results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    header = f"{'items':>7} {'format':<10} {'encode ms':>10} {'bytes':>11} {'vs json':>8} {'µs/item':>8}"
+    print(header)
+    print("-" * len(header))
+    json_bytes = {r["items"]: r["bytes"] for r in results if r["format"] == "json"}
+    for result in results:
+        ratio = result["bytes"] / json_bytes[result["items"]]
+        print(
+            f"{result['items']:>7} {result['format']:<10} {result['encode_ms']:>10.3f} {result['bytes']:>11} "
+            f"{ratio:>8.1%} {result['encode_ms'] * 1000 / result['items']:>8.2f}"
+        )
+    print(f"\ngzip level {args.gzip_level}, brotli quality {args.brotli_quality}（圧縮の時間は JSON 変換を含む）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+リクエストログのオーバーヘッド計測
+
+目的: 1リクエストで3行のログを出力する場合の時間・メモリ割り当てを、
+      従来の書き方（f-string の即時展開、extra の辞書、レコードごとの tracer.current_span()）と
+      リクエストログコンテキスト（LogContextMiddleware、%s 形式の遅延展開）で比較する
+影響範囲: なし（開発・計測用ツール）
+前提条件: requirements.txt の依存関係（ddtrace）
+
+方式:
+    - legacy: ハンドラ相当の3行を f-string + extra={"tenant_id": ...} で出力し、
+              従来の JSONFormatter（LegacyJSONFormatter: レコードごとの tracer.current_span()、hasattr、json.dumps）で変換
+    - context: ログコンテキストを1回設定し、3行を %s 形式の引数で出力（現在の JSONFormatter）
+    - それぞれ INFO（出力される）と WARNING（出力されない）のログレベルで計測
+    - 出力先は破棄するストリーム（JSONFormatter の処理までを含む）
+    - 時間と、1リクエスト中の一時メモリ使用量の最大増分（tracemalloc）を出力
+    - format µs/line はフォーマッター単体（LogRecord 生成・呼び出し元の特定を除く）の1行あたりの時間
+
+使用例（リポジトリのルートで実行）:
+    python scripts/benchmark_logging.py --requests 20000
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from datetime import datetime  # noqa: E402
+
+from ddtrace import tracer  # noqa: E402
+
+from config.settings import settings  # noqa: E402
+from infrastructure.logger import JSONFormatter, RequestLogContext, _log_context  # noqa: E402
+
+TENANT_ID = "tenant-a"
+ITEMS = list(range(20))
+
+
+class _NullStream(io.TextIOBase):
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+class LegacyJSONFormatter(logging.Formatter):
+    """
+    ログコンテキスト導入前の JSONFormatter（比較用、出力フィールドは当時のもの）
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_data: Dict[str, Any] = {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+            "service": settings.DD_SERVICE,
+            "env": settings.DD_ENV,
+        }
+        span = tracer.current_span()
+        if span:
+            log_data["dd.trace_id"] = span.trace_id
+            log_data["dd.span_id"] = span.span_id
+        for field in (
+            "tenant_id", "error_type", "severity", "health_check_level", "health_check_type",
+            "startup_profile", "warmup", "circuit_breaker", "drain", "memory", "db",
+        ):
+            if hasattr(record, field):
+                log_data[field] = getattr(record, field)
+        if record.levelname == "ERROR":
+            log_data["status"] = "error"
+            if hasattr(record, "tenant_id"):
+                log_data["tenant"] = record.tenant_id
+        if record.exc_info:
+            log_data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log_data, ensure_ascii=False)
+
+
+def build_logger(level: int, formatter: logging.Formatter) -> logging.Logger:
+    logger = logging.getLogger(f"benchmark-logging-{logging.getLevelName(level)}-{type(formatter).__name__}")
+    logger.handlers.clear()
+    handler = logging.StreamHandler(_NullStream())
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+class _Route:
+    path = "/{tenant_id}/items"
+
+
+# ルーティング後の scope 相当（サーバーがリクエストごとに生成するもので、ログのコストには含めない）
+SCOPE: Dict[str, Any] = {"type": "http", "method": "GET", "route": _Route(), "path_params": {"tenant_id": TENANT_ID}}
+
+
+def legacy_request(logger: logging.Logger) -> None:
+    tenant_id = TENANT_ID
+    items = ITEMS
+    logger.info(f"Listing items for tenant {tenant_id}", extra={"tenant_id": tenant_id})
+    logger.info(
+        f"Retrieved {len(items)} items for tenant {tenant_id}",
+        extra={"tenant_id": tenant_id, "item_count": len(items)}
+    )
+    logger.info(f"Rendered {len(items)} items for tenant {tenant_id}", extra={"tenant_id": tenant_id})
+
+
+def context_request(logger: logging.Logger) -> None:
+    tenant_id = TENANT_ID
+    items = ITEMS
+    # LogContextMiddleware が行う処理（リクエストごとに1回）
+    token = _log_context.set(RequestLogContext(SCOPE))
+    try:
+        logger.info("Listing items for tenant %s", tenant_id)
+        logger.info("Retrieved %d items for tenant %s", len(items), tenant_id)
+        logger.info("Rendered %d items for tenant %s", len(items), tenant_id)
+    finally:
+        _log_context.reset(token)
+
+
+def measure(
+    request: Callable[[logging.Logger], None], logger: logging.Logger, requests: int, repeat: int
+) -> Dict[str, Any]:
+    """
+    requests 回のリクエスト相当を repeat 回実行し、1リクエストあたりの時間（最小値）・一時メモリ割り当てを求める
+
+    Returns:
+        Dict[str, Any]: {"us_per_request", "peak_bytes_per_request"}
+
+    注意:
+        - 割り当ては時間計測と分けて計測する（tracemalloc 自体のオーバーヘッドを時間に含めない）
+        - peak_bytes_per_request は1リクエスト中の使用量の最大増分（ログ1行分の一時オブジェクトの大きさの目安）
+    """
+    with tracer.trace("fastapi.request"):
+        for _ in range(min(1000, requests)):
+            request(logger)
+
+        # 同じホストの他の処理による揺らぎを除くため、最も速かった回を採る
+        elapsed = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(requests):
+                request(logger)
+            elapsed = min(elapsed, time.perf_counter() - started)
+
+        samples = max(1, min(1000, requests // 10))
+        peaks = 0
+        tracemalloc.start()
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            request(logger)
+            peaks += tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+
+    return {
+        "us_per_request": round(elapsed / requests * 1e6, 3),
+        "peak_bytes_per_request": round(peaks / samples),
+    }
+
+
+def measure_format(formatter: logging.Formatter, lazy: bool, repeat: int) -> float:
+    """
+    フォーマッター単体の1行あたりの時間（µs、最小値）
+    """
+    if lazy:
+        record = logging.LogRecord(
+            "benchmark", logging.INFO, __file__, 1, "Retrieved %d items for tenant %s",
+            (len(ITEMS), TENANT_ID), None, func="get_items"
+        )
+    else:
+        record = logging.LogRecord(
+            "benchmark", logging.INFO, __file__, 1, f"Retrieved {len(ITEMS)} items for tenant {TENANT_ID}",
+            None, None, func="get_items"
+        )
+        record.tenant_id = TENANT_ID
+
+    lines = 20000
+    best = float("inf")
+    with tracer.trace("fastapi.request"):
+        token = _log_context.set(RequestLogContext(SCOPE)) if lazy else None
+        try:
+            formatter.format(record)
+            for _ in range(repeat):
+                started = time.perf_counter()
+                for _ in range(lines):
+                    formatter.format(record)
+                best = min(best, time.perf_counter() - started)
+        finally:
+            if token is not None:
+                _log_context.reset(token)
+    return round(best / lines * 1e6, 3)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare per-request logging cost: eager f-strings vs request log context")
+    parser.add_argument("--requests", type=int, default=20000, help="計測するリクエスト数（方式・ログレベルごと）")
+    parser.add_argument("--repeat", type=int, default=5, help="時間計測の繰り返し回数（最小値を採る）")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    # トレースは生成するが送信しない（スパン取得のコストのみを含める）
+    tracer.configure(enabled=False)
+
+    results = []
+    for level in (logging.INFO, logging.WARNING):
+        for name, request, formatter in (
+            ("legacy", legacy_request, LegacyJSONFormatter()),
+            ("context", context_request, JSONFormatter()),
+        ):
+            result = measure(request, build_logger(level, formatter), args.requests, args.repeat)
+            result["format_us_per_line"] = measure_format(formatter, name == "context", args.repeat)
+            result.update({"mode": name, "level": logging.getLevelName(level)})
+            results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    header = f"{'level':<8} {'mode':<8} {'µs/req':>9} {'Δ':>8} {'peak B/req':>11} {'format µs/line':>15}"
+    print(header)
+    print("-" * len(header))
+    for legacy, context in zip(results[::2], results[1::2]):
+        for result in (legacy, context):
+            delta = (
+                f"{(result['us_per_request'] / legacy['us_per_request'] - 1) * 100:+.1f}%"
+                if result is context else ""
+            )
+            print(
+                f"{result['level']:<8} {result['mode']:<8} {result['us_per_request']:>9.3f} {delta:>8} "
+                f"{result['peak_bytes_per_request']:>11} {result['format_us_per_line']:>15.3f}"
+            )
+    print("\n3行/リクエスト。Δ は legacy との差。WARNING は3行とも出力されない場合のコスト")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+カスタムメトリクス記録のオーバーヘッド計測（1呼び出しあたりの ns）
+
+目的: ホットパスから呼び出す MetricsClient の記録API（increment / gauge / histogram / distribution）の
+      1呼び出しあたりの時間を、呼び出しごとにUDP送信する方式（集約なし）と比較する
+影響範囲: なし（開発・計測用ツール）
+前提条件: msgpack（fake_datadog_agent.py のインポートに必要）
+
+方式:
+    - aggregated: MetricsClient（プロセス内で集約、送信はフラッシュ時のみ）。フラッシュの時間は含めない
+    - per-call: 1呼び出しごとに DogStatsD 行を組み立てて sendto（集約しないクライアント相当）
+    - disabled: DD_METRICS_ENABLED=false 相当（記録APIは即 return）
+    - 送信先はローカルの Agent 代替（fake_datadog_agent.FakeAgent、空きポート）
+    - flush ns/context は、集約済みのコンテキスト1つあたりのフラッシュ時間（行の組み立て・パケット化・送信）
+
+使用例（リポジトリのルートで実行）:
+    python scripts/benchmark_metrics.py --calls 200000
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
+
+from fake_datadog_agent import FakeAgent  # noqa: E402
+from infrastructure.metrics import MetricsClient  # noqa: E402
+
+CONSTANT_TAGS = ["service:demo-api", "env:poc", "version:1.0.0"]
+TENANT_TAGS = ["tenant:tenant-a"]
+
+
+class PerCallClient:
+    """
+    呼び出しごとに送信する DogStatsD クライアント（比較用）
+    """
+
+    def __init__(self, address: Tuple[str, int], namespace: str, constant_tags: Sequence[str]):
+        self.address = address
+        self.prefix = f"{namespace}."
+        self.constant_tags = tuple(constant_tags)
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+
+    def _send(self, name: str, value: float, metric_type: str, tags: Optional[Sequence[str]]) -> None:
+        all_tags = self.constant_tags + tuple(tags or ())
+        line = f"{self.prefix}{name}:{value}|{metric_type}"
+        if all_tags:
+            line += "|#" + ",".join(all_tags)
+        try:
+            self.socket.sendto(line.encode("utf-8"), self.address)
+        except OSError:
+            pass
+
+    def increment(self, name: str, value: float = 1, tags: Optional[Sequence[str]] = None) -> None:
+        self._send(name, value, "c", tags)
+
+    def gauge(self, name: str, value: float, tags: Optional[Sequence[str]] = None) -> None:
+        self._send(name, value, "g", tags)
+
+    def histogram(self, name: str, value: float, tags: Optional[Sequence[str]] = None) -> None:
+        self._send(name, value, "h", tags)
+
+    def distribution(self, name: str, value: float, tags: Optional[Sequence[str]] = None) -> None:
+        self._send(name, value, "d", tags)
+
+    def flush(self) -> int:
+        return 0
+
+
+def operations(client: Any) -> List[Tuple[str, Callable[[], None]]]:
+    return [
+        ("increment", lambda: client.increment("items.created")),
+        ("increment+tags", lambda: client.increment("items.created", tags=TENANT_TAGS)),
+        ("gauge+tags", lambda: client.gauge("items.count", 42, tags=TENANT_TAGS)),
+        ("histogram+tags", lambda: client.histogram("items.list_size", 20, tags=TENANT_TAGS)),
+        ("distribution+tags", lambda: client.distribution("request.latency_ms", 12.5, tags=TENANT_TAGS)),
+    ]
+
+
+def measure_calls(call: Callable[[], None], client: Any, calls: int, repeat: int) -> float:
+    """
+    1呼び出しあたりの時間（ns、repeat 回の最小値）
+
+    注意:
+        - 集約状態が大きくならないよう、各回の後にフラッシュする（フラッシュの時間は含めない）
+    """
+    for _ in range(min(1000, calls)):
+        call()
+    client.flush()
+
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        for _ in range(calls):
+            call()
+        best = min(best, time.perf_counter_ns() - started)
+        client.flush()
+    return round(best / calls, 1)
+
+
+def measure_flush(client: MetricsClient, contexts: int, repeat: int) -> float:
+    """
+    集約済みコンテキスト1つあたりのフラッシュ時間（ns、最小値）
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        for index in range(contexts):
+            client.increment("items.created", tags=[f"tenant:tenant-{index}"])
+        started = time.perf_counter_ns()
+        client.flush()
+        best = min(best, time.perf_counter_ns() - started)
+    return round(best / contexts, 1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure per-call overhead of the metrics client in nanoseconds")
+    parser.add_argument("--calls", type=int, default=200000, help="計測する呼び出し回数（操作・方式ごと）")
+    parser.add_argument("--repeat", type=int, default=5, help="計測の繰り返し回数（最小値を採る）")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    agent = FakeAgent(trace_port=0, statsd_port=0).start()
+    address = agent.addresses[1]
+    try:
+        clients: Dict[str, Any] = {
+            "aggregated": MetricsClient(*address, namespace="demo", constant_tags=CONSTANT_TAGS, flush_interval=3600),
+            "per-call": PerCallClient(address, "demo", CONSTANT_TAGS),
+            "disabled": MetricsClient(*address, namespace="demo", constant_tags=CONSTANT_TAGS, enabled=False),
+        }
+        results: List[Dict[str, Any]] = []
+        for mode, client in clients.items():
+            for operation, call in operations(client):
+                results.append({
+                    "operation": operation,
+                    "mode": mode,
+                    "ns_per_call": measure_calls(call, client, args.calls, args.repeat),
+                })
+        flush_ns = measure_flush(clients["aggregated"], 1000, args.repeat)
+        received = agent.stats.snapshot()["dogstatsd"]
+    finally:
+        agent.stop()
+
+    if args.json:
+        print(json.dumps({"calls": results, "flush_ns_per_context": flush_ns, "received": {
+            "packets": received["packets"], "lines": received["lines"]
+        }}, indent=2))
+        return
+
+    modes = list(clients)
+    header = f"{'operation':<18}" + "".join(f" {mode + ' ns':>15}" for mode in modes)
+    print(header)
+    print("-" * len(header))
+    by_key = {(r["operation"], r["mode"]): r["ns_per_call"] for r in results}
+    for operation, _ in operations(clients["aggregated"]):
+        print(f"{operation:<18}" + "".join(f" {by_key[(operation, mode)]:>15.1f}" for mode in modes))
+    print(f"\nflush: {flush_ns:.1f} ns/context（1000 コンテキスト）")
+    print(f"受信: {received['packets']} packets, {received['lines']} lines")
+
+
+if __name__ == "__main__":
+    main()
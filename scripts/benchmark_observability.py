@@ -0,0 +1,373 @@
+"""
+オブザーバビリティのオーバーヘッド計測
+
+目的: ddtrace（自動インストルメンテーション・スパン送信）、カスタムメトリクス、JSONログの
+      スループット・レイテンシへの影響を、層ごとに積み上げて計測する（実 Agent 不要）
+影響範囲: なし（開発・計測用ツール）
+前提条件: requirements.txt の依存関係、fake_datadog_agent.py（同ディレクトリ）、
+          127.0.0.1 の 8126/TCP・8125/UDP（または --trace-port / --statsd-port）が空いている
+
+モード（前のモードに1層ずつ追加。差分がその層のコスト）:
+    - off: インストルメンテーションなし、トレース・メトリクス無効、ログは WARNING 以上
+    - logs: + INFO ログ（JSONFormatter、標準出力は破棄）
+    - metrics: + DogStatsD カスタムメトリクス
+    - sampled: + ddtrace（DD_PATCH_MODULES 既定、DD_TRACE_SAMPLE_RATE=0.1）
+    - full: ddtrace のサンプリング率 1.0（全トレース送信）
+
+使用例（リポジトリのルートで実行）:
+    python scripts/benchmark_observability.py --duration 15 --concurrency 8
+    python scripts/benchmark_observability.py --modes off,full --path "/tenant-a/items?limit=20"
+
+注意:
+    - 負荷生成もこのプロセスのスレッドで行うため、アプリと同じホストのCPUを使う。
+      絶対値ではなくモード間の差を見ること
+    - DB は既定で一時ディレクトリの SQLite（--database-url で PostgreSQL も指定可能）
+"""
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from fake_datadog_agent import FakeAgent
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(REPO_ROOT, "src")
+
+MODES = ("off", "logs", "metrics", "sampled", "full")
+
+# モード別の環境変数（前のモードとの差分が1層になるよう積み上げる）
+_MODE_ENV: Dict[str, Dict[str, str]] = {
+    "off": {
+        "DD_PATCH_MODULES": "",
+        "DD_TRACE_ENABLED": "false",
+        "DD_METRICS_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+    },
+    "logs": {"LOG_LEVEL": "INFO"},
+    "metrics": {"DD_METRICS_ENABLED": "true"},
+    "sampled": {
+        "DD_PATCH_MODULES": "fastapi,sqlalchemy,psycopg",
+        "DD_TRACE_ENABLED": "true",
+        "DD_TRACE_SAMPLE_RATE": "0.1",
+    },
+    "full": {"DD_TRACE_SAMPLE_RATE": "1.0"},
+}
+
+
+def mode_env(mode: str) -> Dict[str, str]:
+    """
+    モードの環境変数（off からの積み上げ）
+    """
+    env: Dict[str, str] = {}
+    for name in MODES[:MODES.index(mode) + 1]:
+        env.update(_MODE_ENV[name])
+    return env
+
+
+def _request(connection: http.client.HTTPConnection, method: str, path: str, body: Optional[bytes] = None) -> int:
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    response.read()
+    return response.status
+
+
+def wait_ready(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            if _request(connection, "GET", "/ready") == 200:
+                connection.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"App did not become ready on port {port} within {timeout}s")
+
+
+def seed(port: int, tenant_id: str, items: int) -> None:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    connection.request("GET", f"/{tenant_id}/items/count?exact=true")
+    existing = json.loads(connection.getresponse().read())["count"]
+    for i in range(existing, items):
+        body = json.dumps({"name": f"bench-{i}", "description": "x" * 64}).encode("utf-8")
+        _request(connection, "POST", f"/{tenant_id}/items", body)
+    connection.close()
+
+
+def process_cpu_seconds(pid: int) -> Optional[float]:
+    """
+    プロセスのCPU時間（user + system、秒）。/proc がない環境では None
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            # comm（2番目）は空白を含みうるため、最後の ")" 以降を分割する
+            fields = stat.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def bulk_seed(database_url: str, tenant_id: str, items: int, description_size: int = 64, batch_size: int = 10000) -> int:
+    """
+    テナントの件数が items 件になるまで items テーブルへ直接 INSERT する（HTTP を経由しない大量投入用）
+
+    Args:
+        database_url (str): アプリと同じ DATABASE_URL
+        tenant_id (str): テナントID
+        items (int): 投入後の件数
+        description_size (int): description の文字数
+        batch_size (int): 1回の executemany の件数
+
+    Returns:
+        int: 追加した件数
+
+    注意:
+        - テーブルはアプリの起動処理（DB_SCHEMA_INIT=create_all）で作成済みであること
+        - アプリ側のキャッシュ（件数・テナント統計）は更新しない
+    """
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import create_engine, func, select
+
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+    from models.item import Item
+
+    engine = create_engine(database_url)
+    table = Item.__table__
+    try:
+        with engine.begin() as conn:
+            existing = conn.execute(
+                select(func.count()).select_from(table).where(table.c.tenant_id == tenant_id)
+            ).scalar_one()
+        base = datetime.utcnow() - timedelta(seconds=items)
+        description = "x" * description_size
+        for start in range(existing, items, batch_size):
+            rows = [
+                {
+                    "tenant_id": tenant_id,
+                    "name": f"bench-{i}",
+                    "description": description,
+                    "created_at": base + timedelta(seconds=i),
+                    "updated_at": base + timedelta(seconds=i),
+                }
+                for i in range(start, min(items, start + batch_size))
+            ]
+            with engine.begin() as conn:
+                conn.execute(table.insert(), rows)
+        return max(0, items - existing)
+    finally:
+        engine.dispose()
+
+
+def run_load(port: int, method: str, path: str, concurrency: int, duration: float) -> Dict[str, Any]:
+    """
+    keep-alive 接続 concurrency 本で duration 秒間リクエストを送り続ける
+
+    Returns:
+        Dict[str, Any]: {"requests", "errors", "rps", "p50_ms", "p90_ms", "p99_ms", "mean_ms"}
+    """
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    body = json.dumps({"name": "bench", "description": "x" * 64}).encode("utf-8") if method == "POST" else None
+    deadline = time.perf_counter() + duration
+
+    def worker(index: int) -> None:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        samples = latencies[index]
+        while True:
+            started = time.perf_counter()
+            if started >= deadline:
+                break
+            try:
+                status = _request(connection, method, path, body)
+            except (OSError, http.client.HTTPException):
+                errors[index] += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            samples.append(time.perf_counter() - started)
+            if status >= 500:
+                errors[index] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    values = sorted(v for samples in latencies for v in samples)
+    if not values:
+        return {"requests": 0, "errors": sum(errors), "rps": 0.0}
+    quantiles = statistics.quantiles(values, n=100)
+    return {
+        "requests": len(values),
+        "errors": sum(errors),
+        "rps": round(len(values) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(values) * 1000, 3),
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p90_ms": round(quantiles[89] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+    }
+
+
+@contextmanager
+def app_server(
+    port: int,
+    env: Dict[str, str],
+    startup_timeout: float = 60.0,
+    verbose: bool = False
+) -> Iterator[subprocess.Popen]:
+    """
+    アプリ（uvicorn）をサブプロセスで起動し、/ready が200になってから制御を返す（終了時は SIGTERM で停止）
+
+    Args:
+        port (int): 待ち受けポート
+        env (Dict[str, str]): 追加の環境変数（PYTHONPATH は src/ に固定）
+        startup_timeout (float): /ready を待つ最大時間（秒）
+        verbose (bool): アプリの標準エラー出力を表示する
+
+    注意:
+        - 停止時の登録解除待ち（DRAIN_DEREGISTRATION_DELAY_SECONDS）は既定で 0 にする
+    """
+    process_env = dict(os.environ)
+    process_env.update({"PYTHONPATH": SRC_DIR, "DRAIN_DEREGISTRATION_DELAY_SECONDS": "0"})
+    process_env.update(env)
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--no-access-log", "--log-level", "warning",
+        ],
+        cwd=SRC_DIR,
+        env=process_env,
+        stdout=subprocess.DEVNULL,
+        stderr=None if verbose else subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(port, startup_timeout)
+        yield process
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def run_mode(mode: str, args: argparse.Namespace, agent: FakeAgent, database_url: str) -> Dict[str, Any]:
+    env = {
+        "DATABASE_URL": database_url,
+        "DD_AGENT_HOST": "127.0.0.1",
+        "DD_TRACE_AGENT_PORT": str(args.trace_port),
+        "DD_DOGSTATSD_PORT": str(args.statsd_port),
+        # リモート設定は無効化し、計測対象から外す
+        # （テレメトリは無効化しない: ddtrace 2.6 は DD_INSTRUMENTATION_TELEMETRY_ENABLED=false で
+        #   スパン生成時に NameError となり、全リクエストが500になる。送信先の Agent 代替は 200 を返す）
+        "DD_REMOTE_CONFIGURATION_ENABLED": "false",
+        # メトリクスはベンチマーク中に送信させる
+        "DD_METRICS_FLUSH_INTERVAL_SECONDS": "1",
+    }
+    env.update(mode_env(mode))
+
+    with app_server(args.port, env, args.startup_timeout, args.verbose):
+        seed(args.port, args.tenant, args.seed_items)
+        # ウォームアップ（接続確立・初回のコード実行を計測から除く）
+        run_load(args.port, args.method, args.path, args.concurrency, min(2.0, args.duration))
+        agent.stats.reset()
+        result = run_load(args.port, args.method, args.path, args.concurrency, args.duration)
+
+    # 停止時のフラッシュ（残りのトレース・メトリクス）を受信してから集計
+    time.sleep(0.5)
+    received = agent.stats.snapshot()
+    result.update({
+        "mode": mode,
+        "spans_received": received["traces"]["spans"],
+        "traces_received": received["traces"]["traces"],
+        "trace_bytes": received["traces"]["bytes"],
+        "metric_lines": received["dogstatsd"]["lines"],
+    })
+    return result
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    header = (
+        f"{'mode':<8} {'req/s':>9} {'Δreq/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+        f"{'Δp50 ms':>8} {'spans':>8} {'metric lines':>12} {'errors':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    previous: Optional[Dict[str, Any]] = None
+    for result in results:
+        if not result.get("requests"):
+            print(f"{result['mode']:<8} (no successful requests, errors={result['errors']})")
+            continue
+        delta_rps = f"{(result['rps'] / previous['rps'] - 1) * 100:+.1f}%" if previous else ""
+        delta_p50 = f"{result['p50_ms'] - previous['p50_ms']:+.3f}" if previous else ""
+        print(
+            f"{result['mode']:<8} {result['rps']:>9.1f} {delta_rps:>8} {result['p50_ms']:>8.3f} "
+            f"{result['p90_ms']:>8.3f} {result['p99_ms']:>8.3f} {delta_p50:>8} "
+            f"{result['spans_received']:>8} {result['metric_lines']:>12} {result['errors']:>6}"
+        )
+        previous = result
+    print("\nΔ は直前のモードとの差（その行で追加した層のコスト）")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure the throughput/latency cost of each observability layer")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"カンマ区切り（{', '.join(MODES)}）")
+    parser.add_argument("--duration", type=float, default=10.0, help="モードごとの計測時間（秒）")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--method", default="GET", choices=("GET", "POST"))
+    parser.add_argument("--path", default="/tenant-a/items?limit=20")
+    parser.add_argument("--tenant", default="tenant-a", help="事前投入するテナント")
+    parser.add_argument("--seed-items", type=int, default=100, help="事前投入する件数")
+    parser.add_argument("--port", type=int, default=18080, help="アプリの待ち受けポート")
+    parser.add_argument("--trace-port", type=int, default=8126)
+    parser.add_argument("--statsd-port", type=int, default=8125)
+    parser.add_argument("--database-url", default=None, help="省略時は一時ディレクトリの SQLite")
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    parser.add_argument("--verbose", action="store_true", help="アプリの標準エラー出力を表示")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"Unknown modes: {', '.join(unknown)}")
+
+    workdir = tempfile.mkdtemp(prefix="obs-bench-")
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    agent = FakeAgent(trace_port=args.trace_port, statsd_port=args.statsd_port).start()
+    results = []
+    try:
+        for mode in modes:
+            print(f"[{mode}] running {args.method} {args.path} for {args.duration}s x {args.concurrency}", file=sys.stderr)
+            results.append(run_mode(mode, args, agent, database_url))
+    finally:
+        agent.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+コールドスタートの計測（プロセス起動から最初の 200 まで）
+
+目的: プロセス起動（uvicorn の exec）から GET /health が最初に 200 を返すまでの時間、
+      および GET /ready が 200 になるまで（ウォームアップ完了）の時間を、起動設定ごとに比較する
+影響範囲: なし（開発・計測用ツール）
+前提条件: requirements.txt の依存関係、benchmark_observability.py（同ディレクトリ）
+
+構成（--configs で選択、環境変数の組み合わせ）:
+    - patch_all: DD_PATCH_MODULES=all、DB_SCHEMA_INIT=create_all（選択的パッチ導入前の起動）
+    - default: DD_PATCH_MODULES 既定（fastapi,sqlalchemy,psycopg）、DB_SCHEMA_INIT=create_all
+    - check: DD_PATCH_MODULES 既定、DB_SCHEMA_INIT=check（スキーマバージョンの確認のみ）
+    - minimal: DD_PATCH_MODULES=""、DB_SCHEMA_INIT=skip（下限の目安）
+
+方式:
+    - 構成ごとに --runs 回、新しいプロセスを起動して計測（最初の1回はスキーマ作成のため計測前に実行）
+    - /health を --poll-interval-ms 間隔で問い合わせ（接続拒否・200以外は再試行）
+    - 中央値・最小値・最大値を出力
+    - DB は既定で一時ディレクトリの SQLite（--database-url で PostgreSQL も指定可能）
+
+使用例（リポジトリのルートで実行）:
+    python scripts/benchmark_startup.py --runs 5
+    python scripts/benchmark_startup.py --configs patch_all,default --runs 10
+"""
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmark_observability import SRC_DIR
+
+CONFIGS: Dict[str, Dict[str, str]] = {
+    "patch_all": {"DD_PATCH_MODULES": "all", "DB_SCHEMA_INIT": "create_all"},
+    "default": {"DD_PATCH_MODULES": "fastapi,sqlalchemy,psycopg", "DB_SCHEMA_INIT": "create_all"},
+    "check": {"DD_PATCH_MODULES": "fastapi,sqlalchemy,psycopg", "DB_SCHEMA_INIT": "check"},
+    "minimal": {"DD_PATCH_MODULES": "", "DB_SCHEMA_INIT": "skip"},
+}
+
+
+def _status(port: int, path: str) -> Optional[int]:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    except OSError:
+        return None
+    finally:
+        connection.close()
+
+
+def start_once(port: int, env: Dict[str, str], poll_interval: float, timeout: float) -> Dict[str, float]:
+    """
+    プロセスを1回起動し、/health・/ready が最初に 200 を返すまでの時間（ms）を計測
+
+    Returns:
+        Dict[str, float]: {"health_ms", "ready_ms"}
+    """
+    process_env = dict(os.environ)
+    process_env.update(env)
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--no-access-log", "--log-level", "warning",
+        ],
+        cwd=SRC_DIR,
+        env=process_env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    result: Dict[str, float] = {}
+    try:
+        deadline = started + timeout
+        path = "/health"
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"App exited with {process.returncode} during startup")
+            if _status(port, path) == 200:
+                result[f"{path.strip('/')}_ms"] = (time.perf_counter() - started) * 1000
+                if path == "/ready":
+                    return result
+                path = "/ready"
+                continue
+            time.sleep(poll_interval)
+        raise RuntimeError(f"{path} did not return 200 within {timeout}s")
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "median": round(statistics.median(values), 1),
+        "min": round(min(values), 1),
+        "max": round(max(values), 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure time from process start to the first 200 on /health")
+    parser.add_argument("--configs", default=",".join(CONFIGS), help=f"カンマ区切り（{', '.join(CONFIGS)}）")
+    parser.add_argument("--runs", type=int, default=5, help="構成ごとの起動回数")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--poll-interval-ms", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="1回の起動を待つ最大時間（秒）")
+    parser.add_argument("--database-url", default=None, help="省略時は一時ディレクトリの SQLite")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    configs = [name.strip() for name in args.configs.split(",") if name.strip()]
+    unknown = [name for name in configs if name not in CONFIGS]
+    if unknown:
+        parser.error(f"Unknown configs: {', '.join(unknown)}")
+
+    workdir = tempfile.mkdtemp(prefix="startup-bench-")
+    base_env = {
+        "PYTHONPATH": SRC_DIR,
+        "DATABASE_URL": args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "DD_TRACE_ENABLED": "false",
+        "DD_METRICS_ENABLED": "false",
+        "DD_REMOTE_CONFIGURATION_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+        "DRAIN_DEREGISTRATION_DELAY_SECONDS": "0",
+    }
+    poll_interval = args.poll_interval_ms / 1000
+
+    # スキーマ作成・バージョン記録（DB_SCHEMA_INIT=check の前提）を計測前に済ませる
+    start_once(args.port, {**base_env, **CONFIGS["default"]}, poll_interval, args.timeout)
+
+    results = []
+    for name in configs:
+        env = {**base_env, **CONFIGS[name]}
+        runs = [start_once(args.port, env, poll_interval, args.timeout) for _ in range(args.runs)]
+        results.append({
+            "config": name,
+            "runs": args.runs,
+            "health_ms": summarize([run["health_ms"] for run in runs]),
+            "ready_ms": summarize([run["ready_ms"] for run in runs]),
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    header = f"{'config':<10} {'/health ms (median)':>20} {'min':>8} {'max':>8} {'/ready ms (median)':>19}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        health = result["health_ms"]
+        print(
+            f"{result['config']:<10} {health['median']:>20.1f} {health['min']:>8.1f} {health['max']:>8.1f} "
+            f"{result['ready_ms']['median']:>19.1f}"
+        )
+    print(f"\n{args.runs} 回の起動。プロセス起動（exec）からの時間、/health は {args.poll_interval_ms}ms 間隔で確認")
+
+
+if __name__ == "__main__":
+    main()
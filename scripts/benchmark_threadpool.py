@@ -0,0 +1,100 @@
+"""
+スレッドプール上限ごとのスループット・p99 計測
+
+目的: 同期エンドポイントを実行するスレッドプールの上限（THREADPOOL_LIMIT）ごとに、
+      同時接続数が上限を超える負荷でのスループット・レイテンシ（p50 / p99）を比較し、
+      DB接続プール（DB_POOL_SIZE + DB_MAX_OVERFLOW）とのバランスを確認する
+影響範囲: なし（開発・計測用ツール）
+前提条件: requirements.txt の依存関係、benchmark_observability.py（同ディレクトリ）
+
+方式:
+    - --limits の値ごとにアプリを THREADPOOL_LIMIT=<値> で起動し、--path へ --concurrency 本の
+      keep-alive 接続で --duration 秒間リクエスト
+    - server CPU µs/req はアプリのプロセスのCPU時間（/proc、Linux のみ）の増分をリクエスト数で割ったもの
+    - 上限が DB_POOL_SIZE + DB_MAX_OVERFLOW を超える場合、超過分のスレッドは接続の空きを待つ
+      （DB_POOL_* はアプリの既定値、または環境変数で指定）
+
+使用例（リポジトリのルートで実行）:
+    python scripts/benchmark_threadpool.py --duration 10
+    python scripts/benchmark_threadpool.py --limits 8,16,32,64 --concurrency 200 --path "/tenant-a/items/count?exact=true"
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from benchmark_observability import app_server, bulk_seed, process_cpu_seconds, run_load
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare throughput and p99 across threadpool limits")
+    parser.add_argument("--limits", default="5,10,20,40,80", help="THREADPOOL_LIMIT の値（カンマ区切り）")
+    parser.add_argument("--concurrency", type=int, default=100, help="同時接続数")
+    parser.add_argument("--path", default="/tenant-a/items?limit=20")
+    parser.add_argument("--duration", type=float, default=10.0, help="上限ごとの計測時間（秒）")
+    parser.add_argument("--tenant", default="tenant-a", help="事前投入するテナント")
+    parser.add_argument("--seed-items", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--database-url", default=None, help="省略時は一時ディレクトリの SQLite")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    parser.add_argument("--verbose", action="store_true", help="アプリの標準エラー出力を表示")
+    args = parser.parse_args(argv)
+
+    limits = [int(limit) for limit in args.limits.split(",") if limit.strip()]
+    workdir = tempfile.mkdtemp(prefix="threadpool-bench-")
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    results: List[Dict[str, Any]] = []
+    seeded = False
+    for limit in limits:
+        env = {
+            "DATABASE_URL": database_url,
+            "THREADPOOL_LIMIT": str(limit),
+            "DD_TRACE_ENABLED": "false",
+            "DD_PATCH_MODULES": "",
+            "DD_METRICS_ENABLED": "false",
+            "LOG_LEVEL": "WARNING",
+        }
+        print(f"[THREADPOOL_LIMIT={limit}] GET {args.path} for {args.duration}s x {args.concurrency}", file=sys.stderr)
+        with app_server(args.port, env, verbose=args.verbose) as process:
+            if not seeded:
+                bulk_seed(database_url, args.tenant, args.seed_items)
+                seeded = True
+            run_load(args.port, "GET", args.path, args.concurrency, min(2.0, args.duration))
+            cpu_before = process_cpu_seconds(process.pid)
+            result = run_load(args.port, "GET", args.path, args.concurrency, args.duration)
+            cpu_after = process_cpu_seconds(process.pid)
+        requests = max(1, result.get("requests", 0))
+        result.update({
+            "limit": limit,
+            "server_cpu_us_per_request": (
+                round((cpu_after - cpu_before) / requests * 1e6, 1)
+                if cpu_before is not None and cpu_after is not None else None
+            ),
+        })
+        results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    header = f"{'limit':>6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'cpu µs/req':>11} {'errors':>7}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        if not result.get("requests"):
+            print(f"{result['limit']:>6} (no successful requests, errors={result['errors']})")
+            continue
+        cpu = result["server_cpu_us_per_request"]
+        print(
+            f"{result['limit']:>6} {result['rps']:>9.1f} {result['p50_ms']:>9.3f} {result['p99_ms']:>9.3f} "
+            f"{cpu if cpu is not None else '-':>11} {result['errors']:>7}"
+        )
+    print(f"\nGET {args.path}、同時接続数 {args.concurrency}")
+
+
+if __name__ == "__main__":
+    main()
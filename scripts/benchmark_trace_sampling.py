@@ -0,0 +1,149 @@
+"""
+トレースのサンプリング設定ごとのオーバーヘッド計測（1リクエストあたり）
+
+目的: ddtrace のサンプリング率（DD_TRACE_SAMPLE_RATE）・ルート別サンプリング（DD_TRACE_ROUTE_SAMPLE_RATES）ごとに、
+      トレース無効の場合と比べた1リクエストあたりのレイテンシ・サーバーCPU時間の増分と、送信スパン数を比較する
+影響範囲: なし（開発・計測用ツール）
+前提条件: requirements.txt の依存関係、benchmark_observability.py・fake_datadog_agent.py（同ディレクトリ）
+
+設定:
+    - off: トレース無効（DD_TRACE_ENABLED=false、自動インストルメンテーションなし）
+    - rate=R: トレース有効、DD_TRACE_SAMPLE_RATE=R、ルート別サンプリングなし（全リクエストに R を適用）
+    - route-rules: トレース有効、DD_TRACE_ROUTE_SAMPLE_RATES は既定値（--path が一致するルールの率を適用）
+
+方式:
+    - 設定ごとにアプリを起動し、--path へ --concurrency 本の keep-alive 接続で --duration 秒間リクエスト
+    - server CPU µs/req はアプリのプロセスのCPU時間（/proc、Linux のみ）の増分をリクエスト数で割ったもの。
+      サンプリングで破棄されるトレースもスパンの生成は行うため、率を下げても 0 にはならない
+    - スパンの送信先はローカルの Agent 代替（受信したトレース数・スパン数を出力）。
+      ddtrace は破棄と判定したトレースも Agent へ送る（Agent 側で破棄）ため、受信数はサンプリング率によらない
+
+使用例（リポジトリのルートで実行）:
+    python scripts/benchmark_trace_sampling.py --duration 10
+    python scripts/benchmark_trace_sampling.py --rates 0,1 --path /health
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmark_observability import app_server, process_cpu_seconds, run_load, seed
+from fake_datadog_agent import FakeAgent
+
+TRACE_ENV = {
+    "DD_TRACE_ENABLED": "true",
+    "DD_PATCH_MODULES": "fastapi,sqlalchemy,psycopg",
+}
+
+
+def settings_env(rates: List[str]) -> Dict[str, Dict[str, str]]:
+    """
+    設定名 → 環境変数
+    """
+    configs: Dict[str, Dict[str, str]] = {
+        "off": {"DD_TRACE_ENABLED": "false", "DD_PATCH_MODULES": ""},
+    }
+    for rate in rates:
+        configs[f"rate={rate}"] = {**TRACE_ENV, "DD_TRACE_SAMPLE_RATE": rate, "DD_TRACE_ROUTE_SAMPLE_RATES": ""}
+    # 空文字を渡さず、アプリの既定ルールを使う
+    configs["route-rules"] = dict(TRACE_ENV)
+    return configs
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure per-request tracer overhead at each sampling setting")
+    parser.add_argument("--rates", default="0,0.01,0.1,1", help="DD_TRACE_SAMPLE_RATE の値（カンマ区切り）")
+    parser.add_argument("--path", default="/tenant-a/items?limit=20")
+    parser.add_argument("--duration", type=float, default=10.0, help="設定ごとの計測時間（秒）")
+    parser.add_argument("--concurrency", type=int, default=1, help="同時接続数（既定は1: CPU時間の揺らぎを抑える）")
+    parser.add_argument("--tenant", default="tenant-a", help="事前投入するテナント")
+    parser.add_argument("--seed-items", type=int, default=100)
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--trace-port", type=int, default=8126)
+    parser.add_argument("--statsd-port", type=int, default=8125)
+    parser.add_argument("--database-url", default=None, help="省略時は一時ディレクトリの SQLite")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    parser.add_argument("--verbose", action="store_true", help="アプリの標準エラー出力を表示")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="sampling-bench-")
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    configs = settings_env([rate.strip() for rate in args.rates.split(",") if rate.strip()])
+
+    agent = FakeAgent(trace_port=args.trace_port, statsd_port=args.statsd_port).start()
+    results: List[Dict[str, Any]] = []
+    try:
+        for name, config_env in configs.items():
+            print(f"[{name}] GET {args.path} for {args.duration}s x {args.concurrency}", file=sys.stderr)
+            env = {
+                "DATABASE_URL": database_url,
+                "DD_AGENT_HOST": "127.0.0.1",
+                "DD_TRACE_AGENT_PORT": str(args.trace_port),
+                "DD_DOGSTATSD_PORT": str(args.statsd_port),
+                # テレメトリは無効化しない（ddtrace 2.6 ではスパン生成時に例外となる。benchmark_observability.py 参照）
+                "DD_REMOTE_CONFIGURATION_ENABLED": "false",
+                "DD_METRICS_ENABLED": "false",
+                "LOG_LEVEL": "WARNING",
+                **config_env,
+            }
+            with app_server(args.port, env, verbose=args.verbose) as process:
+                seed(args.port, args.tenant, args.seed_items)
+                run_load(args.port, "GET", args.path, args.concurrency, min(2.0, args.duration))
+                # ウォームアップ分のトレースが送信（既定1秒間隔）されてから集計をリセット
+                time.sleep(1.5)
+                agent.stats.reset()
+                cpu_before = process_cpu_seconds(process.pid)
+                result = run_load(args.port, "GET", args.path, args.concurrency, args.duration)
+                cpu_after = process_cpu_seconds(process.pid)
+            # 停止時のフラッシュ（残りのトレース）を受信してから集計
+            time.sleep(0.5)
+            received = agent.stats.snapshot()["traces"]
+            requests = max(1, result.get("requests", 0))
+            result.update({
+                "setting": name,
+                "server_cpu_us_per_request": (
+                    round((cpu_after - cpu_before) / requests * 1e6, 1)
+                    if cpu_before is not None and cpu_after is not None else None
+                ),
+                "traces_per_request": round(received["traces"] / requests, 4),
+                "spans_per_request": round(received["spans"] / requests, 3),
+            })
+            results.append(result)
+    finally:
+        agent.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    header = (
+        f"{'setting':<12} {'req/s':>8} {'mean ms':>8} {'p99 ms':>8} {'Δmean µs':>9} "
+        f"{'cpu µs/req':>11} {'Δcpu µs':>8} {'traces/req':>11} {'spans/req':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    off = results[0]
+    for result in results:
+        if not result.get("requests"):
+            print(f"{result['setting']:<12} (no successful requests, errors={result['errors']})")
+            continue
+        cpu = result["server_cpu_us_per_request"]
+        delta_cpu = (
+            f"{cpu - off['server_cpu_us_per_request']:+.1f}"
+            if cpu is not None and off["server_cpu_us_per_request"] is not None and result is not off else ""
+        )
+        delta_mean = f"{(result['mean_ms'] - off['mean_ms']) * 1000:+.1f}" if result is not off else ""
+        print(
+            f"{result['setting']:<12} {result['rps']:>8.1f} {result['mean_ms']:>8.3f} {result['p99_ms']:>8.3f} "
+            f"{delta_mean:>9} {cpu if cpu is not None else '-':>11} {delta_cpu:>8} "
+            f"{result['traces_per_request']:>11.4f} {result['spans_per_request']:>10.3f}"
+        )
+    print(f"\nΔ は off（トレース無効）との差。GET {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+ローカル Datadog Agent 代替（トレース受信 HTTP、DogStatsD 受信 UDP）
+
+目的: 実 Agent のない環境（CI・ローカル）で ddtrace・カスタムメトリクスを有効にしたままアプリを動かし、
+      送信されたトレース・メトリクスを数えて内容を確認する
+影響範囲: なし（開発・計測用ツール、アプリには含まれない）
+前提条件: msgpack（requirements.txt、トレースペイロードのデコード）
+
+受信:
+    - HTTP（既定 127.0.0.1:8126）: PUT/POST /v0.4/traces、/v0.5/traces（msgpack）をデコードしてトレース数・スパン数を計数
+      それ以外のパス（/info、テレメトリ等）は 200 で受け流す
+    - UDP（既定 127.0.0.1:8125）: DogStatsD 行（name:value|type|@rate|#tags）をメトリクス名・型ごとに計数
+    - GET /fake/stats: 受信集計（JSON）、POST /fake/reset: 集計のリセット
+
+使用例:
+    python scripts/fake_datadog_agent.py
+    DD_AGENT_HOST=127.0.0.1 uvicorn main:app --port 8080   # 別ターミナル（src/ で実行）
+    curl -s localhost:8126/fake/stats
+"""
+
+import argparse
+import json
+import socket
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+import msgpack
+
+TRACE_PATHS = ("/v0.3/traces", "/v0.4/traces", "/v0.5/traces")
+
+
+class AgentStats:
+    """
+    受信集計
+
+    責務:
+        - トレースペイロード数・バイト数・トレース数・スパン数、スパン名・サービス名別の件数
+        - DogStatsD パケット数・行数、メトリクス名・型別の件数、直近の受信行（最大 MAX_RECENT_LINES 行）
+    """
+
+    MAX_RECENT_LINES = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.monotonic()
+            self.trace_payloads = 0
+            self.trace_bytes = 0
+            self.traces = 0
+            self.spans = 0
+            self.decode_errors = 0
+            self.span_names: Counter = Counter()
+            self.services: Counter = Counter()
+            self.metric_packets = 0
+            self.metric_bytes = 0
+            self.metric_lines = 0
+            self.metrics: Counter = Counter()
+            self.recent_lines: deque = deque(maxlen=self.MAX_RECENT_LINES)
+            self.last_spans: List[Dict[str, Any]] = []
+
+    def add_traces(self, path: str, body: bytes) -> None:
+        try:
+            spans = _decode_traces(path, body)
+        except Exception:
+            with self._lock:
+                self.trace_payloads += 1
+                self.trace_bytes += len(body)
+                self.decode_errors += 1
+            return
+
+        with self._lock:
+            self.trace_payloads += 1
+            self.trace_bytes += len(body)
+            self.traces += len(spans)
+            for trace in spans:
+                self.spans += len(trace)
+                for span in trace:
+                    self.span_names[span["name"]] += 1
+                    self.services[span["service"]] += 1
+            if spans:
+                self.last_spans = spans[-1][:20]
+
+    def add_metrics(self, packet: bytes) -> None:
+        lines = [line for line in packet.decode("utf-8", "replace").split("\n") if line]
+        with self._lock:
+            self.metric_packets += 1
+            self.metric_bytes += len(packet)
+            self.metric_lines += len(lines)
+            self.recent_lines.extend(lines)
+            for line in lines:
+                name, _, rest = line.partition(":")
+                fields = rest.split("|")
+                metric_type = fields[1] if len(fields) > 1 else "?"
+                self.metrics[f"{name}|{metric_type}"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "uptime_seconds": round(time.monotonic() - self.started, 3),
+                "traces": {
+                    "payloads": self.trace_payloads,
+                    "bytes": self.trace_bytes,
+                    "traces": self.traces,
+                    "spans": self.spans,
+                    "decode_errors": self.decode_errors,
+                    "span_names": dict(self.span_names.most_common(50)),
+                    "services": dict(self.services),
+                    "last_trace": self.last_spans,
+                },
+                "dogstatsd": {
+                    "packets": self.metric_packets,
+                    "bytes": self.metric_bytes,
+                    "lines": self.metric_lines,
+                    "metrics": dict(self.metrics.most_common(100)),
+                    "last_lines": list(self.recent_lines)[-20:],
+                },
+            }
+
+
+def _text(value: Any) -> Any:
+    return value.decode("utf-8", "replace") if isinstance(value, bytes) else value
+
+
+def _decode_traces(path: str, body: bytes) -> List[List[Dict[str, Any]]]:
+    """
+    トレースペイロードを [[{"name", "service", "resource", "duration_ms", "error"}, ...], ...] に変換
+
+    形式:
+        - v0.3 / v0.4: [[{span}, ...], ...]（span はキー付き map）
+        - v0.5: [文字列テーブル, [[[service, name, resource, trace_id, span_id, parent_id,
+                                     start, duration, error, meta, metrics, type], ...], ...]]
+    """
+    payload = msgpack.unpackb(body, raw=False, strict_map_key=False)
+    traces: List[List[Dict[str, Any]]] = []
+
+    if path.startswith("/v0.5"):
+        strings, raw_traces = payload
+        for raw_trace in raw_traces:
+            traces.append([
+                {
+                    "service": strings[span[0]],
+                    "name": strings[span[1]],
+                    "resource": strings[span[2]],
+                    "duration_ms": round(span[7] / 1e6, 3),
+                    "error": span[8],
+                }
+                for span in raw_trace
+            ])
+        return traces
+
+    for raw_trace in payload:
+        traces.append([
+            {
+                "service": _text(span.get("service")),
+                "name": _text(span.get("name")),
+                "resource": _text(span.get("resource")),
+                "duration_ms": round(span.get("duration", 0) / 1e6, 3),
+                "error": span.get("error", 0),
+            }
+            for span in raw_trace
+        ])
+    return traces
+
+
+def _handler(stats: AgentStats):
+    class AgentHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # ヘッダと本体を別々に書き込むため、Nagle と遅延ACKの組み合わせで応答が約40ms遅れるのを防ぐ
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _reply(self, status: int, content: Dict[str, Any]) -> None:
+            body = json.dumps(content).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_body(self) -> bytes:
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+
+        def do_GET(self) -> None:
+            if self.path == "/fake/stats":
+                self._reply(200, stats.snapshot())
+            elif self.path == "/info":
+                self._reply(200, {"version": "fake", "endpoints": list(TRACE_PATHS)})
+            else:
+                self._reply(404, {})
+
+        def do_PUT(self) -> None:
+            body = self._read_body()
+            path = self.path.split("?")[0]
+            if path in TRACE_PATHS:
+                stats.add_traces(path, body)
+                # ddtrace はレスポンスの rate_by_service でサンプリングレートを更新する
+                self._reply(200, {"rate_by_service": {}})
+            elif path == "/fake/reset":
+                stats.reset()
+                self._reply(200, {"reset": True})
+            else:
+                # テレメトリ、リモート設定、統計など（内容は確認しない）
+                self._reply(200, {})
+
+        do_POST = do_PUT
+
+    return AgentHandler
+
+
+class FakeAgent:
+    """
+    Agent 代替（HTTP・UDP の受信スレッド）
+
+    使用例:
+        agent = FakeAgent().start()
+        ...
+        print(agent.stats.snapshot())
+        agent.stop()
+    """
+
+    def __init__(self, host: str = "127.0.0.1", trace_port: int = 8126, statsd_port: int = 8125):
+        self.stats = AgentStats()
+        self.http = ThreadingHTTPServer((host, trace_port), _handler(self.stats))
+        self.http.daemon_threads = True
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.bind((host, statsd_port))
+        self.udp.settimeout(0.5)
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def addresses(self) -> Tuple[Tuple[str, int], Tuple[str, int]]:
+        return self.http.server_address[:2], self.udp.getsockname()[:2]
+
+    def _receive_metrics(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                packet = self.udp.recv(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self.stats.add_metrics(packet)
+
+    def start(self) -> "FakeAgent":
+        self._threads = [
+            threading.Thread(target=self.http.serve_forever, name="fake-agent-http", daemon=True),
+            threading.Thread(target=self._receive_metrics, name="fake-agent-udp", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.http.shutdown()
+        self.http.server_close()
+        self.udp.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the Datadog Agent (traces + DogStatsD)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--trace-port", type=int, default=8126)
+    parser.add_argument("--statsd-port", type=int, default=8125)
+    parser.add_argument("--report-interval", type=float, default=10.0, help="集計の表示間隔（秒、0 で表示しない）")
+    args = parser.parse_args(argv)
+
+    agent = FakeAgent(args.host, args.trace_port, args.statsd_port).start()
+    (http_host, http_port), (udp_host, udp_port) = agent.addresses
+    print(f"Fake agent listening: traces http://{http_host}:{http_port}, dogstatsd udp://{udp_host}:{udp_port}")
+    try:
+        while True:
+            time.sleep(args.report_interval or 3600)
+            if args.report_interval:
+                snapshot = agent.stats.snapshot()
+                print(json.dumps({
+                    "traces": snapshot["traces"]["traces"],
+                    "spans": snapshot["traces"]["spans"],
+                    "metric_lines": snapshot["dogstatsd"]["lines"],
+                }))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent.stop()
+        print(json.dumps(agent.stats.snapshot(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
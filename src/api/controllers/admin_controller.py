@@ -7,10 +7,9 @@
 """
 
 from fastapi import APIRouter
-import os
-import signal
-from ddtrace import tracer
 from infrastructure.logger import get_logger
+from infrastructure.datadog_middleware import tag_request
+from services.drain_service import DrainService
 
 logger = get_logger()
 router = APIRouter()
@@ -33,11 +32,11 @@ def shutdown():
     注意:
         - 本番環境では使用禁止（テスト環境のみ）
         - ECSタスクは自動的に再起動される
+        - 直ちにレディネスを draining（GET /{tenant_id}/health・/ready は503）にして SIGTERM を送る
+          （停止の開始は DRAIN_DEREGISTRATION_DELAY_SECONDS 後）
     """
     # Datadog カスタムタグ設定
-    span = tracer.current_span()
-    if span:
-        span.set_tag("operation", "shutdown")
+    tag_request("shutdown")
 
     # ログ出力
     logger.warning(
@@ -48,10 +47,10 @@ def shutdown():
         }
     )
 
-    # グレースフルシャットダウン（SIGTERM送信）
-    os.kill(os.getpid(), signal.SIGTERM)
+    # グレースフルシャットダウン（ドレイン開始 → SIGTERM送信）
+    DrainService.begin_shutdown()
 
     return {
         "message": "Shutdown initiated",
-        "status": "shutting_down"
+        "status": "draining"
     }
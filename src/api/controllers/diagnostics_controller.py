@@ -0,0 +1,149 @@
+"""
+診断コントローラー
+
+目的: 稼働中のECSタスクの診断（再デプロイなしでのプロファイル取得、メモリ増加の調査）
+影響範囲: 診断エンドポイント（X-Admin-Token 必須）
+前提条件: ADMIN_TOKEN が設定されている（未設定時は403）、profiler.py、memory_diagnostics.py
+"""
+
+import asyncio
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from config.settings import settings
+from api.dependencies import require_admin_token
+from infrastructure.profiler import profiler
+from infrastructure.memory_diagnostics import memory_sample, memory_tracer
+from infrastructure.logger import get_logger
+from infrastructure.datadog_middleware import tag_request
+
+logger = get_logger()
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+@router.post("/admin/diagnostics/profile")
+async def profile(
+    seconds: float = Query(10, gt=0, description="計測時間（秒、上限 PROFILER_MAX_SECONDS）"),
+    interval_ms: float = Query(10, ge=1, le=1000, description="サンプリング間隔（ミリ秒）"),
+    output: Literal["collapsed", "speedscope"] = Query("collapsed", description="出力形式"),
+    idle: bool = Query(False, description="待機中のスレッド（ロック・I/O待ち）も含めるか"),
+):
+    """
+    全スレッドのサンプリングプロファイルを取得
+
+    目的:
+        - CPU使用率の高いタスクで、どの関数がCPU時間を使っているかを調べる
+
+    Args:
+        seconds (float): 計測時間（秒）
+        interval_ms (float): サンプリング間隔（ミリ秒）
+        output (str): "collapsed"（flamegraph.pl 入力、text/plain）、"speedscope"（JSON）
+        idle (bool): 待機中のスレッドを含めるか
+
+    Returns:
+        PlainTextResponse / JSONResponse: プロファイル
+
+    Raises:
+        ValueError: seconds が PROFILER_MAX_SECONDS を超える（400）
+        ProfilerBusyError: 別のプロファイルが実行中（409）
+
+    注意:
+        - 計測はイベントループ外のスレッドで行う（計測中も他のリクエストを処理できる）
+    """
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise ValueError(f"seconds must be <= {settings.PROFILER_MAX_SECONDS}")
+
+    tag_request("diagnostics_profile", tags={"profile.seconds": seconds, "profile.output": output})
+    logger.info("Profiling all threads for %ss (interval %sms)", seconds, interval_ms)
+
+    result = await asyncio.get_running_loop().run_in_executor(
+        None, profiler.run, seconds, interval_ms / 1000, idle
+    )
+
+    headers = {
+        "X-Profile-Samples": str(result.total),
+        "X-Profile-Duration-Ms": str(int(result.duration * 1000)),
+    }
+    if output == "speedscope":
+        headers["Content-Disposition"] = 'attachment; filename="profile.speedscope.json"'
+        return JSONResponse(result.speedscope(settings.DD_SERVICE), headers=headers)
+    return PlainTextResponse(result.collapsed(), headers=headers)
+
+
+@router.get("/admin/diagnostics/memory")
+def memory_status():
+    """
+    メモリの現在値（RSS・GC）と tracemalloc の状態を取得
+
+    Returns:
+        dict: {"rss_mb", "gc_counts", "gc_collections", "tracemalloc": {...}}
+    """
+    tag_request("diagnostics_memory")
+    return {**memory_sample(), "tracemalloc": memory_tracer.status()}
+
+
+@router.post("/admin/diagnostics/memory/tracemalloc/start")
+def start_tracemalloc(
+    frames: int = Query(1, ge=1, le=25, description="割り当てごとに保持するスタックの深さ"),
+):
+    """
+    tracemalloc を開始（停止するまで割り当てごとにオーバーヘッドが発生する）
+
+    Returns:
+        dict: tracemalloc の状態
+    """
+    tag_request("diagnostics_tracemalloc_start", tags={"tracemalloc.frames": frames})
+    return memory_tracer.start(frames)
+
+
+@router.post("/admin/diagnostics/memory/tracemalloc/stop")
+def stop_tracemalloc():
+    """
+    tracemalloc を停止し、スナップショットを破棄
+
+    Returns:
+        dict: tracemalloc の状態
+    """
+    tag_request("diagnostics_tracemalloc_stop")
+    return memory_tracer.stop()
+
+
+@router.post("/admin/diagnostics/memory/snapshots/{name}")
+def take_snapshot(name: str):
+    """
+    名前付きスナップショットを取得（同名は上書き、保持数は MEMORY_MAX_SNAPSHOTS まで）
+
+    Args:
+        name (str): スナップショット名
+
+    Returns:
+        dict: {"name", "traced_mb", "blocks", "rss_mb", ...}
+
+    Raises:
+        ValueError: tracemalloc が開始されていない（400）
+    """
+    tag_request("diagnostics_snapshot", tags={"snapshot.name": name})
+    return memory_tracer.take_snapshot(name)
+
+
+@router.get("/admin/diagnostics/memory/diff")
+def snapshot_diff(
+    base: str = Query(..., description="比較元スナップショット名"),
+    target: Optional[str] = Query(None, description="比較先スナップショット名（省略時は現時点）"),
+    top: int = Query(20, ge=1, le=500, description="件数"),
+    group_by: Literal["lineno", "filename", "traceback"] = Query("lineno", description="集計単位"),
+):
+    """
+    2つのスナップショット間の割り当て差分（増加量の大きい順に上位N件）
+
+    Returns:
+        dict: {"base", "target", "group_by", "total_diff_kb", "top": [...]}
+
+    Raises:
+        SnapshotNotFoundError: スナップショットが存在しない（404）
+        ValueError: target 省略時に tracemalloc が開始されていない（400）
+    """
+    tag_request("diagnostics_snapshot_diff", tags={"snapshot.base": base})
+    return memory_tracer.diff(base, target, top, group_by)
@@ -12,11 +12,12 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import text
 from datetime import datetime
-from ddtrace import tracer
 
 from repositories.database import get_db
 from services.tenant_service import TenantService
 from infrastructure.logger import get_logger
+from infrastructure.datadog_middleware import tag_request
+from infrastructure.readiness import readiness
 
 logger = get_logger()
 router = APIRouter()
@@ -67,10 +68,10 @@ def health_check_service(db: Session = Depends(get_db)):
         HTTPException(503): DB接続失敗時
     """
     # Datadog カスタムタグ設定
-    span = tracer.current_span()
-    if span:
-        span.set_tag("health_check_level", "L2")
-        span.set_tag("health_check_type", "service")
+    span = tag_request(
+        "health_check_service",
+        tags={"health_check_level": "L2", "health_check_type": "service"}
+    )
 
     # RDS接続確認（SELECT 1で疎通確認）
     try:
@@ -132,6 +133,41 @@ def health_check_service(db: Session = Depends(get_db)):
     }
 
 
+@router.get("/ready")
+def readiness_check():
+    """
+    レディネスチェック
+
+    目的:
+        - レディネス（ウォームアップ完了・ドレイン前）の状態とウォームアップ結果の確認
+        - ライブネス（GET /health）とは独立（DBへ問い合わせない）
+
+    影響範囲:
+        - デプロイ・停止時の状態確認（運用・テスト用）
+
+    注意:
+        - ALB・ECS は本エンドポイントを参照しない。トラフィックの受付可否は、ALBターゲットグループの
+          ヘルスチェック（GET /{tenant_id}/health）が同じレディネスを参照して503を返すことで制御する
+
+    Returns:
+        dict: レディネス結果
+            - status: "ready"
+            - warmup_ms: ウォームアップ所要時間
+            - pool / queries: ウォームアップ詳細
+            - timestamp: ISO 8601形式
+
+    Raises:
+        HTTPException(503): ウォームアップ未完了時、ドレイン中（status: "draining"）
+    """
+    state = readiness.snapshot()
+    state["timestamp"] = datetime.utcnow().isoformat() + "Z"
+
+    if not readiness.is_ready:
+        return JSONResponse(status_code=503, content=state)
+
+    return state
+
+
 @router.get("/{tenant_id}/health")
 def health_check_tenant(tenant_id: str, db: Session = Depends(get_db)):
     """
@@ -141,8 +177,10 @@ def health_check_tenant(tenant_id: str, db: Session = Depends(get_db)):
         - テナント固有のDB接続確認（tenant_idでフィルタしたクエリ実行）
         - Datadog Synthetic Monitoring によるテナント別監視
         - FR-003-1（L3 E2E監視）対応
+        - ウォームアップ完了まで・ドレイン開始後はターゲットを unhealthy にする（レディネスの参照）
 
     影響範囲:
+        - ALBヘルスチェック（テナント別ターゲットグループ、infra/terraform/aws/alb.tf）
         - Datadog Synthetic Monitoring（テナント別）
 
     Args:
@@ -158,17 +196,29 @@ def health_check_tenant(tenant_id: str, db: Session = Depends(get_db)):
 
     Raises:
         HTTPException(400): 無効なテナントID
-        HTTPException(503): DB接続失敗時
+        HTTPException(503): ウォームアップ未完了・ドレイン中（readiness: 状態、DBへは問い合わせない）、DB接続失敗時
     """
+    # レディネス確認（ウォームアップ未完了・ドレイン中はALBから新規リクエストを振り分けさせない）
+    if not readiness.is_ready:
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "error",
+                "tenant_id": tenant_id,
+                "readiness": readiness.status,
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            }
+        )
+
     # テナントID検証
     TenantService.validate_tenant(tenant_id)
 
     # Datadog カスタムタグ設定
-    span = tracer.current_span()
-    if span:
-        span.set_tag("health_check_level", "L3")
-        span.set_tag("health_check_type", "tenant")
-        span.set_tag("tenant.id", tenant_id)
+    span = tag_request(
+        "health_check_tenant",
+        tenant_id,
+        {"health_check_level": "L3", "health_check_type": "tenant"}
+    )
 
     # RDS接続確認（テナント固有クエリ）
     # SQLインジェクション対策: パラメータ化クエリを使用
@@ -179,7 +229,8 @@ def health_check_tenant(tenant_id: str, db: Session = Depends(get_db)):
     except SQLAlchemyError as e:
         # エラーログ出力
         logger.error(
-            f"DB connection failed in tenant health check for {tenant_id}",
+            "DB connection failed in tenant health check for %s",
+            tenant_id,
             exc_info=True,
             extra={
                 "tenant_id": tenant_id,
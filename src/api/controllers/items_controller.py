@@ -6,18 +6,26 @@
 前提条件: ItemsService、TenantService
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from typing import List, Optional
-from ddtrace import tracer
 
-from repositories.database import get_db
+from repositories.database import get_db, session_scope
 from services.tenant_service import TenantService
 from services.items_service import ItemsService
+from services.analytics_service import AnalyticsService
 from infrastructure.logger import get_logger
+from infrastructure.datadog_middleware import tag_request
+from infrastructure.http_cache import build_etag, is_not_modified, not_modified_response, cache_headers
+from infrastructure.response_encoding import render
+from infrastructure.metrics import get_metrics, tenant_tag
+from infrastructure.idempotency import idempotency_guard, request_fingerprint
 
 logger = get_logger()
+metrics = get_metrics()
 router = APIRouter()
 
 
@@ -37,55 +45,112 @@ class ItemResponse(BaseModel):
     updated_at: str
 
 
+def _check_not_modified(request: Request, etag: str, tenant_id: str, operation: str, span) -> bool:
+    """
+    If-None-Match を判定し、条件付きGETのヒット/ミスをメトリクスに記録
+
+    Returns:
+        bool: True（未変更、304を返すべき）
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    not_modified = is_not_modified(if_none_match, etag)
+    metrics.increment(
+        "items.conditional_get",
+        tags=[tenant_tag(tenant_id), f"operation:{operation}", f"result:{'hit' if not_modified else 'miss'}"]
+    )
+    if not_modified and span:
+        span.set_tag("http.not_modified", True)
+    return not_modified
+
+
 @router.get("/{tenant_id}/items", response_model=List[ItemResponse])
-def get_items(tenant_id: str, db: Session = Depends(get_db)):
+def get_items(
+    tenant_id: str,
+    request: Request,
+    created_after: Optional[datetime] = Query(None, description="作成日時の下限（この日時より後、ISO 8601）"),
+    created_before: Optional[datetime] = Query(None, description="作成日時の上限（この日時より前、ISO 8601）"),
+    name_prefix: Optional[str] = Query(None, min_length=1, max_length=100, description="名前の前方一致"),
+    name_contains: Optional[str] = Query(None, min_length=1, max_length=100, description="名前の部分一致"),
+    sort: str = Query("created_at_desc", description="ソート順（created_at_desc, created_at_asc, name_asc, name_desc）"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="最大件数（省略時は全件）"),
+    offset: int = Query(0, ge=0, description="読み飛ばす件数"),
+    db: Session = Depends(get_db)
+):
     """
     サンプルデータ一覧取得
 
     目的:
         - テナント別サンプルデータ一覧取得
         - RDS監視データ生成
+        - 条件付きGET（If-None-Match）対応: 未変更時は304（本体なし）
+        - Accept: application/msgpack の場合は MessagePack で返却
+        - サーバー側フィルタ・ソート・ページネーション（クライアントでの全件取得・絞り込みを回避）
 
     Args:
         tenant_id (str): テナントID
+        request (Request): リクエスト（If-None-Match、Accept ヘッダ参照）
+        created_after (Optional[datetime]): 作成日時の下限
+        created_before (Optional[datetime]): 作成日時の上限
+        name_prefix (Optional[str]): 名前の前方一致（大文字小文字を区別しない）
+        name_contains (Optional[str]): 名前の部分一致（大文字小文字を区別しない）
+        sort (str): ソート順
+        limit (Optional[int]): 最大件数（1〜1000）
+        offset (int): 読み飛ばす件数
         db (Session): データベースセッション
 
     Returns:
-        List[ItemResponse]: サンプルデータリスト（作成日時降順）
+        List[ItemResponse]: サンプルデータリスト（既定は作成日時降順）
+        Response(304): If-None-Match がETagに一致した場合
 
     Raises:
-        HTTPException(400): 無効なテナントID
+        HTTPException(400): 無効なテナントID、不正なソート順・日時範囲
     """
     # テナントID検証
     TenantService.validate_tenant(tenant_id)
 
     # Datadog カスタムタグ設定
-    span = tracer.current_span()
-    if span:
-        span.set_tag("tenant.id", tenant_id)
-        span.set_tag("operation", "get_items")
+    span = tag_request("get_items", tenant_id)
 
-    # サンプルデータ一覧取得
     items_service = ItemsService(db)
-    items = items_service.get_items(tenant_id)
 
-    # ログ出力
-    logger.info(
-        f"Retrieved {len(items)} items for tenant {tenant_id}",
-        extra={
-            "tenant_id": tenant_id,
-            "item_count": len(items)
-        }
+    # 条件付きGET: 一覧取得前に検証子（件数 + 最終更新日時）からETagを計算
+    # 検索条件が異なれば本体も異なるため、クエリ文字列もETagに含める
+    count, last_updated = items_service.get_items_validator(tenant_id)
+    etag = build_etag("items", tenant_id, count, last_updated, request.url.query)
+    if _check_not_modified(request, etag, tenant_id, "get_items", span):
+        return not_modified_response(etag)
+
+    # サンプルデータ検索（条件なしの場合は全件・作成日時降順）
+    items = items_service.search_items(
+        tenant_id,
+        created_after=created_after,
+        created_before=created_before,
+        name_prefix=name_prefix,
+        name_contains=name_contains,
+        sort=sort,
+        limit=limit,
+        offset=offset
     )
 
-    return [item.to_dict() for item in items]
+    metrics.histogram("items.list_size", len(items), tags=[tenant_tag(tenant_id)])
+
+    # ログ出力
+    logger.info("Retrieved %d items for tenant %s", len(items), tenant_id)
+
+    return render(request, [item.to_dict() for item in items], headers=cache_headers(etag))
 
 
 @router.post("/{tenant_id}/items", response_model=ItemResponse, status_code=201)
 def create_item(
     tenant_id: str,
     request: ItemCreateRequest,
-    db: Session = Depends(get_db)
+    idempotency_key: Optional[str] = Header(
+        None, alias="Idempotency-Key", min_length=1, max_length=255,
+        description="冪等キー（再送時は初回のレスポンスを返す）"
+    ),
 ):
     """
     サンプルデータ作成
@@ -93,64 +158,242 @@ def create_item(
     目的:
         - サンプルデータ作成
         - RDS監視データ生成
+        - Idempotency-Key 対応: 同一キーの再送には初回のレスポンスを返す（DBアクセスなし）
 
     Args:
         tenant_id (str): テナントID
         request (ItemCreateRequest): 作成リクエスト
-        db (Session): データベースセッション
+        idempotency_key (Optional[str]): 冪等キー（Idempotency-Key ヘッダ）
 
     Returns:
-        ItemResponse: 作成されたサンプルデータ
+        ItemResponse: 作成されたサンプルデータ（再送時は Idempotent-Replayed: true ヘッダ付き）
 
     Raises:
         HTTPException(400): 無効なテナントID、バリデーションエラー
+        HTTPException(409): 同一キーのリクエストが処理中
+        HTTPException(422): 同一キーで異なるリクエスト本文
+
+    注意:
+        - セッションは再送でない場合のみ開く（Depends(get_db) はサーキット確認を先に行うため、
+          DB障害中（サーキット open）でも再送には保存済みのレスポンスを返せるようにする）
     """
     # テナントID検証
     TenantService.validate_tenant(tenant_id)
 
     # Datadog カスタムタグ設定
-    span = tracer.current_span()
+    span = tag_request("create_item", tenant_id)
+
+    scoped_key = f"{tenant_id}:{idempotency_key}" if idempotency_key else None
+    fingerprint = request_fingerprint("POST", f"/{tenant_id}/items", request.model_dump())
+    with idempotency_guard(scoped_key, fingerprint) as guard:
+        if guard.replay:
+            metrics.increment("items.idempotent_replay", tags=[tenant_tag(tenant_id)])
+            if span:
+                span.set_tag("http.idempotent_replay", True)
+            return JSONResponse(
+                guard.replay.content,
+                status_code=guard.replay.status_code,
+                headers={"Idempotent-Replayed": "true"}
+            )
+
+        # サンプルデータ作成
+        with session_scope() as db:
+            item = ItemsService(db).create_item(
+                tenant_id=tenant_id,
+                name=request.name,
+                description=request.description
+            )
+            content = item.to_dict()
+
+        metrics.increment("items.created", tags=[tenant_tag(tenant_id)])
+
+        # ログ出力
+        logger.info("Created item %s for tenant %s", content["id"], tenant_id)
+
+        guard.complete(201, content)
+        return content
+
+
+class ItemHistogramResponse(BaseModel):
+    """作成件数ヒストグラムレスポンス（列形式）"""
+    bucket: str
+    bucket_seconds: int
+    start: str
+    end: str
+    counts: List[int]
+    total: int
+    cached_buckets: int
+
+
+# /{tenant_id}/items/{item_id} より前に登録する（"histogram" が item_id として解釈されないように）
+@router.get("/{tenant_id}/items/histogram", response_model=ItemHistogramResponse)
+def get_item_histogram(
+    tenant_id: str,
+    request: Request,
+    bucket: str = Query("1h", description="バケット幅（1m, 5m, 15m, 1h, 6h, 1d）"),
+    start: Optional[datetime] = Query(None, alias="from", description="期間の開始（ISO 8601、省略時は to の60バケット前）"),
+    end: Optional[datetime] = Query(None, alias="to", description="期間の終了（ISO 8601、省略時は現在）"),
+    db: Session = Depends(get_db)
+):
+    """
+    作成件数ヒストグラム取得
+
+    目的:
+        - ダッシュボード用の分・時間単位の作成件数（DB側で集計、一覧全件を転送しない）
+        - Accept: application/msgpack の場合は MessagePack で返却
+
+    Args:
+        tenant_id (str): テナントID
+        request (Request): リクエスト（Accept ヘッダ参照）
+        bucket (str): バケット幅
+        start (Optional[datetime]): 期間の開始（クエリパラメータ from）
+        end (Optional[datetime]): 期間の終了（クエリパラメータ to）
+        db (Session): データベースセッション
+
+    Returns:
+        ItemHistogramResponse: {"bucket", "bucket_seconds", "start", "end", "counts", "total", "cached_buckets"}
+        （counts[i] は start + i × bucket_seconds から始まるバケットの件数）
+
+    Raises:
+        HTTPException(400): 無効なテナントID、不正なバケット幅・期間、バケット数の上限超過
+    """
+    # テナントID検証
+    TenantService.validate_tenant(tenant_id)
+
+    span = tag_request("get_item_histogram", tenant_id, {"histogram.bucket": bucket})
+
+    histogram = ItemsService(db).get_item_histogram(tenant_id, bucket, start, end)
+
     if span:
-        span.set_tag("tenant.id", tenant_id)
-        span.set_tag("operation", "create_item")
+        span.set_tags({
+            "histogram.buckets": len(histogram["counts"]),
+            "histogram.cached_buckets": histogram["cached_buckets"],
+        })
 
-    # サンプルデータ作成
-    items_service = ItemsService(db)
-    item = items_service.create_item(
-        tenant_id=tenant_id,
-        name=request.name,
-        description=request.description
-    )
+    return render(request, histogram)
 
-    # ログ出力
-    logger.info(
-        f"Created item {item.id} for tenant {tenant_id}",
-        extra={
-            "tenant_id": tenant_id,
-            "item_id": item.id,
-            "item_name": item.name
-        }
-    )
 
-    return item.to_dict()
+# /{tenant_id}/items/{item_id} より前に登録する（"analytics" が item_id として解釈されないように）
+@router.get("/{tenant_id}/items/analytics")
+def get_item_analytics(
+    tenant_id: str,
+    metric: str = Query("name_length", description="指標（name_length, create_gap_seconds, hourly_creates）"),
+    percentiles: str = Query("50,90,99", description="パーセンタイル（カンマ区切り、0〜100）"),
+    bins: int = Query(20, ge=1, le=1000, description="ヒストグラムの区間数"),
+):
+    """
+    サンプルデータの分析（パーセンタイル・ヒストグラム）
+
+    目的:
+        - 名前長の分布、作成間隔、1時間ごとの作成件数のアドホック分析
+          （一覧をORMオブジェクトで取得してアプリ側でループしない）
+
+    Args:
+        tenant_id (str): テナントID
+        metric (str): 指標
+        percentiles (str): パーセンタイル（例: "50,90,99"）
+        bins (int): ヒストグラムの区間数
+
+    Returns:
+        dict: {"metric", "rows", "snapshot_bytes", "count", "min", "max", "mean", "percentiles", "histogram"}
+
+    Raises:
+        HTTPException(400): 無効なテナントID、不正な指標・パーセンタイル、行数が ANALYTICS_MAX_ROWS を超える
+
+    注意:
+        - テナントの列形式スナップショット（services/analytics_service.py）から計算する。
+          直近 ANALYTICS_REFRESH_SECONDS 以内の作成は反映されていない場合がある
+    """
+    # テナントID検証
+    TenantService.validate_tenant(tenant_id)
+
+    span = tag_request("get_item_analytics", tenant_id, {"analytics.metric": metric})
+
+    try:
+        points = [float(p) for p in percentiles.split(",") if p.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid percentiles: {percentiles}")
+
+    result = AnalyticsService.analyze(tenant_id, metric, points, bins)
+
+    if span:
+        span.set_tags({"analytics.rows": result["rows"], "analytics.snapshot_bytes": result["snapshot_bytes"]})
+
+    return result
+
+
+class ItemCountResponse(BaseModel):
+    """サンプルデータ件数レスポンス"""
+    tenant_id: str
+    count: int
+    exact: bool
+    error_bound: int
+    method: str
+
+
+# /{tenant_id}/items/{item_id} より前に登録する（"count" が item_id として解釈されないように）
+@router.get("/{tenant_id}/items/count", response_model=ItemCountResponse)
+def count_items(
+    tenant_id: str,
+    exact: bool = Query(False, description="true の場合は COUNT(*) で正確に数える"),
+    db: Session = Depends(get_db)
+):
+    """
+    サンプルデータ件数取得
+
+    目的:
+        - 監視用のテナント別件数（既定は大規模テナントでテーブルを走査しない推定値）
+
+    Args:
+        tenant_id (str): テナントID
+        exact (bool): 正確な件数が必要か
+        db (Session): データベースセッション
+
+    Returns:
+        ItemCountResponse: {"tenant_id", "count", "exact", "error_bound"（±件数）, "method"}
+
+    Raises:
+        HTTPException(400): 無効なテナントID
+    """
+    # テナントID検証
+    TenantService.validate_tenant(tenant_id)
+
+    span = tag_request("count_items", tenant_id, {"count.exact_requested": exact})
+
+    result = ItemsService(db).get_item_count(tenant_id, exact=exact)
+
+    if span:
+        span.set_tag("count.method", result["method"])
+    metrics.increment("items.count", tags=[tenant_tag(tenant_id), f"method:{result['method']}"])
+
+    return {"tenant_id": tenant_id, **result}
 
 
 @router.get("/{tenant_id}/items/{item_id}", response_model=ItemResponse)
-def get_item(tenant_id: str, item_id: int, db: Session = Depends(get_db)):
+def get_item(
+    tenant_id: str,
+    item_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
     """
     サンプルデータ詳細取得
 
     目的:
         - サンプルデータ詳細取得
         - テナント分離確認
+        - 条件付きGET（If-None-Match）対応: 未変更時は304（本体なし）
+        - Accept: application/msgpack の場合は MessagePack で返却
 
     Args:
         tenant_id (str): テナントID
         item_id (int): サンプルデータID
+        request (Request): リクエスト（If-None-Match、Accept ヘッダ参照）
         db (Session): データベースセッション
 
     Returns:
         ItemResponse: サンプルデータ詳細
+        Response(304): If-None-Match がETagに一致した場合
 
     Raises:
         HTTPException(400): 無効なテナントID
@@ -160,23 +403,18 @@ def get_item(tenant_id: str, item_id: int, db: Session = Depends(get_db)):
     TenantService.validate_tenant(tenant_id)
 
     # Datadog カスタムタグ設定
-    span = tracer.current_span()
-    if span:
-        span.set_tag("tenant.id", tenant_id)
-        span.set_tag("operation", "get_item")
-        span.set_tag("item.id", item_id)
+    span = tag_request("get_item", tenant_id, {"item.id": item_id})
 
     # サンプルデータ取得
     items_service = ItemsService(db)
     item = items_service.get_item_by_id(tenant_id, item_id)
 
+    # 条件付きGET: updated_at から検証子を計算し、未変更ならシリアライズせずに304
+    etag = build_etag("item", tenant_id, item.id, item.updated_at)
+    if _check_not_modified(request, etag, tenant_id, "get_item", span):
+        return not_modified_response(etag)
+
     # ログ出力
-    logger.info(
-        f"Retrieved item {item_id} for tenant {tenant_id}",
-        extra={
-            "tenant_id": tenant_id,
-            "item_id": item_id
-        }
-    )
+    logger.info("Retrieved item %s for tenant %s", item_id, tenant_id)
 
-    return item.to_dict()
+    return render(request, item.to_dict(), headers=cache_headers(etag))
@@ -3,17 +3,19 @@
 
 目的: エラー/遅延シミュレーション、Datadog監視データ生成
 影響範囲: シミュレーションエンドポイント
-前提条件: MonitoringService、TenantService
+前提条件: MonitoringService、PressureService、DbSimulationService、TenantService
 """
 
 from fastapi import APIRouter
 from pydantic import BaseModel, Field
-from typing import Optional
-from ddtrace import tracer
+from typing import Literal, Optional
 
 from services.tenant_service import TenantService
 from services.monitoring_service import MonitoringService
+from services.pressure_service import PressureService
+from services.db_simulation_service import DbSimulationService
 from infrastructure.logger import get_logger
+from infrastructure.datadog_middleware import tag_request
 
 logger = get_logger()
 router = APIRouter()
@@ -29,6 +31,40 @@ class LatencySimulateRequest(BaseModel):
     duration_ms: int = Field(1000, ge=100, le=10000, description="遅延時間（ミリ秒）")
 
 
+class CpuSimulateRequest(BaseModel):
+    """CPU負荷シミュレーションリクエスト"""
+    workers: int = Field(1, ge=1, le=16, description="ワーカー数（同時実行の合計は SIMULATE_CPU_MAX_WORKERS まで）")
+    duration_ms: int = Field(1000, ge=100, le=60000, description="実行時間（ミリ秒、上限 SIMULATE_MAX_DURATION_SECONDS）")
+    mode: Literal["thread", "process"] = Field(
+        "thread", description="thread（GIL競合）、process（CPUコア飽和）"
+    )
+
+
+class MemorySimulateRequest(BaseModel):
+    """メモリ保持シミュレーションリクエスト"""
+    size_mb: int = Field(64, ge=1, le=1024, description="確保サイズ（MB、保持合計は SIMULATE_MEMORY_MAX_MB まで）")
+    hold_seconds: int = Field(
+        60, ge=1, le=3600, description="保持時間（秒、上限 SIMULATE_MEMORY_MAX_HOLD_SECONDS、経過後に自動解放）"
+    )
+
+
+class GcSimulateRequest(BaseModel):
+    """GC負荷シミュレーションリクエスト"""
+    duration_ms: int = Field(1000, ge=100, le=60000, description="実行時間（ミリ秒、上限 SIMULATE_MAX_DURATION_SECONDS）")
+    objects_per_cycle: int = Field(10000, ge=100, le=1000000, description="1サイクルで生成する循環参照オブジェクト数")
+
+
+class DbSimulateRequest(BaseModel):
+    """DB負荷シミュレーションリクエスト"""
+    mode: Literal["hold", "concurrent", "lock"] = Field(
+        "hold", description="hold（接続保持）、concurrent（同時スロークエリ）、lock（テナント行のロック競合）"
+    )
+    duration_ms: int = Field(1000, ge=10, le=60000, description="接続・ロックの保持時間（ミリ秒、上限 SIMULATE_DB_MAX_DURATION_MS）")
+    concurrency: int = Field(
+        5, ge=1, le=100, description="セッション数（hold は1固定、上限 SIMULATE_DB_MAX_CONNECTIONS_PER_TENANT）"
+    )
+
+
 @router.post("/{tenant_id}/simulate/error")
 def simulate_error(tenant_id: str, request: ErrorSimulateRequest):
     """
@@ -49,19 +85,13 @@ def simulate_error(tenant_id: str, request: ErrorSimulateRequest):
     TenantService.validate_tenant(tenant_id)
 
     # Datadog カスタムタグ設定
-    span = tracer.current_span()
-    if span:
-        span.set_tag("tenant.id", tenant_id)
-        span.set_tag("operation", "simulate_error")
-        span.set_tag("error_type", request.error_type)
+    tag_request("simulate_error", tenant_id, {"error_type": request.error_type})
 
     # ログ出力
     logger.info(
-        f"Simulating error for tenant {tenant_id}",
-        extra={
-            "tenant_id": tenant_id,
-            "error_type": request.error_type
-        }
+        "Simulating error for tenant %s",
+        tenant_id,
+        extra={"error_type": request.error_type}
     )
 
     # エラーシミュレーション実行（例外発生）
@@ -91,22 +121,147 @@ def simulate_latency(tenant_id: str, request: LatencySimulateRequest):
     TenantService.validate_tenant(tenant_id)
 
     # Datadog カスタムタグ設定
-    span = tracer.current_span()
-    if span:
-        span.set_tag("tenant.id", tenant_id)
-        span.set_tag("operation", "simulate_latency")
-        span.set_tag("latency_ms", request.duration_ms)
+    tag_request("simulate_latency", tenant_id, {"latency_ms": request.duration_ms})
 
     # ログ出力
-    logger.info(
-        f"Simulating latency for tenant {tenant_id}",
-        extra={
-            "tenant_id": tenant_id,
-            "latency_ms": request.duration_ms
-        }
-    )
+    logger.info("Simulating latency for tenant %s", tenant_id)
 
     # 遅延シミュレーション実行
     result = MonitoringService.simulate_latency(tenant_id, request.duration_ms)
 
     return result
+
+
+@router.post("/{tenant_id}/simulate/cpu")
+def simulate_cpu(tenant_id: str, request: CpuSimulateRequest):
+    """
+    CPU負荷シミュレーション（完了まで待機）
+
+    目的:
+        - オートスケーリング（CPU使用率）の検証
+        - GIL競合下での他エンドポイントのテールレイテンシ確認（mode=thread）
+
+    Args:
+        tenant_id (str): テナントID
+        request (CpuSimulateRequest): CPU負荷シミュレーションリクエスト
+
+    Returns:
+        dict: シミュレーション結果（elapsed_ms, iterations 等）
+
+    Raises:
+        SimulationLimitError: 実行時間・同時ワーカー数の上限超過（429）
+    """
+    TenantService.validate_tenant(tenant_id)
+
+    tag_request("simulate_cpu", tenant_id, {
+        "simulate.mode": request.mode,
+        "simulate.workers": request.workers,
+        "simulate.duration_ms": request.duration_ms,
+    })
+
+    return PressureService.burn_cpu(tenant_id, request.workers, request.duration_ms, request.mode)
+
+
+@router.post("/{tenant_id}/simulate/memory", status_code=202)
+def simulate_memory(tenant_id: str, request: MemorySimulateRequest):
+    """
+    メモリ保持シミュレーション（即座に返り、hold_seconds 経過後に自動解放）
+
+    目的:
+        - コンテナメモリ上限（512MB）に向けたメモリ増加時のモニター・挙動確認
+
+    Args:
+        tenant_id (str): テナントID
+        request (MemorySimulateRequest): メモリ保持シミュレーションリクエスト
+
+    Returns:
+        dict: 保持情報（hold_id, expires_at, held_mb 等）
+
+    Raises:
+        SimulationLimitError: 保持時間・保持メモリ合計の上限超過（429）
+    """
+    TenantService.validate_tenant(tenant_id)
+
+    tag_request("simulate_memory", tenant_id, {
+        "simulate.size_mb": request.size_mb,
+        "simulate.hold_seconds": request.hold_seconds,
+    })
+
+    return PressureService.hold_memory(tenant_id, request.size_mb, request.hold_seconds)
+
+
+@router.delete("/{tenant_id}/simulate/memory")
+def release_simulated_memory(tenant_id: str):
+    """
+    保持中のメモリを期限前に解放
+
+    Args:
+        tenant_id (str): テナントID
+
+    Returns:
+        dict: 解放結果（released_mb, held_mb）
+    """
+    TenantService.validate_tenant(tenant_id)
+
+    tag_request("simulate_memory_release", tenant_id)
+
+    return PressureService.release_memory(tenant_id)
+
+
+@router.post("/{tenant_id}/simulate/gc")
+def simulate_gc(tenant_id: str, request: GcSimulateRequest):
+    """
+    GC負荷シミュレーション（完了まで待機）
+
+    目的:
+        - GC停止による他エンドポイントのテールレイテンシ確認
+
+    Args:
+        tenant_id (str): テナントID
+        request (GcSimulateRequest): GC負荷シミュレーションリクエスト
+
+    Returns:
+        dict: シミュレーション結果（cycles, 世代別GC回数）
+
+    Raises:
+        SimulationLimitError: 実行時間・同時実行数の上限超過（429）
+    """
+    TenantService.validate_tenant(tenant_id)
+
+    tag_request("simulate_gc", tenant_id, {
+        "simulate.duration_ms": request.duration_ms,
+        "simulate.objects_per_cycle": request.objects_per_cycle,
+    })
+
+    return PressureService.gc_pressure(tenant_id, request.duration_ms, request.objects_per_cycle)
+
+
+@router.post("/{tenant_id}/simulate/db")
+def simulate_db(tenant_id: str, request: DbSimulateRequest):
+    """
+    DB負荷シミュレーション（接続保持、同時スロークエリ、行ロック競合）
+
+    目的:
+        - 遅いクエリによる接続プール枯渇の再現（チェックアウト待ち・キューイングの観測）
+        - 行ロック待ちの再現
+
+    Args:
+        tenant_id (str): テナントID
+        request (DbSimulateRequest): DB負荷シミュレーションリクエスト
+
+    Returns:
+        dict: シミュレーション結果（チェックアウト待ち・ロック待ちの分布、接続プールの状態）
+
+    Raises:
+        SimulationLimitError: 保持時間・テナント単位の同時接続数の上限超過（429）
+        CircuitOpenError: DB接続のサーキットが open（503）
+    """
+    TenantService.validate_tenant(tenant_id)
+
+    tag_request("simulate_db", tenant_id, {
+        "simulate.mode": request.mode,
+        "simulate.duration_ms": request.duration_ms,
+        "simulate.concurrency": request.concurrency,
+    })
+
+    return DbSimulationService.simulate(tenant_id, request.mode, request.duration_ms, request.concurrency)
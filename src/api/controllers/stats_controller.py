@@ -0,0 +1,47 @@
+"""
+統計コントローラー
+
+目的: 運用ダッシュボード向けのテナント横断統計
+影響範囲: APIエンドポイント（/stats/tenants）
+前提条件: tenant_stats_service.py
+"""
+
+import math
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from services.tenant_stats_service import get_tenant_stats_cache
+from infrastructure.datadog_middleware import tag_request
+
+router = APIRouter()
+
+
+@router.get("/stats/tenants")
+def tenant_stats():
+    """
+    全テナントの件数・最新作成日時・書き込みレートを取得
+
+    目的:
+        - ダッシュボードがテナントごとに件数を問い合わせる（テナント数分のDBクエリ）のを避ける
+
+    Returns:
+        JSONResponse: {
+            "generated_at": 集計時刻,
+            "age_seconds": 集計からの経過秒数,
+            "rate_window_seconds": 書き込みレートの集計期間,
+            "query_ms": 集計クエリの所要時間,
+            "tenants": [{"tenant_id", "item_count", "newest_created_at", "writes_per_minute"}]
+        }
+        （Cache-Control: max-age は次の再計算までの残り秒数）
+
+    注意:
+        - キャッシュ（TENANT_STATS_TTL_SECONDS）から返すため、直近の作成は反映されていない場合がある
+    """
+    cache = get_tenant_stats_cache()
+    stats = cache.get()
+
+    tag_request("tenant_stats", tags={"tenant_stats.age_seconds": stats["age_seconds"]})
+
+    max_age = max(0, math.floor(cache.ttl - stats["age_seconds"]))
+    return JSONResponse(stats, headers={"Cache-Control": f"max-age={max_age}"})
@@ -0,0 +1,38 @@
+"""
+共通 Dependency
+
+目的: 複数のコントローラーで共有する FastAPI Dependency を提供
+影響範囲: diagnostics_controller.py（管理者トークン認証）
+前提条件: config/settings.py（ADMIN_TOKEN）
+"""
+
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from config.settings import settings
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    管理者トークン（X-Admin-Token ヘッダ）を検証する
+
+    目的:
+        - 診断エンドポイント（プロファイラ等）を管理者のみに制限
+
+    Raises:
+        HTTPException(403): ADMIN_TOKEN 未設定（診断エンドポイント無効）
+        HTTPException(401): トークンなし・不一致
+
+    使用例:
+        @router.post("/admin/diagnostics/profile", dependencies=[Depends(require_admin_token)])
+    """
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+
+    # タイミング攻撃を避けるため定数時間で比較
+    if x_admin_token is None or not hmac.compare_digest(
+        x_admin_token.encode("utf-8"), settings.ADMIN_TOKEN.encode("utf-8")
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
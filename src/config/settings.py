@@ -24,6 +24,7 @@ class Settings:
         - logger.py: LOG_LEVEL
         - tenant_service.py: VALID_TENANTS
         - datadog_middleware.py: DD_SERVICE, DD_ENV, DD_VERSION
+        - metrics.py: DD_AGENT_HOST, DD_DOGSTATSD_PORT, DD_METRICS_*
 
     前提条件:
         - DATABASE_URL または DB_HOST/DB_PORT/DB_USER/DB_PASSWORD/DB_NAME
@@ -49,15 +50,172 @@ class Settings:
 
     DATABASE_URL: str = _build_database_url()
 
+    # スキーマ初期化モード
+    #   create_all: 起動時にテーブル作成（開発環境、デフォルト）
+    #   check: create_all を行わず、スキーマバージョンのみ確認（本番環境推奨）
+    #   skip: 何もしない
+    DB_SCHEMA_INIT: str = os.getenv("DB_SCHEMA_INIT", "create_all")
+
+    # items テーブルのテナント別パーティショニング（PostgreSQL のみ、新規作成時に適用）
+    #   none: 通常テーブル（デフォルト）
+    #   list: テナントごとに1パーティション + デフォルトパーティション（VALID_TENANTS に追従）
+    #   hash: ITEMS_HASH_PARTITIONS 個のハッシュパーティション（テナント数が多い場合）
+    # 既存の通常テーブルの移行: python -m repositories.partitioning migrate
+    ITEMS_PARTITIONING: str = os.getenv("ITEMS_PARTITIONING", "none")
+    ITEMS_HASH_PARTITIONS: int = int(os.getenv("ITEMS_HASH_PARTITIONS", "8"))
+
+    # 件数API（GET /{tenant_id}/items/count）の推定値（プランナ統計）を使う最小件数
+    # 推定値がこれ未満の場合は COUNT(*) で正確に数える（exact=true 指定時は常に COUNT(*)）
+    ITEMS_APPROX_COUNT_MIN_ROWS: int = int(os.getenv("ITEMS_APPROX_COUNT_MIN_ROWS", "100000"))
+
+    # 作成件数ヒストグラム（GET /{tenant_id}/items/histogram）
+    # ITEMS_HISTOGRAM_MAX_BUCKETS: 1リクエストのバケット数の上限
+    # ITEMS_HISTOGRAM_CACHE_TTL_SECONDS: 確定済みバケットのキャッシュ期間（0 の場合はキャッシュなし）
+    #   他タスクでの削除はこの期間まで反映されない
+    # ITEMS_HISTOGRAM_CACHE_MAX_ENTRIES: キャッシュするバケット数の上限（超過時は古い順に削除）
+    ITEMS_HISTOGRAM_MAX_BUCKETS: int = int(os.getenv("ITEMS_HISTOGRAM_MAX_BUCKETS", "1440"))
+    ITEMS_HISTOGRAM_CACHE_TTL_SECONDS: float = float(os.getenv("ITEMS_HISTOGRAM_CACHE_TTL_SECONDS", "600"))
+    ITEMS_HISTOGRAM_CACHE_MAX_ENTRIES: int = int(os.getenv("ITEMS_HISTOGRAM_CACHE_MAX_ENTRIES", "50000"))
+
+    # テナント別分析スナップショット（GET /{tenant_id}/items/analytics、services/analytics_service.py）
+    # ANALYTICS_REFRESH_SECONDS: 差分読み込みの最短間隔（この間の要求はスナップショットのみで応答）
+    # ANALYTICS_REBUILD_SECONDS: 全件の読み直し間隔（削除の反映）
+    # ANALYTICS_REFRESH_OVERLAP_SECONDS: 差分読み込みで遡る秒数（作成日時の採番より後にCOMMITされた行の取りこぼし防止）
+    # ANALYTICS_MAX_ROWS: テナントあたりの最大行数（1行約18〜36バイト）
+    ANALYTICS_REFRESH_SECONDS: float = float(os.getenv("ANALYTICS_REFRESH_SECONDS", "5"))
+    ANALYTICS_REBUILD_SECONDS: float = float(os.getenv("ANALYTICS_REBUILD_SECONDS", "3600"))
+    ANALYTICS_REFRESH_OVERLAP_SECONDS: float = float(os.getenv("ANALYTICS_REFRESH_OVERLAP_SECONDS", "30"))
+    ANALYTICS_MAX_ROWS: int = int(os.getenv("ANALYTICS_MAX_ROWS", "5000000"))
+
+    # 接続プール設定
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+
+    # DB接続のサーキットブレーカー（連続失敗で open、open 中は503 + Retry-After で即座に失敗）
+    DB_CIRCUIT_BREAKER_ENABLED: bool = os.getenv("DB_CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+    DB_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("DB_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    DB_CIRCUIT_RESET_TIMEOUT_SECONDS: float = float(os.getenv("DB_CIRCUIT_RESET_TIMEOUT_SECONDS", "10"))
+    DB_CIRCUIT_HALF_OPEN_MAX_PROBES: int = int(os.getenv("DB_CIRCUIT_HALF_OPEN_MAX_PROBES", "1"))
+    # 接続確立のタイムアウトと再試行（ジッター付き指数バックオフ）
+    DB_CONNECT_TIMEOUT_SECONDS: int = int(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "5"))
+    DB_CONNECT_RETRIES: int = int(os.getenv("DB_CONNECT_RETRIES", "2"))
+    DB_CONNECT_RETRY_BACKOFF_MS: float = float(os.getenv("DB_CONNECT_RETRY_BACKOFF_MS", "100"))
+
+    # リクエストデッドライン（ルート別予算、クエリの statement_timeout・接続チェックアウト待ちに反映、超過時は504）
+    # REQUEST_DEADLINE_BUDGETS: "[METHOD ]PATH_GLOB=秒" のカンマ区切り（先頭一致、0 はデッドラインなし）
+    # REQUEST_DEADLINE_DEFAULT_SECONDS: 一致しないルートの予算（ALBアイドルタイムアウト 60秒 未満とする、0 で無効）
+    REQUEST_DEADLINE_BUDGETS: str = os.getenv(
+        "REQUEST_DEADLINE_BUDGETS",
+        "GET /health=5,GET /ready=2,GET /*/health=5,POST /admin/*=0"
+    )
+    REQUEST_DEADLINE_DEFAULT_SECONDS: float = float(os.getenv("REQUEST_DEADLINE_DEFAULT_SECONDS", "25"))
+
+    # グループコミット（items 作成を時間窓 / 件数上限でまとめて1回のCOMMITにする）
+    # GROUP_COMMIT_WINDOW_MS: 最初の要求からの待ち時間（0 の場合はCOMMIT中に溜まった要求のみまとめる）
+    GROUP_COMMIT_ENABLED: bool = os.getenv("GROUP_COMMIT_ENABLED", "false").lower() == "true"
+    GROUP_COMMIT_WINDOW_MS: float = float(os.getenv("GROUP_COMMIT_WINDOW_MS", "2"))
+    GROUP_COMMIT_MAX_BATCH: int = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "100"))
+
+    # 冪等キー（Idempotency-Key ヘッダ、POST /{tenant_id}/items）
+    # IDEMPOTENCY_WAIT_SECONDS: 同一キーの処理中リクエストの完了を待つ最大時間（超過時は409）
+    IDEMPOTENCY_TTL_SECONDS: float = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_MAX_KEYS: int = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+    IDEMPOTENCY_WAIT_SECONDS: float = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+
+    # リソース負荷シミュレーション上限（POST /{tenant_id}/simulate/cpu, memory, gc）
+    # SIMULATE_CPU_MAX_WORKERS: 同時に実行できるCPU/GC負荷ワーカー数の合計
+    # SIMULATE_MEMORY_MAX_MB: 同時に保持できるメモリの合計（コンテナ上限 512MB 未満にすること）
+    SIMULATE_MAX_DURATION_SECONDS: float = float(os.getenv("SIMULATE_MAX_DURATION_SECONDS", "30"))
+    SIMULATE_CPU_MAX_WORKERS: int = int(os.getenv("SIMULATE_CPU_MAX_WORKERS", "4"))
+    SIMULATE_MEMORY_MAX_MB: int = int(os.getenv("SIMULATE_MEMORY_MAX_MB", "256"))
+    SIMULATE_MEMORY_MAX_HOLD_SECONDS: float = float(os.getenv("SIMULATE_MEMORY_MAX_HOLD_SECONDS", "300"))
+    # DB負荷シミュレーション上限（POST /{tenant_id}/simulate/db）
+    # SIMULATE_DB_MAX_CONNECTIONS_PER_TENANT: テナントごとに同時に保持できる接続数
+    #   （プール枯渇の再現には DB_POOL_SIZE + DB_MAX_OVERFLOW を超える合計が必要）
+    # SIMULATE_DB_MAX_DURATION_MS: 接続・ロックの保持時間（リクエストのデッドライン未満にすること）
+    SIMULATE_DB_MAX_CONNECTIONS_PER_TENANT: int = int(os.getenv("SIMULATE_DB_MAX_CONNECTIONS_PER_TENANT", "10"))
+    SIMULATE_DB_MAX_DURATION_MS: int = int(os.getenv("SIMULATE_DB_MAX_DURATION_MS", "20000"))
+
+    # 管理者トークン（診断エンドポイントの X-Admin-Token ヘッダ、空文字の場合は診断エンドポイント無効）
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+    # サンプリングプロファイラ（POST /admin/diagnostics/profile）の最大計測時間
+    PROFILER_MAX_SECONDS: float = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+    # tracemalloc スナップショットの保持数（超過時は古い順に削除）
+    MEMORY_MAX_SNAPSHOTS: int = int(os.getenv("MEMORY_MAX_SNAPSHOTS", "4"))
+    # RSS・GC の定期サンプリング間隔（秒、0 の場合はサンプラーを起動しない）
+    MEMORY_SAMPLER_INTERVAL_SECONDS: float = float(os.getenv("MEMORY_SAMPLER_INTERVAL_SECONDS", "0"))
+
+    # スレッドプール（同期エンドポイントの同時実行数、AnyIO 既定は40）
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW を大きく超えると、超過分はスレッドを占有したまま接続の空きを待つ
+    THREADPOOL_LIMIT: int = int(os.getenv("THREADPOOL_LIMIT", "40"))
+    # イベントループ遅延・スレッドプール使用状況のサンプリング間隔（秒、0 の場合は監視・待ち時間計測なし）
+    EVENT_LOOP_MONITOR_INTERVAL_SECONDS: float = float(os.getenv("EVENT_LOOP_MONITOR_INTERVAL_SECONDS", "1"))
+
+    # リクエスト単位のSQLクエリ計測（ルートスパンの db.query_count / db.time_ms、メトリクス）
+    # QUERY_COUNT_WARN_THRESHOLD: 1リクエストのクエリ数がこの値以上で warning ログ（0 の場合はログなし）
+    QUERY_STATS_ENABLED: bool = os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true"
+    QUERY_COUNT_WARN_THRESHOLD: int = int(os.getenv("QUERY_COUNT_WARN_THRESHOLD", "20"))
+
+    # テナント横断統計（GET /stats/tenants）
+    # TENANT_STATS_TTL_SECONDS: キャッシュの有効期間（更新スレッドなしの場合、期限切れ後の最初のリクエストが再計算）
+    # TENANT_STATS_REFRESH_SECONDS: 更新スレッドの再計算間隔（0 の場合は更新スレッドなし）
+    # TENANT_STATS_RATE_WINDOW_SECONDS: 書き込みレート（writes_per_minute）の集計期間
+    TENANT_STATS_TTL_SECONDS: float = float(os.getenv("TENANT_STATS_TTL_SECONDS", "30"))
+    TENANT_STATS_REFRESH_SECONDS: float = float(os.getenv("TENANT_STATS_REFRESH_SECONDS", "15"))
+    TENANT_STATS_RATE_WINDOW_SECONDS: float = float(os.getenv("TENANT_STATS_RATE_WINDOW_SECONDS", "300"))
+
+    # ドレイン設定（停止時）
+    # DRAIN_DEREGISTRATION_DELAY_SECONDS: SIGTERM 受信後、GET /{tenant_id}/health・/ready を503にしたまま
+    #                                     新規リクエストを受け続ける時間
+    #                                     （ALBのターゲット登録解除が全ノードに反映されるまで。経過後に uvicorn の停止を開始）
+    # DRAIN_TIMEOUT_SECONDS: 処理中リクエストの完了を待つ最大時間（超過分は打ち切りとして記録）
+    # 注意: DRAIN_DEREGISTRATION_DELAY_SECONDS + --timeout-graceful-shutdown（Dockerfile）+ DRAIN_TIMEOUT_SECONDS は
+    #       ECS の stopTimeout（30秒）未満にすること（超過すると engine.dispose() の前に SIGKILL される）
+    DRAIN_DEREGISTRATION_DELAY_SECONDS: float = float(os.getenv("DRAIN_DEREGISTRATION_DELAY_SECONDS", "10"))
+    DRAIN_TIMEOUT_SECONDS: float = float(os.getenv("DRAIN_TIMEOUT_SECONDS", "5"))
+
+    # ウォームアップ設定（完了まで GET /{tenant_id}/health・GET /ready は503）
+    # WARMUP_POOL_CONNECTIONS: 並列に事前接続する数（上限 DB_POOL_SIZE）
+    # WARMUP_PRIME_QUERIES: テナント別のホットクエリを事前実行するか
+    WARMUP_POOL_CONNECTIONS: int = int(os.getenv("WARMUP_POOL_CONNECTIONS", os.getenv("DB_POOL_SIZE", "10")))
+    WARMUP_PRIME_QUERIES: bool = os.getenv("WARMUP_PRIME_QUERIES", "true").lower() == "true"
+    WARMUP_TIMEOUT_SECONDS: float = float(os.getenv("WARMUP_TIMEOUT_SECONDS", "30"))
+
     # Datadog設定
     DD_SERVICE: str = os.getenv("DD_SERVICE", "demo-api")
     DD_ENV: str = os.getenv("DD_ENV", "poc")
     DD_VERSION: str = os.getenv("DD_VERSION", "1.0.0")
     DD_AGENT_HOST: str = os.getenv("DD_AGENT_HOST", "datadog-agent")
+    # DogStatsD カスタムメトリクス（クライアント側集約、UDPでAgentへ送信）
+    DD_METRICS_ENABLED: bool = os.getenv("DD_METRICS_ENABLED", "true").lower() == "true"
+    DD_DOGSTATSD_PORT: int = int(os.getenv("DD_DOGSTATSD_PORT", "8125"))
+    DD_METRICS_NAMESPACE: str = os.getenv("DD_METRICS_NAMESPACE", "demo_api")
+    DD_METRICS_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("DD_METRICS_FLUSH_INTERVAL_SECONDS", "10"))
+    DD_METRICS_MAX_CONTEXTS: int = int(os.getenv("DD_METRICS_MAX_CONTEXTS", "1000"))
+    DD_METRICS_MAX_SAMPLES: int = int(os.getenv("DD_METRICS_MAX_SAMPLES", "1000"))
+    # ルート別トレースサンプリング率（"[METHOD ]PATH_GLOB=率" のカンマ区切り、先頭一致、空文字で無効）
+    # 一致しないリクエストは ddtrace の既定サンプリング、DD_TRACE_KEEP_STATUS_MIN 以上のステータスは常に保持
+    DD_TRACE_ROUTE_SAMPLE_RATES: str = os.getenv(
+        "DD_TRACE_ROUTE_SAMPLE_RATES",
+        "GET /health=0.01,GET /ready=0.01,GET /*/health=0.01,POST *=1,PUT *=1,DELETE *=1"
+    )
+    DD_TRACE_KEEP_STATUS_MIN: int = int(os.getenv("DD_TRACE_KEEP_STATUS_MIN", "500"))
+    # 自動インストルメンテーション対象（カンマ区切り、"all" で patch_all()）
+    DD_PATCH_MODULES: str = os.getenv("DD_PATCH_MODULES", "fastapi,sqlalchemy,psycopg")
 
     # アプリケーション設定
     VALID_TENANTS: str = os.getenv("VALID_TENANTS", "tenant-a,tenant-b,tenant-c")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # 起動プロファイル（モジュール別インポート時間、フェーズ別起動時間をログ出力）
+    STARTUP_PROFILE: bool = os.getenv("STARTUP_PROFILE", "false").lower() == "true"
+
+    # レスポンスエンコーディング設定（帯域 ⇔ CPU のトレードオフ）
+    # RESPONSE_COMPRESSION: 優先順のカンマ区切り（br, gzip）、空文字で圧縮無効
+    RESPONSE_MSGPACK_ENABLED: bool = os.getenv("RESPONSE_MSGPACK_ENABLED", "true").lower() == "true"
+    RESPONSE_COMPRESSION: str = os.getenv("RESPONSE_COMPRESSION", "br,gzip")
+    RESPONSE_COMPRESSION_MIN_SIZE: int = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))
+    RESPONSE_GZIP_LEVEL: int = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+    RESPONSE_BROTLI_QUALITY: int = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
 
     @property
     def valid_tenant_list(self) -> List[str]:
@@ -69,6 +227,34 @@ class Settings:
         """
         return [tenant.strip() for tenant in self.VALID_TENANTS.split(",")]
 
+    @property
+    def dd_patch_module_list(self) -> List[str]:
+        """
+        自動インストルメンテーション対象モジュールをリストで取得
+
+        Returns:
+            List[str]: モジュール名リスト（例: ["fastapi", "sqlalchemy", "psycopg"]）
+        """
+        return [
+            module.strip().lower()
+            for module in self.DD_PATCH_MODULES.split(",")
+            if module.strip()
+        ]
+
+    @property
+    def response_compression_list(self) -> List[str]:
+        """
+        有効なレスポンス圧縮方式を優先順のリストで取得
+
+        Returns:
+            List[str]: 圧縮方式リスト（例: ["br", "gzip"]、無効時は []）
+        """
+        return [
+            encoding.strip().lower()
+            for encoding in self.RESPONSE_COMPRESSION.split(",")
+            if encoding.strip()
+        ]
+
 
 # シングルトンインスタンス
 settings = Settings()
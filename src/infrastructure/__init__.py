@@ -2,15 +2,29 @@
 横断的関心事パッケージ
 
 このパッケージはログ、エラーハンドリング、Datadog統合を提供します。
+
+注意:
+    - 再エクスポートは遅延インポート（PEP 562）とする
+      （サブモジュール単体のインポートで ddtrace 等の重いモジュールを読み込まないため）
 """
 
-from .logger import setup_logger, get_logger
-from .error_handler import register_error_handlers
-from .datadog_middleware import setup_datadog
+from importlib import import_module
+
+_EXPORTS = {
+    "setup_logger": ".logger",
+    "get_logger": ".logger",
+    "register_error_handlers": ".error_handler",
+    "setup_datadog": ".datadog_middleware",
+    "tag_request": ".datadog_middleware",
+    "build_etag": ".http_cache",
+    "is_not_modified": ".http_cache",
+    "not_modified_response": ".http_cache",
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    "setup_logger",
-    "get_logger",
-    "register_error_handlers",
-    "setup_datadog",
-]
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,196 @@
+"""
+サーキットブレーカー
+
+目的: 依存先（RDS）障害時に接続タイムアウト待ちを繰り返さず即座に失敗させ、
+      スレッドプールの枯渇と全エンドポイントのレイテンシ悪化を防ぐ
+影響範囲: database.py（接続確立・セッション取得）、error_handler.py（503 + Retry-After）
+前提条件: なし
+
+状態遷移:
+    closed --(連続失敗 failure_threshold 回)--> open
+    open --(reset_timeout 経過)--> half_open（同時 half_open_max_probes 件まで試行を許可）
+    half_open --(試行成功)--> closed / --(試行失敗)--> open
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ddtrace import tracer
+
+from infrastructure.logger import get_logger
+from infrastructure.metrics import get_metrics
+
+logger = get_logger()
+metrics = get_metrics()
+
+
+class CircuitOpenError(Exception):
+    """
+    サーキットオープンエラー（依存先が利用不可）
+
+    発生条件:
+        - サーキットが open（reset_timeout 未経過）
+        - half_open で試行数の上限に達している
+
+    属性:
+        name (str): サーキット名（例: "database"）
+        retry_after (int): 再試行までの推奨秒数（Retry-After ヘッダ）
+    """
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"{name} is unavailable (circuit open), retry after {retry_after}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    サーキットブレーカー
+
+    責務:
+        - 連続失敗数の計測と状態遷移（closed / open / half_open）
+        - 試行可否の判定（open 中は即座に CircuitOpenError）
+        - 状態遷移のログ・スパンタグ・メトリクス出力
+
+    前提条件:
+        - スレッドセーフ（接続確立はリクエストスレッド・バックグラウンドスレッドから呼び出される）
+        - 試行を許可された呼び出し元は record_success / record_failure のいずれかを必ず呼ぶ
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        half_open_max_probes: int = 1,
+        enabled: bool = True
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.half_open_max_probes = max(1, half_open_max_probes)
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _retry_after(self, now: float) -> int:
+        return max(1, int(self._opened_at + self.reset_timeout - now + 0.999))
+
+    def check(self) -> None:
+        """
+        試行枠を消費せずに open 中かを確認（セッション取得時の早期失敗用）
+
+        Raises:
+            CircuitOpenError: open（reset_timeout 未経過）
+        """
+        if not self.enabled or self._state != self.OPEN:
+            return
+        now = time.monotonic()
+        if now < self._opened_at + self.reset_timeout:
+            raise CircuitOpenError(self.name, self._retry_after(now))
+
+    def before_call(self) -> None:
+        """
+        試行可否を判定（許可された場合は record_success / record_failure を呼ぶこと）
+
+        Raises:
+            CircuitOpenError: open、または half_open で試行数の上限に達している
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self._state == self.OPEN:
+                if now < self._opened_at + self.reset_timeout:
+                    raise CircuitOpenError(self.name, self._retry_after(now))
+                self._transition(self.HALF_OPEN)
+            if self._state == self.HALF_OPEN:
+                if self._probes >= self.half_open_max_probes:
+                    raise CircuitOpenError(self.name, 1)
+                self._probes += 1
+
+    def record_success(self) -> None:
+        """
+        試行成功を記録（half_open の場合は closed へ）
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._failures = 0
+            if self._state == self.HALF_OPEN:
+                self._probes = 0
+                self._transition(self.CLOSED)
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        """
+        試行失敗を記録（閾値到達、または half_open の場合は open へ）
+
+        Args:
+            error (Optional[BaseException]): 失敗原因（ログ出力用）
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._probes = 0
+                self._opened_at = time.monotonic()
+                self._transition(self.OPEN, error)
+
+    def _transition(self, new_state: str, error: Optional[BaseException] = None) -> None:
+        # ロック保持中に呼び出すこと
+        old_state, self._state = self._state, new_state
+        details: Dict[str, Any] = {
+            "circuit": self.name,
+            "from_state": old_state,
+            "to_state": new_state,
+            "consecutive_failures": self._failures,
+        }
+
+        if new_state == self.OPEN:
+            logger.error(
+                "Circuit %s opened after %s consecutive failures: %s",
+                self.name, self._failures, error,
+                extra={"circuit_breaker": details, "error_type": "circuit_open", "severity": "error"}
+            )
+        else:
+            logger.warning(
+                "Circuit %s %s -> %s",
+                self.name, old_state, new_state,
+                extra={"circuit_breaker": details, "severity": "warning"}
+            )
+
+        metrics.increment(
+            "circuit_breaker.transition",
+            tags=[f"circuit:{self.name}", f"from:{old_state}", f"to:{new_state}"]
+        )
+        span = tracer.current_span()
+        if span:
+            span.set_tags({
+                f"circuit_breaker.{self.name}.from": old_state,
+                f"circuit_breaker.{self.name}.state": new_state,
+            })
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        現在の状態を辞書で取得（レスポンス・ログ用）
+        """
+        return {
+            "state": self._state,
+            "consecutive_failures": self._failures,
+        }
@@ -0,0 +1,142 @@
+"""
+リクエストデッドライン
+
+目的: ALBがタイムアウトした後もDBがクエリを実行し続け、接続がチェックアウトされたままになるのを防ぐ
+影響範囲: main.py（DeadlineMiddleware）、database.py（statement_timeout、プールのチェックアウト待ち上限）、
+          error_handler.py（504）
+前提条件: route_rules.py（ルート別予算の書式）
+
+動作:
+    - リクエスト開始時にルート別の予算（秒）からデッドラインを決め、コンテキスト変数に保持
+      （同期エンドポイントのスレッドプール実行にもコンテキストが引き継がれる）
+    - クエリ発行時の残り時間を PostgreSQL の statement_timeout（SET LOCAL）に変換
+    - 残り時間がない場合は DeadlineExceeded（→ 504）
+"""
+
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+from ddtrace import tracer
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config.settings import settings
+from infrastructure.route_rules import RouteRule, match_route_rule, parse_route_rules
+
+# デッドライン（time.monotonic() 基準の絶対時刻）、予算（秒）
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+_budget: ContextVar[Optional[float]] = ContextVar("request_budget", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """
+    リクエストデッドライン超過エラー
+
+    発生条件:
+        - クエリ発行時・接続チェックアウト時に残り時間がない
+        - statement_timeout によりクエリがキャンセルされた（SQLSTATE 57014）
+        - 接続プールのチェックアウト待ちが残り時間内に終わらない
+
+    属性:
+        budget (Optional[float]): 予算（秒）
+        remaining (Optional[float]): 発生時点の残り時間（秒、負値は超過分）
+    """
+
+    def __init__(self, message: str = "Request deadline exceeded"):
+        super().__init__(message)
+        self.budget = _budget.get()
+        self.remaining = remaining()
+
+
+def remaining() -> Optional[float]:
+    """
+    現在のリクエストの残り時間を取得
+
+    Returns:
+        Optional[float]: 残り時間（秒、負値は超過分）。デッドラインなしの場合 None
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline() -> Optional[float]:
+    """
+    デッドラインを確認し、残り時間を返す
+
+    Returns:
+        Optional[float]: 残り時間（秒）。デッドラインなしの場合 None
+
+    Raises:
+        DeadlineExceeded: 残り時間がない
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded()
+    return left
+
+
+def set_deadline(budget: Optional[float]) -> None:
+    """
+    現在のコンテキストにデッドラインを設定（None の場合は解除）
+
+    Args:
+        budget (Optional[float]): 予算（秒）
+
+    注意:
+        - バックグラウンドスレッド等、リクエスト外で期限付き処理を行う場合にも使用できる
+    """
+    _budget.set(budget)
+    _deadline.set(time.monotonic() + budget if budget is not None else None)
+
+
+class DeadlineMiddleware:
+    """
+    リクエストデッドライン設定ASGIミドルウェア
+
+    責務:
+        - REQUEST_DEADLINE_BUDGETS に一致したルートの予算（一致なしは REQUEST_DEADLINE_DEFAULT_SECONDS）で
+          デッドラインを設定
+        - ルートスパンに予算（deadline.budget_ms）を記録
+
+    影響範囲:
+        - すべてのHTTPリクエスト（予算 0 以下のルートはデッドラインなし）
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: Optional[List[RouteRule]] = None,
+        default_budget: Optional[float] = None
+    ):
+        self.app = app
+        self.rules = rules if rules is not None else parse_route_rules(
+            settings.REQUEST_DEADLINE_BUDGETS, float
+        )
+        self.default_budget = (
+            default_budget if default_budget is not None else settings.REQUEST_DEADLINE_DEFAULT_SECONDS
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = match_route_rule(self.rules, scope["method"], scope["path"])
+        if budget is None:
+            budget = self.default_budget
+        if budget <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        deadline_token = _deadline.set(time.monotonic() + budget)
+        budget_token = _budget.set(budget)
+        root_span = tracer.current_root_span()
+        if root_span is not None:
+            root_span.set_tag("deadline.budget_ms", int(budget * 1000))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _deadline.reset(deadline_token)
+            _budget.reset(budget_token)
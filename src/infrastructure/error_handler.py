@@ -13,6 +13,12 @@ from ddtrace import tracer
 from infrastructure.logger import get_logger
 from services.tenant_service import InvalidTenantError
 from services.items_service import ItemNotFoundError
+from infrastructure.circuit_breaker import CircuitOpenError
+from infrastructure.deadline import DeadlineExceeded
+from infrastructure.idempotency import IdempotencyKeyReusedError, IdempotencyInProgressError
+from services.pressure_service import SimulationLimitError
+from infrastructure.profiler import ProfilerBusyError
+from infrastructure.memory_diagnostics import SnapshotNotFoundError
 
 logger = get_logger()
 
@@ -45,7 +51,8 @@ def register_error_handlers(app: FastAPI) -> None:
         ステータスコード: 400 Bad Request
         """
         logger.error(
-            f"Invalid tenant error: {exc}",
+            "Invalid tenant error: %s",
+            exc,
             extra={
                 "error_type": "invalid_tenant",
                 "severity": "error",
@@ -78,7 +85,8 @@ def register_error_handlers(app: FastAPI) -> None:
         ステータスコード: 404 Not Found
         """
         logger.warning(
-            f"Item not found: {exc}",
+            "Item not found: %s",
+            exc,
             extra={
                 "error_type": "item_not_found",
                 "severity": "warning",
@@ -103,6 +111,216 @@ def register_error_handlers(app: FastAPI) -> None:
             }
         )
 
+    @app.exception_handler(CircuitOpenError)
+    async def circuit_open_error_handler(request: Request, exc: CircuitOpenError):
+        """
+        依存先利用不可エラーハンドラ（サーキット open、接続を試みずに即座に失敗）
+
+        ステータスコード: 503 Service Unavailable（Retry-After 付き）
+        """
+        logger.warning(
+            "Dependency unavailable: %s",
+            exc,
+            extra={
+                "error_type": "circuit_open",
+                "severity": "warning",
+                "path": str(request.url)
+            }
+        )
+
+        # Datadog APM にエラートレースを送信
+        span = tracer.current_span()
+        if span:
+            span.set_tag("error", True)
+            span.set_tag("error.type", "circuit_open")
+            span.set_tag("error.message", str(exc))
+            span.set_tag(f"circuit_breaker.{exc.name}.state", "open")
+
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "error",
+                "error_type": "service_unavailable",
+                "message": str(exc),
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            },
+            headers={"Retry-After": str(exc.retry_after)}
+        )
+
+    @app.exception_handler(DeadlineExceeded)
+    async def deadline_exceeded_error_handler(request: Request, exc: DeadlineExceeded):
+        """
+        リクエストデッドライン超過エラーハンドラ
+
+        ステータスコード: 504 Gateway Timeout
+        """
+        logger.warning(
+            "Deadline exceeded: %s",
+            exc,
+            extra={
+                "error_type": "deadline_exceeded",
+                "severity": "warning",
+                "path": str(request.url)
+            }
+        )
+
+        # Datadog APM にエラートレースを送信（予算と発生時点の残り時間）
+        span = tracer.current_span()
+        if span:
+            span.set_tag("error", True)
+            span.set_tag("error.type", "deadline_exceeded")
+            span.set_tag("error.message", str(exc))
+            if exc.budget is not None:
+                span.set_tag("deadline.budget_ms", int(exc.budget * 1000))
+            if exc.remaining is not None:
+                span.set_tag("deadline.remaining_ms", int(exc.remaining * 1000))
+
+        return JSONResponse(
+            status_code=504,
+            content={
+                "status": "error",
+                "error_type": "deadline_exceeded",
+                "message": str(exc),
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            }
+        )
+
+    @app.exception_handler(IdempotencyKeyReusedError)
+    async def idempotency_key_reused_error_handler(request: Request, exc: IdempotencyKeyReusedError):
+        """
+        冪等キー再利用エラーハンドラ（同一キーで異なるリクエスト本文）
+
+        ステータスコード: 422 Unprocessable Entity
+        """
+        logger.warning(
+            "Idempotency key reused: %s",
+            exc,
+            extra={
+                "error_type": "idempotency_key_reused",
+                "severity": "warning",
+                "path": str(request.url)
+            }
+        )
+
+        return JSONResponse(
+            status_code=422,
+            content={
+                "status": "error",
+                "error_type": "idempotency_key_reused",
+                "message": str(exc),
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            }
+        )
+
+    @app.exception_handler(IdempotencyInProgressError)
+    async def idempotency_in_progress_error_handler(request: Request, exc: IdempotencyInProgressError):
+        """
+        冪等キー処理中エラーハンドラ（同一キーのリクエストが処理中）
+
+        ステータスコード: 409 Conflict
+        """
+        logger.warning(
+            "Idempotency key in progress: %s",
+            exc,
+            extra={
+                "error_type": "idempotency_in_progress",
+                "severity": "warning",
+                "path": str(request.url)
+            }
+        )
+
+        return JSONResponse(
+            status_code=409,
+            content={
+                "status": "error",
+                "error_type": "idempotency_in_progress",
+                "message": str(exc),
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            },
+            headers={"Retry-After": "1"}
+        )
+
+    @app.exception_handler(SimulationLimitError)
+    async def simulation_limit_error_handler(request: Request, exc: SimulationLimitError):
+        """
+        シミュレーション上限超過エラーハンドラ
+
+        ステータスコード: 429 Too Many Requests
+        """
+        logger.warning(
+            "Simulation limit exceeded: %s",
+            exc,
+            extra={
+                "error_type": "simulation_limit_exceeded",
+                "severity": "warning",
+                "path": str(request.url)
+            }
+        )
+
+        return JSONResponse(
+            status_code=429,
+            content={
+                "status": "error",
+                "error_type": "simulation_limit_exceeded",
+                "message": str(exc),
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            }
+        )
+
+    @app.exception_handler(ProfilerBusyError)
+    async def profiler_busy_error_handler(request: Request, exc: ProfilerBusyError):
+        """
+        プロファイラ実行中エラーハンドラ（同時に実行できるプロファイルは1つ）
+
+        ステータスコード: 409 Conflict
+        """
+        logger.warning(
+            "Profiler busy: %s",
+            exc,
+            extra={
+                "error_type": "profiler_busy",
+                "severity": "warning",
+                "path": str(request.url)
+            }
+        )
+
+        return JSONResponse(
+            status_code=409,
+            content={
+                "status": "error",
+                "error_type": "profiler_busy",
+                "message": str(exc),
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            }
+        )
+
+    @app.exception_handler(SnapshotNotFoundError)
+    async def snapshot_not_found_error_handler(request: Request, exc: SnapshotNotFoundError):
+        """
+        tracemalloc スナップショット未存在エラーハンドラ
+
+        ステータスコード: 404 Not Found
+        """
+        logger.warning(
+            "Snapshot not found: %s",
+            exc,
+            extra={
+                "error_type": "snapshot_not_found",
+                "severity": "warning",
+                "path": str(request.url)
+            }
+        )
+
+        return JSONResponse(
+            status_code=404,
+            content={
+                "status": "error",
+                "error_type": "snapshot_not_found",
+                "message": str(exc),
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            }
+        )
+
     @app.exception_handler(ValueError)
     async def value_error_handler(request: Request, exc: ValueError):
         """
@@ -111,7 +329,8 @@ def register_error_handlers(app: FastAPI) -> None:
         ステータスコード: 400 Bad Request
         """
         logger.warning(
-            f"Validation error: {exc}",
+            "Validation error: %s",
+            exc,
             extra={
                 "error_type": "validation_error",
                 "severity": "warning",
@@ -137,7 +356,8 @@ def register_error_handlers(app: FastAPI) -> None:
         ステータスコード: 例外で指定されたステータスコード
         """
         logger.error(
-            f"HTTP exception: {exc.detail}",
+            "HTTP exception: %s",
+            exc.detail,
             extra={
                 "error_type": "http_exception",
                 "severity": "error",
@@ -172,7 +392,8 @@ def register_error_handlers(app: FastAPI) -> None:
         ステータスコード: 500 Internal Server Error
         """
         logger.error(
-            f"Unexpected error: {exc}",
+            "Unexpected error: %s",
+            exc,
             exc_info=True,
             extra={
                 "error_type": "unexpected_error",
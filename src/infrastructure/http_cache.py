@@ -0,0 +1,86 @@
+"""
+HTTP条件付きリクエスト（ETag / If-None-Match）
+
+目的: ポーリングされるGETエンドポイントで未変更時に304を返し、帯域とシリアライズCPUを削減
+影響範囲: items_controller.py（GET /{tenant_id}/items, GET /{tenant_id}/items/{item_id}）
+前提条件: 検証子（件数、updated_at等）がレスポンス本体より安価に取得できること
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response
+
+
+def build_etag(*parts: Any) -> str:
+    """
+    検証子の構成要素から弱いETagを生成
+
+    目的:
+        - 表現（JSON等）に依存しない検証子を生成
+        - 弱いETag（W/）とすることで、エンコーディングが異なっても同一リソースとみなす
+
+    Args:
+        *parts (Any): 検証子の構成要素（例: tenant_id, 件数, 最終更新日時）
+
+    Returns:
+        str: 弱いETag（例: W/"3f2a9c0e1b7d4a5c"）
+    """
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+    return f'W/"{digest}"'
+
+
+def is_not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match ヘッダがETagに一致するか判定（弱い比較）
+
+    Args:
+        if_none_match (Optional[str]): If-None-Match ヘッダ値（カンマ区切り、"*" 可）
+        etag (str): 現在のETag
+
+    Returns:
+        bool: True（未変更、304を返すべき）、False（本体を返すべき）
+    """
+    if not if_none_match:
+        return False
+
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified_response(etag: str) -> Response:
+    """
+    304 Not Modified レスポンスを生成（本体なし）
+
+    Args:
+        etag (str): 現在のETag
+
+    Returns:
+        Response: 304レスポンス（ETag, Cache-Control ヘッダ付き）
+    """
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+def cache_headers(etag: str) -> dict:
+    """
+    条件付きGET用のレスポンスヘッダを生成
+
+    Args:
+        etag (str): 現在のETag
+
+    Returns:
+        dict: {"ETag": str, "Cache-Control": "no-cache"}（毎回再検証させる）
+    """
+    return {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+    }
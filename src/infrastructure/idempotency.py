@@ -0,0 +1,293 @@
+"""
+冪等キー（Idempotency-Key）管理
+
+目的: ALBタイムアウト後のクライアント再送による重複作成を防ぎ、再送には初回のレスポンスをDBアクセスなしで返す
+影響範囲: items_controller.py（POST /{tenant_id}/items）、error_handler.py（409 / 422）
+前提条件: なし（既定はプロセス内ストア。複数タスク間で共有する場合は IdempotencyStore を実装して差し替える）
+
+動作:
+    - 初回: キーを「処理中」として登録し、処理完了時にレスポンスを保存（TTL経過で削除）
+    - 再送（同一キー・同一リクエスト本文）: 保存済みレスポンスを返す
+    - 同時実行（同一キーが処理中）: 初回の完了を最大 IDEMPOTENCY_WAIT_SECONDS 待機し、その結果を返す
+    - 同一キーで異なるリクエスト本文: 422
+    - 初回が失敗した場合はキーを解放する（失敗レスポンスは保存しない、再送で再実行される）
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Iterator, NamedTuple, Optional
+
+from config.settings import settings
+
+
+class IdempotencyKeyReusedError(Exception):
+    """
+    冪等キー再利用エラー
+
+    発生条件:
+        - 同一の Idempotency-Key が異なるリクエスト本文で送信された
+    """
+    pass
+
+
+class IdempotencyInProgressError(Exception):
+    """
+    冪等キー処理中エラー
+
+    発生条件:
+        - 同一の Idempotency-Key のリクエストが処理中で、待機時間内に完了しなかった
+    """
+    pass
+
+
+class StoredResponse(NamedTuple):
+    """保存済みレスポンス（ステータスコード、JSON本文）"""
+    status_code: int
+    content: Any
+
+
+def request_fingerprint(method: str, path: str, body: Any) -> str:
+    """
+    リクエストの同一性判定用フィンガープリントを生成
+
+    Args:
+        method (str): HTTPメソッド
+        path (str): リクエストパス
+        body (Any): リクエスト本文（JSONシリアライズ可能な値）
+
+    Returns:
+        str: SHA-256（16進）
+    """
+    payload = json.dumps([method, path, body], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    冪等キーストアのインターフェース
+
+    責務:
+        - begin: キーの獲得（None）/ 保存済みレスポンスの取得 / 処理中の完了待ち
+        - complete: レスポンスの保存と待機者への通知
+        - release: 失敗時のキー解放と待機者への通知
+
+    前提条件:
+        - 共有バックエンド（Redis 等）で実装する場合、begin はアトミックな登録（SET NX + 有効期限）と
+          完了待ち（ポーリング / Pub/Sub）、complete はレスポンス保存 + TTL 設定で実装する
+    """
+
+    def begin(self, key: str, fingerprint: str, timeout: float) -> Optional[StoredResponse]:
+        """
+        キーの処理を開始する
+
+        Args:
+            key (str): 冪等キー（テナントIDでスコープ済み）
+            fingerprint (str): リクエストのフィンガープリント
+            timeout (float): 処理中の場合の最大待機時間（秒）
+
+        Returns:
+            Optional[StoredResponse]: None（呼び出し元がキーを獲得、complete / release 必須）、
+                                      または保存済みレスポンス（再送）
+
+        Raises:
+            IdempotencyKeyReusedError: フィンガープリント不一致
+            IdempotencyInProgressError: 待機時間内に処理中のリクエストが完了しない
+        """
+        raise NotImplementedError
+
+    def complete(self, key: str, response: StoredResponse) -> None:
+        raise NotImplementedError
+
+    def release(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "expires_at", "response", "done")
+
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.response: Optional[StoredResponse] = None
+        self.done = threading.Event()
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """
+    プロセス内冪等キーストア（件数上限 + TTL）
+
+    責務:
+        - 保存済みレスポンスを TTL まで保持（上限件数超過時は古い順に削除）
+        - 処理中のキーは削除しない（完了 / 解放で確定）
+
+    影響範囲:
+        - ECSタスク単位のストア（同一タスクへの再送のみ重複排除される）
+
+    前提条件:
+        - スレッドセーフ（同期エンドポイントはスレッドプールで実行される）
+    """
+
+    def __init__(self, max_keys: int = 10000, ttl_seconds: float = 86400):
+        self.max_keys = max(1, max_keys)
+        self.ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self, now: float) -> None:
+        # ロック保持中に呼び出すこと（先頭 = 最も古い登録）
+        for _ in range(len(self._entries)):
+            key, entry = next(iter(self._entries.items()))
+            if entry.expires_at > now and len(self._entries) <= self.max_keys:
+                break
+            if entry.response is None:
+                self._entries.move_to_end(key)
+                continue
+            del self._entries[key]
+
+    def begin(self, key: str, fingerprint: str, timeout: float) -> Optional[StoredResponse]:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._evict(now)
+                entry = self._entries.get(key)
+                if entry is None:
+                    self._entries[key] = _Entry(fingerprint, now + self.ttl)
+                    return None
+                if entry.fingerprint != fingerprint:
+                    raise IdempotencyKeyReusedError(
+                        "Idempotency-Key was already used with a different request"
+                    )
+                if entry.response is not None:
+                    return entry.response
+                done = entry.done
+
+            # 処理中: 完了（保存 / 解放）を待ってから再判定（解放された場合は自分が獲得する）
+            if not done.wait(max(0.0, deadline - time.monotonic())):
+                raise IdempotencyInProgressError(
+                    "A request with the same Idempotency-Key is still in progress"
+                )
+
+    def complete(self, key: str, response: StoredResponse) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.response = response
+            entry.expires_at = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+        entry.done.set()
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry.done.set()
+
+
+class IdempotencyGuard:
+    """
+    1リクエスト分の冪等処理（idempotency_guard が生成）
+
+    属性:
+        replay (Optional[StoredResponse]): 再送の場合の保存済みレスポンス（None の場合は処理を実行する）
+    """
+
+    def __init__(self, store: Optional[IdempotencyStore], key: Optional[str], replay: Optional[StoredResponse]):
+        self.store = store
+        self.key = key
+        self.replay = replay
+        self.completed = replay is not None
+
+    def complete(self, status_code: int, content: Any) -> None:
+        """
+        処理結果を保存（以降の再送はこのレスポンスを受け取る）
+        """
+        if self.store is not None and not self.completed:
+            self.store.complete(self.key, StoredResponse(status_code, content))
+        self.completed = True
+
+
+@contextmanager
+def idempotency_guard(key: Optional[str], fingerprint: str) -> Iterator[IdempotencyGuard]:
+    """
+    冪等キーによる重複実行防止（キーなしの場合は何もしない）
+
+    使用例:
+        with idempotency_guard(key, fingerprint) as guard:
+            if guard.replay:
+                return JSONResponse(guard.replay.content, status_code=guard.replay.status_code)
+            body = create()
+            guard.complete(201, body)
+
+    Args:
+        key (Optional[str]): 冪等キー（テナントIDでスコープ済み、None の場合は無効）
+        fingerprint (str): リクエストのフィンガープリント
+
+    Raises:
+        IdempotencyKeyReusedError: 同一キーで異なるリクエスト
+        IdempotencyInProgressError: 同一キーの処理中リクエストが完了しない
+
+    注意:
+        - complete() せずに抜けた場合（例外含む）はキーを解放する
+    """
+    if not key:
+        yield IdempotencyGuard(None, None, None)
+        return
+
+    store = get_idempotency_store()
+    guard = IdempotencyGuard(store, key, store.begin(key, fingerprint, settings.IDEMPOTENCY_WAIT_SECONDS))
+    try:
+        yield guard
+    finally:
+        if not guard.completed:
+            store.release(key)
+
+
+# グローバルストア
+_store: Optional[IdempotencyStore] = None
+# 初回取得・差し替えの排他（同期エンドポイントはスレッドプールから並行して呼び出す）
+_store_lock = threading.Lock()
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """
+    冪等キーストアを取得（シングルトン、既定はプロセス内ストア）
+
+    Returns:
+        IdempotencyStore: 冪等キーストア
+
+    注意:
+        - 初回の同時呼び出しでストアが複数作成されない（別々のストアに同じキーが記録されない）よう、
+          作成は _store_lock の下で行う
+    """
+    global _store
+    store = _store
+    if store is not None:
+        return store
+    with _store_lock:
+        if _store is None:
+            _store = InMemoryIdempotencyStore(
+                max_keys=settings.IDEMPOTENCY_MAX_KEYS,
+                ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+            )
+        return _store
+
+
+def set_idempotency_store(store: IdempotencyStore) -> None:
+    """
+    冪等キーストアを差し替える（複数タスク間の共有バックエンド用、起動時に呼び出す）
+
+    Args:
+        store (IdempotencyStore): 冪等キーストア
+    """
+    global _store
+    with _store_lock:
+        _store = store
@@ -0,0 +1,95 @@
+"""
+処理中リクエスト数の計測
+
+目的: シャットダウン時のドレイン（処理中リクエストの完了待ち）に使用する
+影響範囲: main.py（InFlightMiddleware）、drain_service.py（完了待ち）
+前提条件: なし
+"""
+
+import threading
+import time
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class InFlightTracker:
+    """
+    処理中リクエスト数
+
+    責務:
+        - HTTPリクエストの開始・終了の計数
+        - 処理中リクエストが0になるまでの待機（上限時間付き）
+
+    前提条件:
+        - スレッドセーフ（待機はイベントループ外のスレッドからも行われる）
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def enter(self) -> None:
+        with self._condition:
+            self._count += 1
+
+    def exit(self) -> None:
+        with self._condition:
+            self._count -= 1
+            if self._count == 0:
+                self._condition.notify_all()
+
+    def wait_idle(self, timeout: float) -> int:
+        """
+        処理中リクエストが0になるまで待機
+
+        Args:
+            timeout (float): 最大待機時間（秒）
+
+        Returns:
+            int: 待機終了時点の処理中リクエスト数（0 以外は打ち切り）
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._count > 0:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                self._condition.wait(left)
+            return self._count
+
+
+class InFlightMiddleware:
+    """
+    処理中リクエスト計数ASGIミドルウェア
+
+    責務:
+        - HTTPリクエストの処理中（レスポンス送信完了まで）を計数
+
+    注意:
+        - 同期エンドポイント（スレッドプール実行）はタスクがキャンセルされてもスレッドの完了を待つため、
+          ハンドラが戻るまで処理中として扱われる
+    """
+
+    def __init__(self, app: ASGIApp, tracker: Optional[InFlightTracker] = None):
+        self.app = app
+        self.tracker = tracker or inflight
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.tracker.enter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.exit()
+
+
+# シングルトンインスタンス
+inflight = InFlightTracker()
@@ -4,17 +4,103 @@
 目的: JSON形式ログ出力、Datadog APM連携、トレースID自動付与
 影響範囲: すべてのモジュール
 前提条件: LOG_LEVEL環境変数が設定されている
+
+リクエストログコンテキスト:
+    - LogContextMiddleware がリクエストごとに1回、コンテキスト（ASGI scope）を設定する
+    - JSONFormatter はコンテキストから dd.trace_id, dd.span_id, route, method, tenant_id を付与する
+      （ルートスパン・ルート・テナントIDは出力時に読むため、各ログ呼び出しで extra を渡す必要はない。
+      ログを出力しないリクエストではトレースの参照も JSON 変換も行わない）
+    - ログ呼び出しは %s 形式の引数で渡す（ログレベルが無効の場合はメッセージを組み立てない）
+      例: logger.info("Retrieved %d items for tenant %s", len(items), tenant_id)
 """
 
 import logging
 import json
 import sys
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from ddtrace import tracer
+from starlette.types import ASGIApp, Receive, Scope, Send
 from config.settings import settings
 
 
+class RequestLogContext:
+    """
+    リクエスト単位のログコンテキスト
+
+    属性:
+        scope (Scope): ASGI scope（ルート・パスパラメータを出力時に参照）
+        method (str): HTTPメソッド
+
+    注意:
+        - dd.span_id はルートスパンのもの（子スパン内のログもルートスパンに紐付く。トレースとの相関は trace_id で行う）
+        - service, env, dd.trace_id, dd.span_id, route, method はルーティング後の最初のログで
+          JSON に変換して保持し、以降のログでは変換しない
+    """
+
+    __slots__ = ("scope", "method", "_encoded")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.method = scope.get("method")
+        self._encoded: Optional[str] = None
+
+    @property
+    def route(self) -> Optional[str]:
+        # FastAPI のルーティング後はルートのパステンプレート（例: /{tenant_id}/items）
+        return getattr(self.scope.get("route"), "path", None)
+
+    @property
+    def tenant_id(self) -> Optional[str]:
+        # ルーティング後のパスパラメータ（/{tenant_id}/... 以外のルートでは None）
+        path_params = self.scope.get("path_params")
+        return path_params.get("tenant_id") if path_params else None
+
+    def encoded_fields(self, encoder: json.JSONEncoder) -> str:
+        """
+        リクエスト共通のフィールドを JSON オブジェクトの中身（{} を除いた部分）として取得
+
+        Returns:
+            str: 例 '"service": "demo-api", "env": "poc", "dd.trace_id": 1, ..., "method": "GET"'
+        """
+        if self._encoded is not None:
+            return self._encoded
+
+        fields: Dict[str, Any] = {"service": settings.DD_SERVICE, "env": settings.DD_ENV}
+        root_span = tracer.current_root_span()
+        if root_span is not None:
+            fields["dd.trace_id"] = root_span.trace_id
+            fields["dd.span_id"] = root_span.span_id
+        route = self.route
+        if route is not None:
+            fields["route"] = route
+        fields["method"] = self.method
+        encoded = encoder.encode(fields)[1:-1]
+
+        # ルーティング前（ミドルウェア内）のログではルートが未確定のため保持しない
+        if route is not None:
+            self._encoded = encoded
+        return encoded
+
+
+_log_context: ContextVar[Optional[RequestLogContext]] = ContextVar("log_context", default=None)
+
+# ログに出力する extra のフィールド（tenant_id は別途、リクエストのテナントIDと合わせて扱う）
+_EXTRA_FIELDS = (
+    "error_type",
+    "severity",
+    "health_check_level",
+    "health_check_type",
+    "startup_profile",
+    "warmup",
+    "circuit_breaker",
+    "drain",
+    "memory",
+    "db",
+)
+
+
 class JSONFormatter(logging.Formatter):
     """
     JSON形式のログフォーマッター
@@ -22,6 +108,7 @@ class JSONFormatter(logging.Formatter):
     責務:
         - ログレコードをJSON形式に変換
         - Datadog APM トレースID、スパンIDを自動付与
+        - リクエストログコンテキスト（ルート、メソッド、テナントID）の付与
         - ISO 8601形式のタイムスタンプ
 
     影響範囲:
@@ -31,6 +118,11 @@ class JSONFormatter(logging.Formatter):
         - ddtrace が初期化されている
     """
 
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # json.dumps にキーワード引数を渡すと呼び出しごとにエンコーダを生成するため、1つを使い回す
+        self._encoder = json.JSONEncoder(ensure_ascii=False)
+
     def format(self, record: logging.LogRecord) -> str:
         """
         ログレコードをJSON形式に変換
@@ -48,6 +140,8 @@ class JSONFormatter(logging.Formatter):
                 "message": "Request received",
                 "dd.trace_id": "abc123",
                 "dd.span_id": "def456",
+                "route": "/{tenant_id}/items",
+                "method": "GET",
                 "tenant_id": "tenant-a"
             }
         """
@@ -59,43 +153,46 @@ class JSONFormatter(logging.Formatter):
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno,
-            "service": settings.DD_SERVICE,
-            "env": settings.DD_ENV,
         }
 
-        # Datadog APM トレースID、スパンID を付与
-        span = tracer.current_span()
-        if span:
-            log_data["dd.trace_id"] = span.trace_id
-            log_data["dd.span_id"] = span.span_id
-
-        # カスタムフィールド（extra で渡された情報）
-        if hasattr(record, 'tenant_id'):
-            log_data['tenant_id'] = record.tenant_id
-
-        if hasattr(record, 'error_type'):
-            log_data['error_type'] = record.error_type
-
-        if hasattr(record, 'severity'):
-            log_data['severity'] = record.severity
-
-        if hasattr(record, 'health_check_level'):
-            log_data['health_check_level'] = record.health_check_level
-
-        if hasattr(record, 'health_check_type'):
-            log_data['health_check_type'] = record.health_check_type
+        # service, env, Datadog APM トレースID、スパンID を付与
+        # （リクエスト内はコンテキストの変換済みフィールドを使い、ログごとに tracer.current_span() を呼ばない）
+        context = _log_context.get()
+        if context is None:
+            log_data["service"] = settings.DD_SERVICE
+            log_data["env"] = settings.DD_ENV
+            span = tracer.current_span()
+            if span:
+                log_data["dd.trace_id"] = span.trace_id
+                log_data["dd.span_id"] = span.span_id
+
+        # カスタムフィールド（extra で渡された情報、未指定の場合はリクエストのテナントID）
+        tenant_id = getattr(record, 'tenant_id', None)
+        if tenant_id is None and context is not None:
+            tenant_id = context.tenant_id
+        if tenant_id is not None:
+            log_data['tenant_id'] = tenant_id
+
+        # レコードごとの hasattr 呼び出しを避け、属性辞書を1回ずつ引く
+        extras = record.__dict__
+        for field in _EXTRA_FIELDS:
+            if field in extras:
+                log_data[field] = extras[field]
 
         # エラーログの場合、status="error", tenant="tenant_id" を追加
         if record.levelname == 'ERROR':
             log_data['status'] = 'error'
-            if hasattr(record, 'tenant_id'):
-                log_data['tenant'] = record.tenant_id
+            if tenant_id is not None:
+                log_data['tenant'] = tenant_id
 
         # 例外情報を追加
         if record.exc_info:
             log_data['exception'] = self.formatException(record.exc_info)
 
-        return json.dumps(log_data, ensure_ascii=False)
+        encoded = self._encoder.encode(log_data)
+        if context is None:
+            return encoded
+        return encoded[:-1] + ", " + context.encoded_fields(self._encoder) + "}"
 
 
 def setup_logger(name: str = "demo-api") -> logging.Logger:
@@ -156,3 +253,34 @@ def get_logger() -> logging.Logger:
     if _logger is None:
         _logger = setup_logger()
     return _logger
+
+
+class LogContextMiddleware:
+    """
+    リクエストログコンテキスト設定ASGIミドルウェア
+
+    責務:
+        - リクエストごとに1回、ログコンテキストを設定（トレースID・ルート等は最初のログ出力時に取得）
+        - リクエスト終了時にコンテキストを戻す
+
+    影響範囲:
+        - リクエスト処理中のすべてのログ出力（スレッドプールで実行される同期エンドポイントを含む）
+
+    前提条件:
+        - ddtrace のASGIインストルメンテーション（fastapi パッチ）の内側で実行される
+          （ルートスパンが生成済みであること）
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _log_context.set(RequestLogContext(scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _log_context.reset(token)
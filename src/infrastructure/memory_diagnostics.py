@@ -0,0 +1,316 @@
+"""
+メモリ診断
+
+目的: ECSタスク（アプリコンテナ 512MB）で観測されるRSSの緩やかな増加の原因を、稼働中に特定する
+影響範囲: diagnostics_controller.py（tracemalloc スナップショット・差分）、main.py（サンプラー起動）、
+          drain_service.py（サンプラー停止）
+前提条件: なし（標準ライブラリのみ）
+
+動作:
+    - tracemalloc: 管理エンドポイントで開始したときのみ有効（既定は無効、開始中は割り当てごとにオーバーヘッドあり）
+    - サンプラー: MEMORY_SAMPLER_INTERVAL_SECONDS > 0 の場合のみスレッドを起動し、
+      RSS・GC世代別オブジェクト数を定期的にメトリクス・ログへ出力（0 の場合はスレッドを作らない）
+"""
+
+import gc
+import os
+import resource
+import sys
+import threading
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+from infrastructure.logger import get_logger
+from infrastructure.metrics import get_metrics
+
+logger = get_logger()
+metrics = get_metrics()
+
+# 差分から除外するフレーム（診断処理自身の割り当て）
+_EXCLUDE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+_GROUP_BY = ("lineno", "filename", "traceback")
+
+
+class SnapshotNotFoundError(Exception):
+    """
+    スナップショット未存在エラー
+
+    発生条件:
+        - 指定された名前のスナップショットが存在しない（未取得、上限超過で削除済み、tracemalloc 停止済み）
+    """
+    pass
+
+
+def read_rss_bytes() -> int:
+    """
+    現在のRSS（バイト）を取得
+
+    Returns:
+        int: RSS（Linux は /proc/self/statm、その他は最大RSS で代替）
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS はバイト、Linux はKB
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def memory_sample() -> Dict[str, Any]:
+    """
+    RSS・GC の現在値を取得（レスポンス・ログ用）
+
+    Returns:
+        Dict[str, Any]: {"rss_mb", "gc_counts"（世代別の追跡オブジェクト数）, "gc_collections"（世代別のGC回数）}
+    """
+    return {
+        "rss_mb": round(read_rss_bytes() / (1024 * 1024), 1),
+        "gc_counts": list(gc.get_count()),
+        "gc_collections": [stats["collections"] for stats in gc.get_stats()],
+    }
+
+
+class MemoryTracer:
+    """
+    tracemalloc のスナップショット管理
+
+    責務:
+        - tracemalloc の開始・停止
+        - 名前付きスナップショットの保持（上限 MEMORY_MAX_SNAPSHOTS、超過時は古い順に削除）
+        - 2つのスナップショット間の割り当て差分（上位N件）
+
+    前提条件:
+        - スレッドセーフ（同期エンドポイントはスレッドプールで実行される）
+    """
+
+    def __init__(self, max_snapshots: int = 4):
+        self.max_snapshots = max(1, max_snapshots)
+        self._lock = threading.Lock()
+        self._snapshots: "OrderedDict[str, tracemalloc.Snapshot]" = OrderedDict()
+
+    def start(self, frames: int = 1) -> Dict[str, Any]:
+        """
+        tracemalloc を開始（開始済みの場合は何もしない）
+
+        Args:
+            frames (int): 割り当てごとに保持するスタックの深さ（大きいほどオーバーヘッド増）
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.warning("tracemalloc started (frames=%d)", frames, extra={"severity": "warning"})
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        tracemalloc を停止し、スナップショットを破棄
+        """
+        with self._lock:
+            self._snapshots.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("tracemalloc stopped")
+        return self.status()
+
+    def take_snapshot(self, name: str) -> Dict[str, Any]:
+        """
+        名前付きスナップショットを取得（同名は上書き）
+
+        Raises:
+            ValueError: tracemalloc が開始されていない
+        """
+        if not tracemalloc.is_tracing():
+            raise ValueError("tracemalloc is not running (start it first)")
+        snapshot = tracemalloc.take_snapshot().filter_traces(_EXCLUDE_FILTERS)
+        with self._lock:
+            self._snapshots.pop(name, None)
+            self._snapshots[name] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        stats = snapshot.statistics("filename")
+        return {
+            "name": name,
+            "traced_mb": round(sum(stat.size for stat in stats) / (1024 * 1024), 2),
+            "blocks": sum(stat.count for stat in stats),
+            **memory_sample(),
+        }
+
+    def _get(self, name: str) -> tracemalloc.Snapshot:
+        with self._lock:
+            snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            raise SnapshotNotFoundError(f"Snapshot not found: {name}")
+        return snapshot
+
+    def diff(
+        self,
+        base: str,
+        target: Optional[str] = None,
+        top: int = 20,
+        group_by: str = "lineno"
+    ) -> Dict[str, Any]:
+        """
+        2つのスナップショット間の割り当て差分（増加量の大きい順）
+
+        Args:
+            base (str): 比較元スナップショット名
+            target (Optional[str]): 比較先スナップショット名（None の場合は現時点）
+            top (int): 件数
+            group_by (str): "lineno"（ファイル・行）、"filename"（ファイル）、"traceback"（スタック）
+
+        Returns:
+            Dict[str, Any]: {"base", "target", "total_diff_kb", "top": [{"file", "line", "size_diff_kb", ...}]}
+
+        Raises:
+            ValueError: group_by が不正、target 省略時に tracemalloc が開始されていない
+            SnapshotNotFoundError: スナップショットが存在しない
+        """
+        if group_by not in _GROUP_BY:
+            raise ValueError(f"Invalid group_by: {group_by} ({', '.join(_GROUP_BY)})")
+        base_snapshot = self._get(base)
+        if target is None:
+            if not tracemalloc.is_tracing():
+                raise ValueError("tracemalloc is not running (start it first)")
+            target_snapshot = tracemalloc.take_snapshot().filter_traces(_EXCLUDE_FILTERS)
+        else:
+            target_snapshot = self._get(target)
+
+        stats = target_snapshot.compare_to(base_snapshot, group_by)
+        entries: List[Dict[str, Any]] = []
+        for stat in stats[:top]:
+            frame = stat.traceback[0]
+            entry: Dict[str, Any] = {
+                "file": frame.filename,
+                "line": frame.lineno if group_by != "filename" else None,
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "size_kb": round(stat.size / 1024, 1),
+                "count_diff": stat.count_diff,
+                "count": stat.count,
+            }
+            if group_by == "traceback":
+                entry["traceback"] = [f"{f.filename}:{f.lineno}" for f in stat.traceback]
+            entries.append(entry)
+
+        return {
+            "base": base,
+            "target": target or "current",
+            "group_by": group_by,
+            "total_diff_kb": round(sum(stat.size_diff for stat in stats) / 1024, 1),
+            "top": entries,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        """
+        tracemalloc の状態を取得
+        """
+        tracing = tracemalloc.is_tracing()
+        result: Dict[str, Any] = {"tracing": tracing}
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            result.update({
+                "frames": tracemalloc.get_traceback_limit(),
+                "traced_mb": round(current / (1024 * 1024), 2),
+                "traced_peak_mb": round(peak / (1024 * 1024), 2),
+                "overhead_mb": round(tracemalloc.get_tracemalloc_memory() / (1024 * 1024), 2),
+            })
+        with self._lock:
+            result["snapshots"] = list(self._snapshots)
+        return result
+
+
+class MemorySampler:
+    """
+    RSS・GC の定期サンプラー
+
+    責務:
+        - interval ごとに RSS・GC世代別オブジェクト数・GC回数をゲージとして記録
+        - 起動時からのRSS増加量をログ出力（傾向の把握用）
+
+    前提条件:
+        - interval <= 0 の場合は start() してもスレッドを作らない
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._baseline_rss: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def sample(self) -> Dict[str, Any]:
+        """
+        1回分のサンプルを記録する
+        """
+        rss = read_rss_bytes()
+        if self._baseline_rss is None:
+            self._baseline_rss = rss
+        sample = memory_sample()
+        sample["rss_growth_mb"] = round((rss - self._baseline_rss) / (1024 * 1024), 1)
+
+        metrics.gauge("process.rss_mb", sample["rss_mb"])
+        for generation, count in enumerate(sample["gc_counts"]):
+            metrics.gauge("process.gc.objects", count, tags=[f"generation:{generation}"])
+        for generation, collections in enumerate(sample["gc_collections"]):
+            metrics.gauge("process.gc.collections", collections, tags=[f"generation:{generation}"])
+        logger.info("Memory sample", extra={"memory": sample})
+        return sample
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(
+                    "Memory sample failed: %s",
+                    e,
+                    extra={"error_type": "memory_sample_failed", "severity": "warning"}
+                )
+
+    def start(self) -> None:
+        """
+        サンプラースレッドを開始（無効・起動済みの場合は何もしない）
+        """
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop_event.clear()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        サンプラースレッドを停止
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+
+# シングルトンインスタンス
+memory_tracer = MemoryTracer(max_snapshots=settings.MEMORY_MAX_SNAPSHOTS)
+_sampler: Optional[MemorySampler] = None
+
+
+def get_memory_sampler() -> MemorySampler:
+    """
+    グローバルメモリサンプラーを取得（シングルトン）
+
+    Returns:
+        MemorySampler: MEMORY_SAMPLER_INTERVAL_SECONDS で設定済みのサンプラー
+    """
+    global _sampler
+    if _sampler is None:
+        _sampler = MemorySampler(settings.MEMORY_SAMPLER_INTERVAL_SECONDS)
+    return _sampler
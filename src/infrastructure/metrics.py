@@ -0,0 +1,364 @@
+"""
+DogStatsD カスタムメトリクス（クライアント側集約）
+
+目的: アプリケーションのホットパスから安価にカスタムメトリクスを記録し、Datadog Agent へUDPでまとめて送信
+影響範囲: items_controller.py（テナント別メトリクス）、monitoring_service.py、main.py（起動・停止）
+前提条件: Datadog Agent が DD_AGENT_HOST:DD_DOGSTATSD_PORT（UDP）で待ち受けている
+"""
+
+import random
+import socket
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from config.settings import settings
+from infrastructure.logger import get_logger
+
+logger = get_logger()
+
+# メトリクス種別（DogStatsD プロトコルの型記号）
+COUNTER = "c"
+GAUGE = "g"
+HISTOGRAM = "h"
+DISTRIBUTION = "d"
+
+# カーディナリティ上限超過時に置き換えるタグ
+OVERFLOW_TAGS: Tuple[str, ...] = ("cardinality:overflow",)
+
+_ContextKey = Tuple[str, str, Tuple[str, ...]]
+
+
+class _Samples:
+    """
+    histogram / distribution のサンプル保持（リザーバサンプリング）
+
+    責務:
+        - フラッシュ間隔内のサンプルを上限件数まで保持
+        - 上限超過時は一様サンプリングし、送信時にサンプルレートを付与（Agent側で件数を補正）
+    """
+
+    __slots__ = ("values", "seen")
+
+    def __init__(self):
+        self.values: List[float] = []
+        self.seen = 0
+
+    def add(self, value: float, max_samples: int) -> None:
+        self.seen += 1
+        if len(self.values) < max_samples:
+            self.values.append(value)
+            return
+        index = random.randrange(self.seen)
+        if index < max_samples:
+            self.values[index] = value
+
+
+class MetricsClient:
+    """
+    クライアント側集約 DogStatsD クライアント
+
+    責務:
+        - counter（合算）、gauge（最終値）、histogram / distribution（サンプル）のプロセス内集約
+        - フラッシュ間隔ごとにUDPパケット（最大 max_packet_size バイト）にまとめて送信
+        - メトリクス別のタグ組み合わせ数（コンテキスト数）の上限ガード
+
+    影響範囲:
+        - DD_METRICS_ENABLED=false の場合はすべての記録がno-op
+
+    前提条件:
+        - start() でフラッシュスレッドを開始、stop() で最終フラッシュ
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        namespace: str = "",
+        constant_tags: Optional[Sequence[str]] = None,
+        flush_interval: float = 10.0,
+        max_packet_size: int = 1432,
+        max_contexts_per_metric: int = 1000,
+        max_samples: int = 1000,
+        enabled: bool = True
+    ):
+        self.host = host
+        self.port = port
+        self.prefix = f"{namespace}." if namespace else ""
+        self.constant_tags: Tuple[str, ...] = tuple(constant_tags or ())
+        self.flush_interval = flush_interval
+        self.max_packet_size = max_packet_size
+        self.max_contexts_per_metric = max_contexts_per_metric
+        self.max_samples = max_samples
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._counters: Dict[_ContextKey, float] = {}
+        self._gauges: Dict[_ContextKey, float] = {}
+        self._samples: Dict[_ContextKey, _Samples] = {}
+        self._contexts: Dict[str, Set[Tuple[str, ...]]] = {}
+        self._overflows = 0
+
+        self._socket: Optional[socket.socket] = None
+        self._address: Optional[Tuple[str, int]] = None
+        self._send_errors = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- 記録API（ホットパス） ----
+
+    def increment(self, name: str, value: float = 1, tags: Optional[Sequence[str]] = None) -> None:
+        """
+        カウンタを加算
+
+        Args:
+            name (str): メトリクス名（namespace は自動付与）
+            value (float): 加算値
+            tags (Optional[Sequence[str]]): タグ（例: ["tenant:tenant-a"]）
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            key = self._context(COUNTER, name, tags)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def gauge(self, name: str, value: float, tags: Optional[Sequence[str]] = None) -> None:
+        """
+        ゲージを設定（フラッシュ間隔内の最終値を送信）
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[self._context(GAUGE, name, tags)] = value
+
+    def histogram(self, name: str, value: float, tags: Optional[Sequence[str]] = None) -> None:
+        """
+        ヒストグラムにサンプルを追加（Agent側でホスト単位に集計）
+        """
+        self._add_sample(HISTOGRAM, name, value, tags)
+
+    def distribution(self, name: str, value: float, tags: Optional[Sequence[str]] = None) -> None:
+        """
+        ディストリビューションにサンプルを追加（Datadog側でグローバルに集計）
+        """
+        self._add_sample(DISTRIBUTION, name, value, tags)
+
+    def _add_sample(
+        self,
+        metric_type: str,
+        name: str,
+        value: float,
+        tags: Optional[Sequence[str]]
+    ) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            key = self._context(metric_type, name, tags)
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = _Samples()
+            samples.add(value, self.max_samples)
+
+    def _context(self, metric_type: str, name: str, tags: Optional[Sequence[str]]) -> _ContextKey:
+        # ロック保持中に呼び出すこと
+        tag_tuple = tuple(tags) if tags else ()
+        contexts = self._contexts.get(name)
+        if contexts is None:
+            contexts = self._contexts[name] = set()
+        if tag_tuple not in contexts:
+            if len(contexts) >= self.max_contexts_per_metric:
+                self._overflows += 1
+                tag_tuple = OVERFLOW_TAGS
+            else:
+                contexts.add(tag_tuple)
+        return metric_type, name, tag_tuple
+
+    # ---- 送信 ----
+
+    def _format_lines(
+        self,
+        counters: Dict[_ContextKey, float],
+        gauges: Dict[_ContextKey, float],
+        samples: Dict[_ContextKey, _Samples]
+    ) -> List[str]:
+        lines: List[str] = []
+        for (metric_type, name, tags), value in list(counters.items()) + list(gauges.items()):
+            lines.append(self._line(name, [value], metric_type, 1.0, tags))
+
+        for (metric_type, name, tags), sample in samples.items():
+            rate = len(sample.values) / sample.seen if sample.seen else 1.0
+            # 1行がパケットサイズを超えないようサンプルを分割（DogStatsD v1.1 複数値形式）
+            chunk: List[float] = []
+            chunk_length = 0
+            for value in sample.values:
+                formatted_length = len(_format_value(value)) + 1
+                if chunk and chunk_length + formatted_length > self.max_packet_size // 2:
+                    lines.append(self._line(name, chunk, metric_type, rate, tags))
+                    chunk, chunk_length = [], 0
+                chunk.append(value)
+                chunk_length += formatted_length
+            if chunk:
+                lines.append(self._line(name, chunk, metric_type, rate, tags))
+        return lines
+
+    def _line(
+        self,
+        name: str,
+        values: Iterable[float],
+        metric_type: str,
+        rate: float,
+        tags: Tuple[str, ...]
+    ) -> str:
+        line = f"{self.prefix}{name}:{':'.join(_format_value(v) for v in values)}|{metric_type}"
+        if rate < 1.0:
+            line += f"|@{rate:.6g}"
+        all_tags = self.constant_tags + tags
+        if all_tags:
+            line += "|#" + ",".join(all_tags)
+        return line
+
+    def _packets(self, lines: List[str]) -> List[bytes]:
+        packets: List[bytes] = []
+        buffer: List[bytes] = []
+        size = 0
+        for line in lines:
+            encoded = line.encode("utf-8")
+            added = len(encoded) + (1 if buffer else 0)
+            if buffer and size + added > self.max_packet_size:
+                packets.append(b"\n".join(buffer))
+                buffer, size = [], 0
+                added = len(encoded)
+            buffer.append(encoded)
+            size += added
+        if buffer:
+            packets.append(b"\n".join(buffer))
+        return packets
+
+    def _send(self, packet: bytes) -> None:
+        try:
+            if self._socket is None:
+                self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self._socket.setblocking(False)
+            if self._address is None:
+                address_info = socket.getaddrinfo(self.host, self.port, socket.AF_INET, socket.SOCK_DGRAM)
+                self._address = address_info[0][4]
+            self._socket.sendto(packet, self._address)
+        except OSError:
+            # Agent未起動・名前解決失敗時もアプリケーションには影響させない（次回再解決）
+            self._send_errors += 1
+            self._address = None
+
+    def flush(self) -> int:
+        """
+        集約済みメトリクスを送信し、集約状態をリセット
+
+        Returns:
+            int: 送信したパケット数
+        """
+        if not self.enabled:
+            return 0
+
+        with self._lock:
+            counters, self._counters = self._counters, {}
+            gauges, self._gauges = self._gauges, {}
+            samples, self._samples = self._samples, {}
+            overflows, self._overflows = self._overflows, 0
+
+        if overflows:
+            counters[(COUNTER, "metrics.cardinality_overflow", ())] = overflows
+
+        packets = self._packets(self._format_lines(counters, gauges, samples))
+        for packet in packets:
+            self._send(packet)
+        return len(packets)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(
+                    "Metrics flush failed: %s",
+                    e,
+                    extra={"error_type": "metrics_flush_failed", "severity": "warning"}
+                )
+
+    def start(self) -> None:
+        """
+        フラッシュスレッドを開始（多重起動しない）
+        """
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        フラッシュスレッドを停止し、残りのメトリクスを送信
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval)
+            self._thread = None
+        self.flush()
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return f"{value:.6g}"
+
+
+_valid_tenants: Optional[FrozenSet[str]] = None
+
+
+def tenant_tag(tenant_id: str) -> str:
+    """
+    テナントタグを生成（カーディナリティガード）
+
+    目的:
+        - 許可リスト外のテナントID（任意のパス入力）をタグ値にしない
+
+    Args:
+        tenant_id (str): テナントID
+
+    Returns:
+        str: "tenant:<tenant_id>"（許可リスト外は "tenant:unknown"）
+    """
+    global _valid_tenants
+    if _valid_tenants is None:
+        _valid_tenants = frozenset(settings.valid_tenant_list)
+    return f"tenant:{tenant_id}" if tenant_id in _valid_tenants else "tenant:unknown"
+
+
+# グローバルメトリクスクライアント
+_metrics: Optional[MetricsClient] = None
+
+
+def get_metrics() -> MetricsClient:
+    """
+    グローバルメトリクスクライアントを取得（シングルトン）
+
+    Returns:
+        MetricsClient: 設定済みクライアント（DD_AGENT_HOST:DD_DOGSTATSD_PORT 宛て）
+    """
+    global _metrics
+    if _metrics is None:
+        _metrics = MetricsClient(
+            host=settings.DD_AGENT_HOST,
+            port=settings.DD_DOGSTATSD_PORT,
+            namespace=settings.DD_METRICS_NAMESPACE,
+            constant_tags=[
+                f"service:{settings.DD_SERVICE}",
+                f"env:{settings.DD_ENV}",
+                f"version:{settings.DD_VERSION}",
+            ],
+            flush_interval=settings.DD_METRICS_FLUSH_INTERVAL_SECONDS,
+            max_contexts_per_metric=settings.DD_METRICS_MAX_CONTEXTS,
+            max_samples=settings.DD_METRICS_MAX_SAMPLES,
+            enabled=settings.DD_METRICS_ENABLED,
+        )
+    return _metrics
@@ -0,0 +1,195 @@
+"""
+サンプリングプロファイラ
+
+目的: 再デプロイせずに、稼働中のECSタスクでCPU時間がどこで使われているかを調べる
+影響範囲: diagnostics_controller.py（POST /admin/diagnostics/profile）
+前提条件: なし（標準ライブラリのみ、CPython の sys._current_frames を使用）
+
+動作:
+    - 専用スレッドが interval ごとに全スレッドのスタックを取得し、同一スタックの出現回数を数える
+      （計測対象のコードには何も挿入しないため、オーバーヘッドは間隔とスレッド数にのみ比例する）
+    - 出力は collapsed stacks（flamegraph.pl / speedscope 入力）または speedscope JSON
+    - 同時に実行できるプロファイルは1つ
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# スタック内の1フレーム（関数名、ファイル、関数の定義行。実行中の行ではなく関数単位で集計する）
+Frame = Tuple[str, str, int]
+
+# 待機中とみなすスレッドの先端フレームのファイル（idle=False の場合は除外）
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py", "socket.py", "ssl.py")
+
+
+class ProfilerBusyError(Exception):
+    """
+    プロファイラ実行中エラー
+
+    発生条件:
+        - 別のプロファイルが実行中
+    """
+    pass
+
+
+class ProfileResult:
+    """
+    プロファイル結果（スタック別のサンプル数）
+
+    属性:
+        samples (Counter): {(スレッド名, (Frame, ...) ルート→先端): サンプル数}
+        interval (float): サンプリング間隔（秒）
+        duration (float): 実際の計測時間（秒）
+    """
+
+    def __init__(self, samples: "Counter[Tuple[str, Tuple[Frame, ...]]]", interval: float, duration: float):
+        self.samples = samples
+        self.interval = interval
+        self.duration = duration
+
+    @property
+    def total(self) -> int:
+        return sum(self.samples.values())
+
+    def collapsed(self) -> str:
+        """
+        collapsed stacks 形式（1行1スタック: "スレッド;関数 (ファイル:行);... サンプル数"）
+        """
+        lines = []
+        for (thread_name, stack), count in self.samples.most_common():
+            names = [thread_name] + [_frame_label(frame) for frame in stack]
+            lines.append(f"{';'.join(name.replace(';', ':') for name in names)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str = "demo-api") -> Dict[str, Any]:
+        """
+        speedscope JSON 形式（https://www.speedscope.app/file-format-schema.json、スレッド別の sampled プロファイル）
+        """
+        frames: List[Dict[str, Any]] = []
+        frame_index: Dict[Frame, int] = {}
+        profiles: Dict[str, Dict[str, Any]] = {}
+        interval_ms = self.interval * 1000
+
+        for (thread_name, stack), count in self.samples.most_common():
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indexes.append(frame_index[frame])
+
+            profile = profiles.setdefault(thread_name, {
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": 0,
+                "samples": [],
+                "weights": [],
+            })
+            profile["samples"].append(indexes)
+            profile["weights"].append(count * interval_ms)
+            profile["endValue"] += count * interval_ms
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "demo-api sampling profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+        }
+
+
+def _frame_label(frame: Frame) -> str:
+    return f"{frame[0]} ({os.path.basename(frame[1])}:{frame[2]})"
+
+
+class SamplingProfiler:
+    """
+    全スレッドのサンプリングプロファイラ
+
+    責務:
+        - 指定時間・間隔での全スレッドのスタック取得と集計
+        - 同時実行の排他（1プロファイルのみ）
+
+    前提条件:
+        - run() は完了まで呼び出し元スレッドを塞ぐ（イベントループ外から呼び出すこと）
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def run(self, duration: float, interval: float = 0.01, idle: bool = False) -> ProfileResult:
+        """
+        プロファイルを実行する
+
+        Args:
+            duration (float): 計測時間（秒）
+            interval (float): サンプリング間隔（秒）
+            idle (bool): 待機中のスレッド（ロック・I/O待ち）も含めるか
+
+        Returns:
+            ProfileResult: 結果
+
+        Raises:
+            ProfilerBusyError: 別のプロファイルが実行中
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("Another profile is already running")
+        try:
+            return self._sample(duration, interval, idle)
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _sample(duration: float, interval: float, idle: bool) -> ProfileResult:
+        own_id = threading.get_ident()
+        samples: "Counter[Tuple[str, Tuple[Frame, ...]]]" = Counter()
+        started = time.monotonic()
+        deadline = started + duration
+        next_tick = started
+
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = _extract_stack(frame)
+                if not stack:
+                    continue
+                if not idle and os.path.basename(stack[-1][1]) in _IDLE_MODULES:
+                    continue
+                samples[(names.get(thread_id, str(thread_id)), stack)] += 1
+
+            next_tick += interval
+            now = time.monotonic()
+            if next_tick >= deadline:
+                break
+            if next_tick > now:
+                time.sleep(next_tick - now)
+
+        return ProfileResult(samples, interval, time.monotonic() - started)
+
+
+def _extract_stack(frame: Optional[Any]) -> Tuple[Frame, ...]:
+    # 先端（実行中）からルートへ辿り、ルート→先端の順で返す
+    stack: List[Frame] = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+# シングルトンインスタンス
+profiler = SamplingProfiler()
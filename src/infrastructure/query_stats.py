@@ -0,0 +1,212 @@
+"""
+リクエスト単位のSQLクエリ計測
+
+目的: エンドポイントごとのクエリ発行数・DB時間を可視化し、N+1 等によるクエリ数の増加を検知する
+影響範囲: repositories/database.py（エンジンのイベントから記録）、main.py（ミドルウェア登録）、
+          テスト（query_budget によるクエリ数上限の検証）
+前提条件: SQLAlchemy の before_cursor_execute / after_cursor_execute イベント
+
+記録先:
+    - ルートスパン: db.query_count, db.time_ms
+    - メトリクス: request.db.query_count, request.db.time_ms（histogram、route タグ付き）
+    - ログ: QUERY_COUNT_WARN_THRESHOLD 以上のリクエストは warning（extra: db）
+
+注意:
+    - カウント対象はカーソル実行（SQLAlchemy 経由の statement）のみ。
+      デッドライン用の SET LOCAL statement_timeout、pre_ping、接続確立は含まない
+    - スレッドプールで実行される同期エンドポイントの発行分も含む（コンテキストがコピーされるため）。
+      グループコミットの書き込みスレッドなど、リクエスト外のスレッドで発行されたクエリは含まない
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from ddtrace import tracer
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config.settings import settings
+from infrastructure.logger import get_logger
+from infrastructure.metrics import get_metrics
+
+logger = get_logger()
+metrics = get_metrics()
+
+
+class QueryStats:
+    """
+    クエリ発行数・DB時間の集計
+
+    属性:
+        count (int): 発行した statement 数
+        time (float): DB時間の合計（秒、カーソル実行の開始から終了まで）
+        statements (Optional[List[str]]): 発行した statement（record_statements=True の場合のみ保持）
+    """
+
+    def __init__(self, record_statements: bool = False):
+        self.count = 0
+        self.time = 0.0
+        self.statements: Optional[List[str]] = [] if record_statements else None
+
+    def add(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.time += elapsed
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"query_count": self.count, "time_ms": round(self.time * 1000, 3)}
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    クエリ数上限超過エラー（query_budget）
+
+    発生条件:
+        - query_budget のブロック内で発行した statement 数が上限を超えた
+    """
+    pass
+
+
+# 現在のリクエストの集計（QueryStatsMiddleware が設定）
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# 有効な query_budget（スレッド・コンテキストに関係なく、エンジン全体の発行分を数える）
+_budgets: List[QueryStats] = []
+_budgets_lock = threading.Lock()
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """
+    現在のリクエストの集計を取得
+
+    Returns:
+        Optional[QueryStats]: 集計（リクエスト外・計測無効時 None）
+    """
+    return _request_stats.get()
+
+
+def before_execute(context: Any) -> None:
+    """
+    カーソル実行の開始時刻を記録（before_cursor_execute から呼び出す）
+    """
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def after_execute(statement: str, context: Any) -> None:
+    """
+    カーソル実行1回分を現在のリクエスト・有効な query_budget に記録（after_cursor_execute から呼び出す）
+    """
+    started = getattr(context, "_query_started", None)
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.add(statement, elapsed)
+    if _budgets:
+        with _budgets_lock:
+            for budget in _budgets:
+                budget.add(statement, elapsed)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """
+    ブロック内で発行した statement 数が上限以下であることを検証する（テスト用）
+
+    目的:
+        - エンドポイントごとのクエリ数を固定し、N+1 等の増加を回帰として検出
+
+    Args:
+        max_queries (int): 許容する statement 数の上限
+
+    Yields:
+        QueryStats: ブロック内の集計（statement を保持）
+
+    Raises:
+        QueryBudgetExceeded: 上限を超えた（発行した statement を含む）
+
+    注意:
+        - TestClient はアプリを別スレッドで実行するため、リクエストのコンテキストではなく
+          エンジン全体の発行分を数える（並行して他のテストを実行しないこと）
+
+    使用例:
+        with query_budget(2):
+            client.post("/tenant-a/items", json={"name": "a"})
+    """
+    budget = QueryStats(record_statements=True)
+    with _budgets_lock:
+        _budgets.append(budget)
+    try:
+        yield budget
+    finally:
+        with _budgets_lock:
+            _budgets.remove(budget)
+
+    if budget.count > max_queries:
+        listing = "\n".join(f"  {i}. {statement}" for i, statement in enumerate(budget.statements or [], 1))
+        raise QueryBudgetExceeded(
+            f"Expected at most {max_queries} queries, {budget.count} were executed:\n{listing}"
+        )
+
+
+class QueryStatsMiddleware:
+    """
+    リクエスト単位のクエリ計測ASGIミドルウェア
+
+    責務:
+        - リクエストごとに集計を設定し、終了時にルートスパン・メトリクス・ログへ記録
+        - QUERY_COUNT_WARN_THRESHOLD 以上のリクエストを warning ログ出力
+
+    前提条件:
+        - ddtrace のASGIインストルメンテーション（fastapi パッチ）の内側で実行される
+    """
+
+    def __init__(self, app: ASGIApp, warn_threshold: Optional[int] = None):
+        self.app = app
+        self.warn_threshold = (
+            warn_threshold if warn_threshold is not None else settings.QUERY_COUNT_WARN_THRESHOLD
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _request_stats.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_stats.reset(token)
+            self._record(scope, stats)
+
+    def _record(self, scope: Scope, stats: QueryStats) -> None:
+        # FastAPI のルーティング後はルートのパステンプレート（例: /{tenant_id}/items）を使う
+        route = scope.get("route")
+        route_path = getattr(route, "path", None) or "unmatched"
+        time_ms = stats.time * 1000
+
+        root_span = tracer.current_root_span()
+        if root_span is not None:
+            root_span.set_tags({"db.query_count": stats.count, "db.time_ms": round(time_ms, 3)})
+
+        tags = [f"route:{route_path}", f"method:{scope['method']}"]
+        metrics.histogram("request.db.query_count", stats.count, tags=tags)
+        metrics.histogram("request.db.time_ms", time_ms, tags=tags)
+
+        if 0 < self.warn_threshold <= stats.count:
+            logger.warning(
+                "High query count: %d queries for %s %s",
+                stats.count,
+                scope["method"],
+                route_path,
+                extra={
+                    "error_type": "high_query_count",
+                    "severity": "warning",
+                    "db": {**stats.as_dict(), "method": scope["method"], "route": route_path},
+                }
+            )
@@ -0,0 +1,106 @@
+"""
+レディネス（トラフィック受付可否）状態管理
+
+目的: ウォームアップ完了まで・ドレイン開始後はトラフィックを受け付けない状態であることを示す
+      （ALBのヘルスチェック GET /{tenant_id}/health と GET /ready を503にする）
+影響範囲: health_controller.py（GET /{tenant_id}/health、GET /ready）、warmup_service.py（状態更新）、
+          drain_service.py（ドレイン開始）
+前提条件: なし（プロセス内の状態のみ保持）
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class ReadinessState:
+    """
+    レディネス状態
+
+    責務:
+        - 状態（starting / warming_up / ready / draining）の保持
+        - ウォームアップ結果（所要時間、詳細）の保持
+
+    影響範囲:
+        - GET /{tenant_id}/health（ALBヘルスチェック）、GET /ready（レディネス）
+        - GET /health（ライブネス）は本状態に依存しない
+
+    前提条件:
+        - スレッドセーフ（ウォームアップはバックグラウンドスレッドで実行される）
+    """
+
+    STARTING = "starting"
+    WARMING_UP = "warming_up"
+    READY = "ready"
+    DRAINING = "draining"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._status = self.STARTING
+        self._started_at: Optional[float] = None
+        self._details: Dict[str, Any] = {}
+
+    @property
+    def status(self) -> str:
+        return self._status
+
+    @property
+    def is_ready(self) -> bool:
+        return self._status == self.READY
+
+    def mark_warming_up(self) -> None:
+        """
+        ウォームアップ開始を記録
+        """
+        with self._lock:
+            self._status = self.WARMING_UP
+            self._started_at = time.monotonic()
+
+    def mark_ready(self, details: Optional[Dict[str, Any]] = None) -> None:
+        """
+        ウォームアップ完了を記録（以降 /{tenant_id}/health・/ready は200）
+
+        Args:
+            details (Optional[Dict[str, Any]]): ウォームアップ結果（接続数、プライム結果等）
+        """
+        with self._lock:
+            drain_reason = self._details.get("drain_reason")
+            self._details = dict(details or {})
+            if self._started_at is not None:
+                self._details["warmup_ms"] = round((time.monotonic() - self._started_at) * 1000, 1)
+            # ウォームアップ中にドレインが始まった場合は ready に戻さない
+            if self._status != self.DRAINING:
+                self._status = self.READY
+            else:
+                self._details["drain_reason"] = drain_reason
+
+    def mark_draining(self, reason: str) -> bool:
+        """
+        ドレイン開始を記録（以降 /{tenant_id}/health・/ready は503、元に戻さない）
+
+        Args:
+            reason (str): 開始理由（例: "admin_shutdown", "shutdown"）
+
+        Returns:
+            bool: True（今回ドレインを開始した）、False（開始済み）
+        """
+        with self._lock:
+            if self._status == self.DRAINING:
+                return False
+            self._status = self.DRAINING
+            self._details["drain_reason"] = reason
+            return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        現在の状態を辞書で取得（レスポンス用）
+
+        Returns:
+            Dict[str, Any]: {"status": str, **details}
+        """
+        with self._lock:
+            return {"status": self._status, **self._details}
+
+
+# シングルトンインスタンス
+readiness = ReadinessState()
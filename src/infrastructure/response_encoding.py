@@ -0,0 +1,333 @@
+"""
+レスポンスエンコーディング（コンテンツネゴシエーション、圧縮）
+
+目的: 大きな一覧レスポンスのALB経由の転送量を削減（MessagePack、gzip/brotli）
+影響範囲: items_controller.py（一覧・詳細レスポンス）、main.py（圧縮ミドルウェア登録）
+前提条件: msgpack / brotli がインストールされている（未インストール時は該当方式を無効化）
+"""
+
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import anyio
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import settings
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - requirements.txt に含まれる
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - requirements.txt に含まれる
+    brotli = None
+
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# 圧縮対象のContent-Type（MessagePack等のバイナリは圧縮効率が低いため対象外）
+COMPRESSIBLE_MEDIA_TYPES = ("application/json", "text/")
+
+# このサイズを超える本体はイベントループを塞がないようスレッドプールで圧縮
+OFFLOAD_THRESHOLD_BYTES = 256 * 1024
+
+
+def _parse_accept(accept: str) -> Dict[str, float]:
+    """
+    Accept ヘッダをメディアタイプ → q値 の辞書に変換
+
+    Args:
+        accept (str): Accept ヘッダ値（例: "application/msgpack, application/json;q=0.5"）
+
+    Returns:
+        Dict[str, float]: {メディアタイプ: q値}
+    """
+    preferences: Dict[str, float] = {}
+    for media_range in accept.split(","):
+        parts = media_range.strip().split(";")
+        media_type = parts[0].strip().lower()
+        if not media_type:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        preferences[media_type] = quality
+    return preferences
+
+
+def prefers_msgpack(request: Request) -> bool:
+    """
+    クライアントが JSON より MessagePack を優先しているか判定
+
+    Args:
+        request (Request): リクエスト
+
+    Returns:
+        bool: True（MessagePackで返す）、False（JSONで返す）
+    """
+    if msgpack is None or not settings.RESPONSE_MSGPACK_ENABLED:
+        return False
+
+    accept = request.headers.get("accept")
+    if not accept or "msgpack" not in accept:
+        return False
+
+    preferences = _parse_accept(accept)
+    msgpack_q = max(preferences.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    json_q = max(
+        preferences.get("application/json", 0.0),
+        preferences.get("application/*", 0.0),
+        preferences.get("*/*", 0.0),
+    )
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+def render(
+    request: Request,
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Accept ヘッダに応じて JSON または MessagePack でレスポンスを生成
+
+    目的:
+        - Accept: application/msgpack の場合は MessagePack で返却
+        - それ以外は JSON で返却（response_model の再検証を行わず直接シリアライズ）
+
+    Args:
+        request (Request): リクエスト（Accept ヘッダ参照）
+        content (Any): レスポンス本体（dict / list、JSONシリアライズ可能な値のみ）
+        status_code (int): HTTPステータスコード
+        headers (Optional[Dict[str, str]]): 追加レスポンスヘッダ（ETag等）
+
+    Returns:
+        Response: エンコード済みレスポンス（Vary: Accept 付き）
+    """
+    response_headers = dict(headers or {})
+    response_headers["Vary"] = "Accept"
+
+    if prefers_msgpack(request):
+        return Response(
+            content=msgpack.packb(content, use_bin_type=True),
+            status_code=status_code,
+            headers=response_headers,
+            media_type=MSGPACK_MEDIA_TYPES[0],
+        )
+
+    return JSONResponse(content=content, status_code=status_code, headers=response_headers)
+
+
+def select_encoding(accept_encoding: str, supported: List[str]) -> Optional[str]:
+    """
+    Accept-Encoding とサーバー設定から圧縮方式を選択
+
+    Args:
+        accept_encoding (str): Accept-Encoding ヘッダ値
+        supported (List[str]): サーバーで有効な圧縮方式（優先順）
+
+    Returns:
+        Optional[str]: 選択された圧縮方式（"br" / "gzip"）、該当なしの場合 None
+    """
+    if not accept_encoding:
+        return None
+
+    preferences = _parse_accept(accept_encoding)
+    wildcard_q = preferences.get("*", 0.0)
+    for encoding in supported:
+        if encoding == "br" and brotli is None:
+            continue
+        if preferences.get(encoding, wildcard_q) > 0:
+            return encoding
+    return None
+
+
+class _StreamCompressor:
+    """
+    gzip / brotli の逐次圧縮ラッパー
+
+    責務:
+        - 圧縮方式の差異（zlib.compressobj / brotli.Compressor）を吸収
+    """
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31: gzip ヘッダ付き
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress_body(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    """
+    レスポンス本体を一括圧縮
+
+    Args:
+        body (bytes): 圧縮前の本体
+        encoding (str): 圧縮方式（"br" / "gzip"）
+        gzip_level (int): gzip 圧縮レベル（1〜9）
+        brotli_quality (int): brotli 品質（0〜11）
+
+    Returns:
+        bytes: 圧縮後の本体
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    閾値以上のJSONレスポンスを gzip / brotli で圧縮するASGIミドルウェア
+
+    責務:
+        - Accept-Encoding と RESPONSE_COMPRESSION（優先順）から圧縮方式を選択
+        - RESPONSE_COMPRESSION_MIN_SIZE 未満の本体は圧縮しない（CPU節約）
+        - ストリーミングレスポンスは逐次圧縮
+
+    影響範囲:
+        - すべてのエンドポイント（圧縮対象のContent-Typeのみ）
+
+    前提条件:
+        - main.py で app.add_middleware(CompressionMiddleware) が登録されている
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Optional[List[str]] = None,
+        minimum_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None
+    ):
+        self.app = app
+        self.encodings = encodings if encodings is not None else settings.response_compression_list
+        self.minimum_size = minimum_size if minimum_size is not None else settings.RESPONSE_COMPRESSION_MIN_SIZE
+        self.gzip_level = gzip_level if gzip_level is not None else settings.RESPONSE_GZIP_LEVEL
+        self.brotli_quality = brotli_quality if brotli_quality is not None else settings.RESPONSE_BROTLI_QUALITY
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """
+    1レスポンス分の圧縮状態を保持し、send をラップする
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.initial_message: Optional[Message] = None
+        self.started = False
+        self.compressor: Optional[_StreamCompressor] = None
+
+    def _is_compressible(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return any(content_type.startswith(media_type) for media_type in COMPRESSIBLE_MEDIA_TYPES)
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # 本体の最初のチャンクを見るまでヘッダ送信を保留
+            self.initial_message = message
+            return
+
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.compressor is not None:
+            await self._send_stream_chunk(message)
+            return
+
+        if self.started:
+            await self._send(message)
+            return
+
+        self.started = True
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self._is_compressible(headers):
+            await self._send(self.initial_message)
+            await self._send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+
+        if not more_body:
+            # 一括レスポンス: 閾値未満は無圧縮
+            if len(body) < self.middleware.minimum_size:
+                await self._send(self.initial_message)
+                await self._send(message)
+                return
+
+            body = await self._compress(body)
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(body))
+            await self._send(self.initial_message)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+
+        # ストリーミングレスポンス: 逐次圧縮（Content-Length は不定）
+        self.compressor = _StreamCompressor(
+            self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+        )
+        headers["Content-Encoding"] = self.encoding
+        if "content-length" in headers:
+            del headers["content-length"]
+        await self._send(self.initial_message)
+        await self._send_stream_chunk(message)
+
+    async def _send_stream_chunk(self, message: Message) -> None:
+        body = self.compressor.compress(message.get("body", b""))
+        more_body = message.get("more_body", False)
+        if not more_body:
+            body += self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    async def _compress(self, body: bytes) -> bytes:
+        args: Tuple[Any, ...] = (
+            body, self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+        )
+        if len(body) >= OFFLOAD_THRESHOLD_BYTES:
+            return await anyio.to_thread.run_sync(compress_body, *args)
+        return compress_body(*args)
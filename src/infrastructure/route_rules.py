@@ -0,0 +1,80 @@
+"""
+ルート別ルール定義
+
+目的: 「メソッド + パスパターン = 値」形式の設定を解析し、リクエストに一致する値を返す
+影響範囲: datadog_middleware.py（ルート別トレースサンプリング率）
+前提条件: なし
+
+書式:
+    カンマ区切りの "[METHOD ]PATH_GLOB=VALUE"（先頭一致のルールを採用）
+    例: "GET /health=0.01,GET /*/health=0.01,POST *=1"
+    - METHOD 省略時、または "*" の場合は全メソッドに一致
+    - PATH_GLOB は fnmatch 形式（"*" はスラッシュを含む任意の文字列に一致）
+"""
+
+from fnmatch import fnmatchcase
+from typing import Any, Callable, List, NamedTuple, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RouteRule(NamedTuple):
+    """ルート別ルール（method は大文字、"*" は全メソッド）"""
+    method: str
+    pattern: str
+    value: Any
+
+
+def parse_route_rules(spec: str, cast: Callable[[str], T]) -> List[RouteRule]:
+    """
+    ルール設定文字列を解析
+
+    Args:
+        spec (str): ルール設定（例: "GET /health=0.01,POST *=1"）
+        cast (Callable[[str], T]): 値の変換関数（例: float, int）
+
+    Returns:
+        List[RouteRule]: ルールリスト（記述順）
+
+    Raises:
+        ValueError: 書式不正時（"=" がない、値の変換失敗）
+    """
+    rules: List[RouteRule] = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        target, separator, raw_value = entry.rpartition("=")
+        if not separator or not target.strip():
+            raise ValueError(f"Invalid route rule: {entry!r}")
+
+        parts = target.split()
+        if len(parts) == 1:
+            method, pattern = "*", parts[0]
+        elif len(parts) == 2:
+            method, pattern = parts[0].upper(), parts[1]
+        else:
+            raise ValueError(f"Invalid route rule: {entry!r}")
+
+        rules.append(RouteRule(method, pattern, cast(raw_value.strip())))
+    return rules
+
+
+def match_route_rule(rules: List[RouteRule], method: str, path: str) -> Optional[T]:
+    """
+    リクエストに一致する最初のルールの値を返す
+
+    Args:
+        rules (List[RouteRule]): ルールリスト
+        method (str): HTTPメソッド
+        path (str): リクエストパス
+
+    Returns:
+        Optional[T]: 一致したルールの値（一致なしの場合 None）
+    """
+    for rule in rules:
+        if rule.method != "*" and rule.method != method:
+            continue
+        if fnmatchcase(path, rule.pattern):
+            return rule.value
+    return None
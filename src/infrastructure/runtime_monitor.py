@@ -0,0 +1,187 @@
+"""
+スレッドプール・イベントループ監視
+
+目的: 同期エンドポイント（get_items, create_item, health_check_* 等）を実行するスレッドプールの飽和を、
+      APMのレイテンシ以外のシグナルで検知する
+影響範囲: main.py（起動時の設定・監視開始）、drain_service.py（監視停止）
+前提条件: AnyIO（Starlette の run_in_threadpool が使用する既定のスレッドプール）、
+          FastAPI（同期エンドポイント・依存関係を run_in_threadpool で実行する）
+
+メトリクス:
+    - threadpool.wait_ms（histogram）: 同期処理がワーカースレッドの空きを待った時間
+      （FastAPI の同期エンドポイント・依存関係の実行1回ごと）
+    - threadpool.limit / threadpool.busy / threadpool.waiting（gauge）: 上限、使用中、空き待ちの数
+    - event_loop.lag_ms（histogram）: イベントループの遅延（sleep の予定時刻からの遅れ）
+    ルートスパンには threadpool.wait_ms（リクエスト内の合計）を記録する
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, List, Optional
+
+import anyio.to_thread
+import fastapi.concurrency
+import fastapi.dependencies.utils
+import fastapi.routing
+from ddtrace import tracer
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config.settings import settings
+from infrastructure.logger import get_logger
+from infrastructure.metrics import get_metrics
+
+logger = get_logger()
+metrics = get_metrics()
+
+# リクエスト内のスレッドプール待ち時間の合計（秒、ThreadpoolWaitMiddleware が設定）
+_request_wait: ContextVar[Optional[List[float]]] = ContextVar("threadpool_request_wait", default=None)
+
+# FastAPI が同期エンドポイント（routing）・依存関係（dependencies.utils、yield を使う依存関係の concurrency）の
+# 実行に使う run_in_threadpool の参照元
+_THREADPOOL_CALLERS = (fastapi.routing, fastapi.dependencies.utils, fastapi.concurrency)
+
+
+async def timed_run_in_threadpool(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    待ち時間を計測する run_in_threadpool
+
+    責務:
+        - 呼び出しからワーカースレッドで func の実行が始まるまでの時間（スレッドの空き待ち）の計測
+        - 実行自体は Starlette の run_in_threadpool（既定の limiter）へ委譲
+
+    注意:
+        - 待ち時間にはスレッドへの受け渡し（数十µs）を含む
+    """
+    started: List[float] = []
+
+    def call() -> Any:
+        started.append(time.perf_counter())
+        return func(*args, **kwargs)
+
+    submitted = time.perf_counter()
+    try:
+        return await run_in_threadpool(call)
+    finally:
+        # キャンセル等で実行されなかった場合は記録しない
+        if started:
+            waited = started[0] - submitted
+            metrics.histogram("threadpool.wait_ms", waited * 1000)
+            request_wait = _request_wait.get()
+            if request_wait is not None:
+                request_wait[0] += waited
+
+
+def configure_threadpool() -> None:
+    """
+    既定のスレッドプール上限を THREADPOOL_LIMIT に設定し、待ち時間の計測を有効にする
+
+    前提条件:
+        - イベントループ上（startup イベント）で呼び出すこと（limiter はイベントループごと）
+
+    注意:
+        - 上限は AnyIO の公開API（current_default_thread_limiter().total_tokens）で設定する
+        - 待ち時間の計測は FastAPI の run_in_threadpool の参照（_THREADPOOL_CALLERS）を
+          timed_run_in_threadpool に置き換えて行う。参照がない（Starlette の関数でない）バージョンでは
+          その呼び出し元の計測を行わない（tests/test_runtime_monitor.py で検知する）
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_LIMIT
+
+    if settings.EVENT_LOOP_MONITOR_INTERVAL_SECONDS <= 0:
+        return
+    for module in _THREADPOOL_CALLERS:
+        current = getattr(module, "run_in_threadpool", None)
+        if current is timed_run_in_threadpool:
+            continue
+        if current is not run_in_threadpool:
+            logger.warning(
+                "Threadpool wait metrics are unavailable for %s (run_in_threadpool not found)",
+                module.__name__,
+                extra={"severity": "warning"}
+            )
+            continue
+        module.run_in_threadpool = timed_run_in_threadpool
+
+
+class ThreadpoolWaitMiddleware:
+    """
+    リクエスト単位のスレッドプール待ち時間集計ASGIミドルウェア
+
+    責務:
+        - リクエスト内のスレッドプール実行（依存関係・エンドポイント）の待ち時間を合計し、
+          ルートスパンに threadpool.wait_ms として記録
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_wait = [0.0]
+        token = _request_wait.set(request_wait)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_wait.reset(token)
+            root_span = tracer.current_root_span()
+            if root_span is not None:
+                root_span.set_tag("threadpool.wait_ms", round(request_wait[0] * 1000, 3))
+
+
+class EventLoopMonitor:
+    """
+    イベントループ遅延・スレッドプール使用状況のサンプラー
+
+    責務:
+        - interval ごとに sleep の遅れ（イベントループの遅延）を計測
+        - スレッドプールの上限・使用中・空き待ち数を記録
+
+    前提条件:
+        - イベントループ上のタスクとして実行（start / stop はイベントループ上で呼び出す）
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, loop.time() - scheduled) * 1000
+            metrics.histogram("event_loop.lag_ms", lag_ms)
+
+            statistics = limiter.statistics()
+            metrics.gauge("threadpool.limit", statistics.total_tokens)
+            metrics.gauge("threadpool.busy", statistics.borrowed_tokens)
+            metrics.gauge("threadpool.waiting", statistics.tasks_waiting)
+
+    def start(self) -> None:
+        """
+        監視タスクを開始（無効・起動済みの場合は何もしない）
+        """
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """
+        監視タスクを停止
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+# シングルトンインスタンス
+event_loop_monitor = EventLoopMonitor(settings.EVENT_LOOP_MONITOR_INTERVAL_SECONDS)
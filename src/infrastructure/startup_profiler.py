@@ -0,0 +1,159 @@
+"""
+起動プロファイラ
+
+目的: コールドスタート短縮のため、モジュール別インポート時間とフェーズ別起動時間を計測
+影響範囲: main.py（起動フェーズ計測）
+前提条件: STARTUP_PROFILE=true の場合のみ計測（無効時はフェーズ記録のみの最小コスト）
+
+注意:
+    - main.py の最初のインポートとして読み込むこと（重いモジュールより先に計測を開始するため）
+    - 本モジュールは標準ライブラリと config.settings 以外をインポートしない
+"""
+
+import builtins
+import importlib.util
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from config.settings import settings
+
+
+class StartupProfiler:
+    """
+    起動時間プロファイラ
+
+    責務:
+        - フェーズ別の所要時間記録（imports, setup_datadog, app_init, init_db 等）
+        - モジュール別インポート時間の記録（builtins.__import__ を一時的にラップ）
+        - 起動完了時のレポート生成
+
+    影響範囲:
+        - main.py（起動処理）
+
+    前提条件:
+        - STARTUP_PROFILE 環境変数（true で有効）
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.process_start = time.perf_counter()
+        self._last_mark = self.process_start
+        self.phases: Dict[str, float] = {}
+        self.imports: Dict[str, Dict[str, float]] = {}
+        self._original_import: Optional[Any] = None
+        self._stack: List[List[float]] = []
+
+    def install_import_hook(self) -> None:
+        """
+        モジュール別インポート時間の計測を開始（有効時のみ）
+
+        計測値:
+            - inclusive_ms: 依存モジュールを含む初回インポート時間
+            - self_ms: 依存モジュールを除いた自身の実行時間
+        """
+        if not self.enabled or self._original_import is not None:
+            return
+
+        original_import = builtins.__import__
+        self._original_import = original_import
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            module_name = name
+            if level > 0:
+                package = (globals or {}).get("__package__")
+                try:
+                    module_name = importlib.util.resolve_name("." * level + name, package)
+                except (ImportError, ValueError):
+                    module_name = name
+
+            # 既にロード済みのモジュールは計測しない（初回インポートのみ）
+            if module_name in sys.modules:
+                return original_import(name, globals, locals, fromlist, level)
+
+            frame = [0.0]
+            self._stack.append(frame)
+            start = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._stack.pop()
+                if self._stack:
+                    self._stack[-1][0] += elapsed
+                self.imports[module_name] = {
+                    "inclusive_ms": round(elapsed * 1000, 3),
+                    "self_ms": round((elapsed - frame[0]) * 1000, 3),
+                }
+
+        builtins.__import__ = timed_import
+
+    def uninstall_import_hook(self) -> None:
+        """
+        インポート時間の計測を終了（builtins.__import__ を元に戻す）
+        """
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        起動フェーズの所要時間を記録
+
+        Args:
+            name (str): フェーズ名（例: "setup_datadog"）
+
+        使用例:
+            with startup_profiler.phase("init_db"):
+                init_db()
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._last_mark = time.perf_counter()
+            self.phases[name] = round((self._last_mark - start) * 1000, 3)
+
+    def mark(self, name: str) -> None:
+        """
+        直前のフェーズ終了（またはプロファイラ生成）からの経過時間をフェーズとして記録
+
+        Args:
+            name (str): フェーズ名（例: "imports"）
+        """
+        now = time.perf_counter()
+        self.phases[name] = round((now - self._last_mark) * 1000, 3)
+        self._last_mark = now
+
+    def report(self, top_n: int = 20) -> Dict[str, Any]:
+        """
+        起動プロファイルのレポートを生成
+
+        Args:
+            top_n (int): 出力するインポート時間上位モジュール数
+
+        Returns:
+            Dict[str, Any]: {
+                "total_ms": float（プロファイラ生成から現在まで）,
+                "phases": {フェーズ名: ms},
+                "imports": [{"module": str, "inclusive_ms": float, "self_ms": float}, ...]
+            }
+        """
+        slowest = sorted(
+            self.imports.items(),
+            key=lambda entry: entry[1]["self_ms"],
+            reverse=True
+        )[:top_n]
+
+        return {
+            "total_ms": round((time.perf_counter() - self.process_start) * 1000, 3),
+            "phases": dict(self.phases),
+            "imports": [{"module": name, **timing} for name, timing in slowest],
+        }
+
+
+# グローバルプロファイラインスタンス（main.py の最初のインポートで生成）
+startup_profiler = StartupProfiler(enabled=settings.STARTUP_PROFILE)
+startup_profiler.install_import_hook()
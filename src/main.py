@@ -6,22 +6,49 @@ FastAPI アプリケーションエントリーポイント
 前提条件: 全モジュールが実装されている
 """
 
+# 起動プロファイラ（STARTUP_PROFILE=true の場合、以降のインポート時間を計測するため最初に読み込む）
+from infrastructure.startup_profiler import startup_profiler
+
+import asyncio
+import threading
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from infrastructure.datadog_middleware import setup_datadog
+from config.settings import settings
+from infrastructure.datadog_middleware import setup_datadog, TraceSamplingMiddleware
 from infrastructure.error_handler import register_error_handlers
-from infrastructure.logger import get_logger
-from repositories.database import init_db
+from infrastructure.logger import LogContextMiddleware, get_logger
+from infrastructure.metrics import get_metrics
+from infrastructure.response_encoding import CompressionMiddleware
+from infrastructure.deadline import DeadlineMiddleware
+from infrastructure.inflight import InFlightMiddleware
+from infrastructure.memory_diagnostics import get_memory_sampler
+from infrastructure.query_stats import QueryStatsMiddleware
+from infrastructure.runtime_monitor import (
+    ThreadpoolWaitMiddleware,
+    configure_threadpool,
+    event_loop_monitor,
+)
+from repositories.database import initialize_schema
+from repositories.group_commit import get_group_commit_writer
+from services.drain_service import DrainService
+from services.tenant_stats_service import get_tenant_stats_cache
+from services.warmup_service import WarmupService
 
 # Controllersインポート
 from api.controllers import health_controller
 from api.controllers import items_controller
 from api.controllers import simulate_controller
 from api.controllers import admin_controller
+from api.controllers import diagnostics_controller
+from api.controllers import stats_controller
+
+startup_profiler.mark("imports")
 
 # Datadog APM初期化（アプリケーション起動前に実行）
-setup_datadog()
+with startup_profiler.phase("setup_datadog"):
+    setup_datadog()
 
 # ロガー初期化
 logger = get_logger()
@@ -44,6 +71,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ルート別トレースサンプリング（DD_TRACE_ROUTE_SAMPLE_RATES が空の場合は無効）
+if settings.DD_TRACE_ROUTE_SAMPLE_RATES:
+    app.add_middleware(TraceSamplingMiddleware)
+
+# レスポンス圧縮（RESPONSE_COMPRESSION が空の場合は無効）
+if settings.response_compression_list:
+    app.add_middleware(CompressionMiddleware)
+
+# リクエスト単位のスレッドプール待ち時間（EVENT_LOOP_MONITOR_INTERVAL_SECONDS > 0 の場合）
+if settings.EVENT_LOOP_MONITOR_INTERVAL_SECONDS > 0:
+    app.add_middleware(ThreadpoolWaitMiddleware)
+
+# リクエスト単位のSQLクエリ数・DB時間（QUERY_STATS_ENABLED=true の場合）
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
+# 処理中リクエスト計数（停止時のドレインで完了を待つ）
+app.add_middleware(InFlightMiddleware)
+
+# リクエストデッドライン（予算はミドルウェア処理を含めたリクエスト全体に適用）
+app.add_middleware(DeadlineMiddleware)
+
+# リクエストログコンテキスト（最外側: すべてのミドルウェア・ハンドラのログにトレースID・ルート・テナントIDを付与）
+app.add_middleware(LogContextMiddleware)
+
 # エラーハンドラ登録
 register_error_handlers(app)
 
@@ -52,6 +104,10 @@ app.include_router(health_controller.router, tags=["Health Check"])
 app.include_router(items_controller.router, tags=["Items"])
 app.include_router(simulate_controller.router, tags=["Simulate"])
 app.include_router(admin_controller.router, tags=["Admin"])
+app.include_router(diagnostics_controller.router, tags=["Diagnostics"])
+app.include_router(stats_controller.router, tags=["Stats"])
+
+startup_profiler.mark("app_init")
 
 
 @app.on_event("startup")
@@ -60,22 +116,40 @@ async def startup_event():
     アプリケーション起動時処理
 
     目的:
-        - データベース初期化（開発環境のみ）
+        - データベース初期化（DB_SCHEMA_INIT: 開発環境は create_all、本番環境は check）
+        - ウォームアップ開始（バックグラウンド、完了まで GET /{tenant_id}/health・GET /ready は503）
         - 起動ログ出力
+        - 起動プロファイル出力（STARTUP_PROFILE=true の場合）
+        - SIGTERM ハンドラの置き換え（登録解除待ちの後に停止）
 
     影響範囲:
         - アプリケーション起動時
     """
     logger.info("Application starting up")
 
-    # データベース初期化（テーブル作成）
+    # SIGTERM 受信後、ALBの登録解除が反映されるまで受付を続けてから停止する
+    DrainService.install_signal_handler(asyncio.get_running_loop())
+
+    # スレッドプール上限（THREADPOOL_LIMIT）・待ち時間計測、イベントループ遅延の監視
+    configure_threadpool()
+    event_loop_monitor.start()
+
+    # カスタムメトリクスのフラッシュスレッド開始
+    get_metrics().start()
+
+    # データベース初期化（テーブル作成 / スキーマバージョン確認）
     # 本番環境ではAlembicによるマイグレーション推奨
     try:
-        init_db()
-        logger.info("Database initialized successfully")
+        with startup_profiler.phase("init_db"):
+            initialize_schema()
+        logger.info(
+            "Database initialized successfully",
+            extra={"db_schema_init": settings.DB_SCHEMA_INIT}
+        )
     except Exception as e:
         logger.error(
-            f"Database initialization failed: {e}",
+            "Database initialization failed: %s",
+            e,
             exc_info=True,
             extra={
                 "error_type": "startup_failure",
@@ -83,6 +157,27 @@ async def startup_event():
             }
         )
 
+    # グループコミットの書き込みスレッド開始（GROUP_COMMIT_ENABLED=true の場合）
+    if settings.GROUP_COMMIT_ENABLED:
+        get_group_commit_writer().start()
+
+    # RSS・GC の定期サンプリング（MEMORY_SAMPLER_INTERVAL_SECONDS > 0 の場合）
+    get_memory_sampler().start()
+
+    # テナント横断統計の定期再計算（TENANT_STATS_REFRESH_SECONDS > 0 の場合）
+    get_tenant_stats_cache().start()
+
+    # ウォームアップ（接続プール事前接続、ホットクエリ事前実行）
+    # イベントループを塞がないよう別スレッドで実行し、/health（ライブネス）は即応答させる
+    threading.Thread(target=WarmupService.run, name="warmup", daemon=True).start()
+
+    if startup_profiler.enabled:
+        startup_profiler.uninstall_import_hook()
+        logger.info(
+            "Startup profile",
+            extra={"startup_profile": startup_profiler.report()}
+        )
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -91,13 +186,18 @@ async def shutdown_event():
 
     目的:
         - 停止ログ出力
-        - リソースクリーンアップ
+        - ドレイン（処理中リクエストの完了待ち、バッファのフラッシュ、接続プールの破棄）
 
     影響範囲:
         - アプリケーション停止時
     """
     logger.info("Application shutting down")
 
+    event_loop_monitor.stop()
+
+    # 完了待ちでイベントループ（キャンセル済みリクエストの後処理）を塞がないよう別スレッドで実行
+    await asyncio.get_running_loop().run_in_executor(None, DrainService.drain)
+
 
 @app.get("/")
 def root():
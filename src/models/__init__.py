@@ -5,5 +5,6 @@ SQLAlchemy Model パッケージ
 """
 
 from .item import Base, Item
+from .schema_version import SchemaVersion
 
-__all__ = ["Base", "Item"]
+__all__ = ["Base", "Item", "SchemaVersion"]
@@ -6,7 +6,7 @@ items テーブル SQLAlchemy Model
 前提条件: PostgreSQL RDSが利用可能、tenant_idは有効なテナントID
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, DDL, event
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -59,9 +59,24 @@ class Item(Base):
         comment='更新日時（UTC）'
     )
 
+    # ORM上の主キーは (id, tenant_id)
+    # （UPDATE / DELETE の WHERE に tenant_id を含め、パーティショニング時にパーティションを特定させる）
+    __mapper_args__ = {"primary_key": [id, tenant_id]}
+
     # 複合インデックス: テナント別クエリ最適化
     __table_args__ = (
+        # テナント別一覧・作成日時範囲検索（created_after / created_before）・作成日時順ソート
         Index('idx_tenant_id_created_at', 'tenant_id', 'created_at'),
+        # テナント別の名前順ソート（sort=name_asc / name_desc）
+        Index('idx_tenant_id_name', 'tenant_id', 'name'),
+        # 名前の前方一致・部分一致検索（PostgreSQL のみ: pg_trgm GIN、ILIKE に使用可能）
+        # 他のDBでは作成せず、検索はテナント絞り込み後のフィルタで代替する
+        Index(
+            'idx_items_name_trgm',
+            'name',
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
     )
 
     def __repr__(self) -> str:
@@ -98,3 +113,10 @@ class Item(Base):
             "created_at": self.created_at.isoformat() + "Z" if self.created_at else None,
             "updated_at": self.updated_at.isoformat() + "Z" if self.updated_at else None,
         }
+
+
+# pg_trgm 拡張（idx_items_name_trgm の前提、PostgreSQL のみ）
+# パーティションテーブル作成時（repositories/partitioning.py）にも使用する
+PG_TRGM_EXTENSION = DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+
+event.listen(Item.__table__, "before_create", PG_TRGM_EXTENSION)
@@ -0,0 +1,48 @@
+"""
+schema_version テーブル SQLAlchemy Model
+
+目的: 適用済みスキーマのバージョン（メタデータのフィンガープリント）を記録
+影響範囲: database.py（init_db: 書き込み、check_schema_version: 読み取り）
+前提条件: DB_SCHEMA_INIT=create_all またはマイグレーションでバージョンが記録されている
+"""
+
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+
+from .item import Base
+
+
+class SchemaVersion(Base):
+    """
+    schema_version テーブルのエンティティ定義
+
+    責務:
+        - コンポーネント別の適用済みスキーマバージョン保持
+
+    影響範囲:
+        - database.py: 起動時のスキーマバージョン確認
+
+    前提条件:
+        - version は database.schema_fingerprint() の値
+    """
+
+    __tablename__ = 'schema_version'
+
+    component = Column(String(50), primary_key=True, comment='コンポーネント名')
+    version = Column(String(64), nullable=False, comment='スキーマバージョン（フィンガープリント）')
+    applied_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        comment='適用日時（UTC）'
+    )
+
+    def __repr__(self) -> str:
+        """
+        オブジェクトの文字列表現を返す（デバッグ用）
+
+        Returns:
+            str: "<SchemaVersion(component='demo-api', version='3f2a9c0e1b7d4a5c')>"
+        """
+        return f"<SchemaVersion(component='{self.component}', version='{self.version}')>"
@@ -4,12 +4,13 @@
 このパッケージはデータベースアクセスとCRUD操作を提供します。
 """
 
-from .database import get_db, init_db, check_db_connection, engine, SessionLocal
+from .database import get_db, init_db, initialize_schema, check_db_connection, engine, SessionLocal
 from .items_repository import ItemsRepository
 
 __all__ = [
     "get_db",
     "init_db",
+    "initialize_schema",
     "check_db_connection",
     "engine",
     "SessionLocal",
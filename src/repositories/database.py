@@ -6,28 +6,190 @@
 前提条件: DATABASE_URLが正しく設定されている、PostgreSQL RDSが起動している
 """
 
-from sqlalchemy import create_engine
+import hashlib
+import random
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from sqlalchemy import create_engine, event
+from sqlalchemy import exc as sa_exc
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import QueuePool
+from typing import Any, Dict, Generator, Iterator, Optional
 from config.settings import settings
 from models.item import Base
+from models.schema_version import SchemaVersion
+from repositories.partitioning import prepare_items_partitioning
 from infrastructure.logger import get_logger
+from infrastructure.circuit_breaker import CircuitBreaker
+from infrastructure.deadline import DeadlineExceeded, check_deadline, remaining
+from infrastructure import query_stats
 
 logger = get_logger()
 
 
+# PostgreSQL: statement_timeout によるクエリキャンセル
+QUERY_CANCELED_SQLSTATE = "57014"
+
+
+class DeadlineQueuePool(QueuePool):
+    """
+    チェックアウト待ち時間をリクエストの残り時間で制限する QueuePool
+
+    責務:
+        - プール枯渇時の待ち時間を min(pool_timeout, 残り時間) とする
+        - 残り時間による待ち切れは DeadlineExceeded（→ 504）に変換
+
+    前提条件:
+        - 残り時間はチェックアウトするスレッドのコンテキスト（infrastructure/deadline.py）から取得
+    """
+
+    @property
+    def _timeout(self) -> float:
+        left = remaining()
+        if left is None:
+            return self._pool_timeout
+        return max(0.0, min(self._pool_timeout, left))
+
+    @_timeout.setter
+    def _timeout(self, value: float) -> None:
+        self._pool_timeout = value
+
+    def recreate(self) -> "DeadlineQueuePool":
+        # 再作成（engine.dispose 等）時はリクエストの残り時間ではなく設定値を引き継ぐ
+        pool = super().recreate()
+        pool._timeout = self._pool_timeout
+        return pool
+
+    def _do_get(self):
+        check_deadline()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            left = remaining()
+            if left is not None and left < self._pool_timeout:
+                raise DeadlineExceeded("Request deadline exceeded while waiting for a pooled connection")
+            raise
+
+
 # データベース接続URL（環境変数から取得、SSL/TLS必須）
 DATABASE_URL = settings.DATABASE_URL
 
 # エンジン作成（接続プール設定）
 engine = create_engine(
     DATABASE_URL,
-    pool_size=10,          # 常時維持する接続数（NFR-003: テナント数10〜100対応）
-    max_overflow=20,       # 最大接続数超過時の追加接続数
+    pool_size=settings.DB_POOL_SIZE,          # 常時維持する接続数（NFR-003: テナント数10〜100対応）
+    max_overflow=settings.DB_MAX_OVERFLOW,    # 最大接続数超過時の追加接続数
     pool_pre_ping=True,    # 接続前にヘルスチェック（切断検知）
+    poolclass=DeadlineQueuePool,  # チェックアウト待ちをリクエストの残り時間で制限
     echo=False,            # SQLログ出力（本番環境では False）
 )
 
+# DB接続のサーキットブレーカー（RDS障害時は接続タイムアウトを待たずに503）
+db_circuit_breaker = CircuitBreaker(
+    "database",
+    failure_threshold=settings.DB_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.DB_CIRCUIT_RESET_TIMEOUT_SECONDS,
+    half_open_max_probes=settings.DB_CIRCUIT_HALF_OPEN_MAX_PROBES,
+    enabled=settings.DB_CIRCUIT_BREAKER_ENABLED,
+)
+
+
+@event.listens_for(engine, "do_connect")
+def _connect_with_circuit_breaker(dialect, conn_rec, cargs, cparams):
+    """
+    接続確立（プールの新規接続、pre_ping 失敗後の再接続）をサーキットブレーカー経由で行う
+
+    目的:
+        - open 中は接続を試みず即座に CircuitOpenError（→ 503 + Retry-After）
+        - 一時的な接続失敗はジッター付き指数バックオフで再試行（DB_CONNECT_RETRIES 回）
+        - 接続タイムアウトの設定（DB_CONNECT_TIMEOUT_SECONDS、PostgreSQL のみ）
+
+    Returns:
+        DBAPI接続
+
+    Raises:
+        CircuitOpenError: サーキット open
+        DBAPI Error: 再試行後も接続失敗
+    """
+    if dialect.name == "postgresql":
+        cparams.setdefault("connect_timeout", settings.DB_CONNECT_TIMEOUT_SECONDS)
+
+    db_circuit_breaker.before_call()
+
+    retries = max(0, settings.DB_CONNECT_RETRIES)
+    for attempt in range(retries + 1):
+        try:
+            connection = dialect.connect(*cargs, **cparams)
+        except dialect.loaded_dbapi.Error as e:
+            if attempt == retries:
+                db_circuit_breaker.record_failure(e)
+                raise
+            # フルジッター（同時再接続の集中を避ける）
+            backoff = settings.DB_CONNECT_RETRY_BACKOFF_MS / 1000 * (2 ** attempt)
+            time.sleep(random.uniform(0, backoff))
+        except BaseException:
+            db_circuit_breaker.record_failure()
+            raise
+        else:
+            db_circuit_breaker.record_success()
+            return connection
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _apply_statement_deadline(conn, cursor, statement, parameters, context, executemany):
+    """
+    クエリ発行時の残り時間を statement_timeout に変換（PostgreSQL のみ）
+
+    目的:
+        - ALBタイムアウト後もDBがクエリを実行し続けるのを防ぐ
+
+    Raises:
+        DeadlineExceeded: 残り時間がない（クエリを発行しない）
+
+    注意:
+        - SET LOCAL はトランザクション終了で元に戻る（プールへ返却後の接続に影響しない）
+        - デッドラインのあるリクエストでは1クエリごとに1往復増える
+    """
+    left = check_deadline()
+    if left is None or conn.dialect.name != "postgresql":
+        return
+    cursor.execute(f"SET LOCAL statement_timeout = {max(1, int(left * 1000))}")
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    """
+    クエリ計測（リクエスト単位のクエリ数・DB時間）の開始時刻を記録
+
+    注意:
+        - _apply_statement_deadline の後に登録する（SET LOCAL の往復をDB時間に含めない）
+    """
+    query_stats.before_execute(context)
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    """
+    クエリ1回分を現在のリクエストの集計に記録（infrastructure/query_stats.py）
+    """
+    query_stats.after_execute(statement, context)
+
+
+@event.listens_for(engine, "handle_error")
+def _translate_deadline_error(context):
+    """
+    statement_timeout によるクエリキャンセル（SQLSTATE 57014）を DeadlineExceeded に変換
+    """
+    original = context.original_exception
+    if getattr(original, "pgcode", None) == QUERY_CANCELED_SQLSTATE and remaining() is not None:
+        return DeadlineExceeded("Query canceled by request deadline (statement_timeout)")
+    return None
+
+
+# schema_version テーブルのコンポーネント名
+SCHEMA_COMPONENT = "demo-api"
+
 # セッションファクトリ
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -57,6 +219,7 @@ def get_db() -> Generator[Session, None, None]:
 
     例外:
         OperationalError: DB接続失敗時
+        CircuitOpenError: DB接続のサーキットが open（接続を試みずに即座に失敗、503）
 
     使用例:
         @app.get("/items")
@@ -64,6 +227,28 @@ def get_db() -> Generator[Session, None, None]:
             items = db.query(Item).all()
             return items
     """
+    with session_scope() as db:
+        yield db
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    データベースセッションを開き、終了時にクローズする（get_db と同じサーキット確認付き）
+
+    目的:
+        - エンドポイントの一部の分岐でのみDBを使う場合に、Depends(get_db) を使わず必要になった時点で開く
+          （例: 冪等キーの再送はDBに触れずに応答する、items_controller.py の create_item）
+
+    Yields:
+        Session: SQLAlchemy セッション
+
+    例外:
+        CircuitOpenError: DB接続のサーキットが open（接続を試みずに即座に失敗、503）
+    """
+    # open 中はセッションを作らず即座に失敗（プール内接続の pre_ping 待ちも避ける）
+    db_circuit_breaker.check()
+
     db = SessionLocal()
     try:
         yield db
@@ -88,14 +273,109 @@ def init_db() -> None:
 
     注意:
         - 本番環境では使用しない（Alembic によるマイグレーション推奨）
+        - ITEMS_PARTITIONING=list / hash の場合、items は create_all の前にパーティションテーブルとして作成する
+        - 作成後、schema_version テーブルに現在のスキーマバージョンを記録する
 
     使用例:
         @app.on_event("startup")
         async def startup_event():
             init_db()
     """
+    prepare_items_partitioning(engine, create=True)
     Base.metadata.create_all(bind=engine)
 
+    db = SessionLocal()
+    try:
+        db.merge(SchemaVersion(component=SCHEMA_COMPONENT, version=schema_fingerprint()))
+        db.commit()
+    finally:
+        db.close()
+
+
+@lru_cache(maxsize=1)
+def schema_fingerprint() -> str:
+    """
+    Model 定義（Base.metadata）からスキーマバージョンを算出（プロセス内キャッシュ）
+
+    目的:
+        - テーブル・カラム・インデックス定義の変更を検知
+        - DBへの問い合わせなしでアプリ側の期待バージョンを取得
+
+    Returns:
+        str: スキーマバージョン（SHA-256 先頭16文字）
+    """
+    parts = []
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        parts.append(f"table:{table.name}")
+        for column in table.columns:
+            parts.append(
+                f"column:{column.name}:{column.type}:{column.nullable}:{column.primary_key}"
+            )
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            columns = ",".join(column.name for column in index.columns)
+            parts.append(f"index:{index.name}:{columns}:{index.unique}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def get_applied_schema_version() -> Optional[str]:
+    """
+    DBに記録された適用済みスキーマバージョンを取得
+
+    Returns:
+        Optional[str]: スキーマバージョン（未記録の場合 None）
+
+    例外:
+        SQLAlchemyError: DB接続失敗時、schema_version テーブル未作成時
+    """
+    db = SessionLocal()
+    try:
+        row = db.get(SchemaVersion, SCHEMA_COMPONENT)
+        return row.version if row else None
+    finally:
+        db.close()
+
+
+def initialize_schema(mode: Optional[str] = None) -> None:
+    """
+    DB_SCHEMA_INIT に従ってスキーマを初期化・確認する（起動時用）
+
+    目的:
+        - 開発環境: create_all によるテーブル作成（init_db）
+        - 本番環境: create_all（全テーブルのメタデータ問い合わせ）を行わず、
+          schema_version の1行読み取りのみで起動を完了させる（コールドスタート短縮）
+        - パーティショニング有効時: 追加テナントのパーティションを作成（repositories/partitioning.py）
+
+    影響範囲:
+        - main.py（startup_event）
+
+    Args:
+        mode (Optional[str]): create_all / check / skip（省略時: settings.DB_SCHEMA_INIT）
+
+    例外:
+        ValueError: 不正なモード
+        SQLAlchemyError: DB接続失敗時
+    """
+    mode = mode or settings.DB_SCHEMA_INIT
+
+    if mode == "create_all":
+        init_db()
+    elif mode == "check":
+        # テナント追加時のパーティション作成（list パーティショニング時のみ、カタログ1回の問い合わせ）
+        prepare_items_partitioning(engine, create=False)
+        applied = get_applied_schema_version()
+        expected = schema_fingerprint()
+        if applied != expected:
+            logger.error(
+                "Schema version mismatch: expected %s, applied %s",
+                expected, applied,
+                extra={
+                    "error_type": "schema_version_mismatch",
+                    "severity": "error"
+                }
+            )
+    elif mode != "skip":
+        raise ValueError(f"Invalid DB_SCHEMA_INIT: {mode}")
+
 
 def check_db_connection() -> bool:
     """
@@ -122,7 +402,8 @@ def check_db_connection() -> bool:
     except Exception as e:
         # エラーログ出力（構造化ログ）
         logger.error(
-            f"DB connection check failed: {e}",
+            "DB connection check failed: %s",
+            e,
             exc_info=True,
             extra={
                 "error_type": "db_connection_check_failed",
@@ -130,3 +411,30 @@ def check_db_connection() -> bool:
             }
         )
         return False
+
+
+def pool_status() -> Dict[str, Any]:
+    """
+    接続プールの状態を取得する（シミュレーション・診断レスポンス用）
+
+    Returns:
+        Dict[str, Any]: {
+            "size": 常時維持する接続数（pool_size）,
+            "checked_out": チェックアウト中の接続数,
+            "checked_in": プール内の待機接続数,
+            "overflow": pool_size を超えて確立した接続数（未確立時は負値）,
+            "max_overflow": 追加接続数の上限,
+            "timeout_seconds": チェックアウト待ちの上限（リクエストの残り時間で短縮される）
+        }
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"class": type(pool).__name__}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout_seconds": pool._pool_timeout if isinstance(pool, DeadlineQueuePool) else pool.timeout(),
+    }
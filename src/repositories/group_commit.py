@@ -0,0 +1,214 @@
+"""
+グループコミット書き込みバッファ（items 作成）
+
+目的: 同時刻に到着した作成リクエストを1回の複数行INSERT + 1回のCOMMITにまとめ、
+      スループットがCOMMIT待ち（WAL fsync）に律速されるのを避ける
+影響範囲: items_service.py（create_item、GROUP_COMMIT_ENABLED=true の場合）、main.py（起動・停止）
+前提条件: database.py（SessionLocal）、RETURNING 対応DB（PostgreSQL、SQLite 3.35 以上）
+
+動作:
+    - 書き込みスレッドが最初の要求を受け取ってから GROUP_COMMIT_WINDOW_MS の間（最大 GROUP_COMMIT_MAX_BATCH 件）要求を集める
+      （0 の場合は待たず、前回のCOMMIT中に溜まった要求のみをまとめる）
+    - 各リクエストはCOMMIT完了後に自分の行を受け取る（永続化の保証は1件ずつのCOMMITと同じ）
+    - COMMIT完了の待ちはリクエストの残り時間（infrastructure/deadline.py）まで。超過時は DeadlineExceeded（→ 504）
+    - バッチ失敗時は1件ずつ書き直し、失敗した要求のみに例外を返す（他の要求へ波及させない）
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from config.settings import settings
+from models.item import Item
+from repositories.database import SessionLocal
+from infrastructure.deadline import DeadlineExceeded, check_deadline, remaining
+from infrastructure.logger import get_logger
+from infrastructure.metrics import get_metrics
+
+logger = get_logger()
+metrics = get_metrics()
+
+
+class _PendingWrite:
+    """書き込み要求（作成する行の値と、結果を受け取る Future）"""
+
+    __slots__ = ("values", "future")
+
+    def __init__(self, values: Dict[str, Any]):
+        self.values = values
+        self.future: Future = Future()
+
+
+class GroupCommitWriter:
+    """
+    items 作成のグループコミットライター
+
+    責務:
+        - 作成要求のキューイングとバッチ化（時間窓 / 件数上限）
+        - 複数行INSERT（RETURNING で各行のIDとデフォルト値を取得）+ 1回のCOMMIT
+        - バッチ失敗時の1件ずつの再実行（エラーの分離）
+
+    影響範囲:
+        - POST /{tenant_id}/items のレイテンシ（最大で時間窓分増加）とスループット
+
+    前提条件:
+        - start() で書き込みスレッドを開始、stop() で残りの要求を書き込んで停止
+        - 未開始・停止後の要求は呼び出し元スレッドで直接書き込む
+    """
+
+    def __init__(self, window_ms: float = 2.0, max_batch: int = 100):
+        self.window = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self._queue: "queue.Queue[Optional[_PendingWrite]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def submit(self, tenant_id: str, name: str, description: Optional[str] = None) -> Item:
+        """
+        作成要求を登録し、COMMIT完了まで待機する
+
+        Args:
+            tenant_id (str): テナントID
+            name (str): サンプルデータ名
+            description (Optional[str]): サンプルデータ説明
+
+        Returns:
+            Item: 作成されたサンプルデータ（セッションから切り離し済み、全属性ロード済み）
+
+        Raises:
+            SQLAlchemyError: この要求の書き込みに失敗した場合
+            DeadlineExceeded: 残り時間がない、残り時間内にCOMMITが完了しない
+
+        注意:
+            - 残り時間切れの時点で書き込みが始まっていない要求は取り消す（書き込まない）。
+              既にバッチの書き込み中の場合は取り消せず、行は作成される（クライアントのタイムアウトと同じ）
+        """
+        check_deadline()
+        pending = _PendingWrite({"tenant_id": tenant_id, "name": name, "description": description})
+        with self._lock:
+            running = self.running
+            if running:
+                self._queue.put(pending)
+        if not running:
+            self._write([pending])
+        left = remaining()
+        try:
+            return pending.future.result(timeout=max(0.0, left) if left is not None else None)
+        except FutureTimeoutError:
+            cancelled = pending.future.cancel()
+            metrics.increment("items.group_commit.deadline_exceeded", tags=[f"cancelled:{str(cancelled).lower()}"])
+            raise DeadlineExceeded("Request deadline exceeded while waiting for group commit")
+
+    def _collect(self, first: _PendingWrite) -> List[_PendingWrite]:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                pending = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending is None:
+                # 停止要求: 集めた分を書き込んでから停止する
+                self._queue.put(None)
+                break
+            batch.append(pending)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+            # 残り時間切れで取り消された要求を除く（以降は取り消し不可）
+            batch = [pending for pending in self._collect(first) if pending.future.set_running_or_notify_cancel()]
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[_PendingWrite]) -> None:
+        started = time.perf_counter()
+        try:
+            items = self._insert([pending.values for pending in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].future.set_exception(e)
+                return
+            logger.warning(
+                "Group commit of %s items failed, retrying individually: %s",
+                len(batch), e,
+                extra={"error_type": "group_commit_failed", "severity": "warning"}
+            )
+            for pending in batch:
+                self._write([pending])
+            return
+
+        metrics.histogram("items.group_commit.batch_size", len(batch))
+        metrics.histogram("items.group_commit.write_ms", (time.perf_counter() - started) * 1000)
+        for pending, item in zip(batch, items):
+            pending.future.set_result(item)
+
+    @staticmethod
+    def _insert(rows: List[Dict[str, Any]]) -> List[Item]:
+        # expire_on_commit=False: COMMIT後も RETURNING で取得した属性を保持（再SELECT不要）
+        db = SessionLocal(expire_on_commit=False)
+        try:
+            items = db.scalars(
+                insert(Item).returning(Item, sort_by_parameter_order=True),
+                rows
+            ).all()
+            db.commit()
+            return list(items)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        """
+        書き込みスレッドを開始（多重起動しない）
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        キュー内の要求を書き込んでから書き込みスレッドを停止
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(None)
+        thread.join(timeout=timeout)
+
+
+# グローバルライター
+_writer: Optional[GroupCommitWriter] = None
+
+
+def get_group_commit_writer() -> GroupCommitWriter:
+    """
+    グローバルグループコミットライターを取得（シングルトン）
+
+    Returns:
+        GroupCommitWriter: GROUP_COMMIT_WINDOW_MS / GROUP_COMMIT_MAX_BATCH で設定済みのライター
+    """
+    global _writer
+    if _writer is None:
+        _writer = GroupCommitWriter(
+            window_ms=settings.GROUP_COMMIT_WINDOW_MS,
+            max_batch=settings.GROUP_COMMIT_MAX_BATCH,
+        )
+    return _writer
@@ -7,9 +7,12 @@ items テーブル CRUD Repository
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import BigInteger, case, cast, literal_column, text, func
 from models.item import Item
-from typing import List, Optional
+from repositories.partitioning import partition_name
+import calendar
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
 
 
 class ItemsRepository:
@@ -29,6 +32,14 @@ class ItemsRepository:
         - tenant_id は事前にバリデーション済み
     """
 
+    # ソート順 → (カラム名, 降順か)
+    SORT_COLUMNS = {
+        "created_at_desc": ("created_at", True),
+        "created_at_asc": ("created_at", False),
+        "name_asc": ("name", False),
+        "name_desc": ("name", True),
+    }
+
     def __init__(self, db: Session):
         """
         Repository初期化
@@ -61,6 +72,72 @@ class ItemsRepository:
             Item.created_at.desc()
         ).all()
 
+    def search(
+        self,
+        tenant_id: str,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        name_prefix: Optional[str] = None,
+        name_contains: Optional[str] = None,
+        sort: str = "created_at_desc",
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Item]:
+        """
+        テナント別にサンプルデータを検索（フィルタ・ソート・ページネーション）
+
+        目的: サーバー側フィルタ（一覧全件のダウンロード回避）
+        影響範囲: items_service.py（search_items）
+
+        Args:
+            tenant_id (str): テナントID
+            created_after (Optional[datetime]): 作成日時の下限（この日時より後、UTC naive）
+            created_before (Optional[datetime]): 作成日時の上限（この日時より前、UTC naive）
+            name_prefix (Optional[str]): 名前の前方一致（大文字小文字を区別しない）
+            name_contains (Optional[str]): 名前の部分一致（大文字小文字を区別しない）
+            sort (str): ソート順（SORT_COLUMNS のキー）
+            limit (Optional[int]): 最大件数（None の場合は全件）
+            offset (int): 読み飛ばす件数
+
+        Returns:
+            List[Item]: サンプルデータリスト
+
+        使用インデックス:
+            - 作成日時範囲・作成日時順: idx_tenant_id_created_at
+            - 名前順: idx_tenant_id_name
+            - 前方一致・部分一致: idx_items_name_trgm（PostgreSQL のみ）
+
+        セキュリティ:
+            - SQLインジェクション対策: ORMの自動パラメータ化
+            - LIKE ワイルドカード（%, _）は autoescape でエスケープ
+            - テナント分離: WHERE tenant_id = :tenant_id
+        """
+        query = self.db.query(Item).filter(Item.tenant_id == tenant_id)
+
+        if created_after is not None:
+            query = query.filter(Item.created_at > created_after)
+        if created_before is not None:
+            query = query.filter(Item.created_at < created_before)
+        if name_prefix:
+            query = query.filter(Item.name.istartswith(name_prefix, autoescape=True))
+        if name_contains:
+            query = query.filter(Item.name.icontains(name_contains, autoescape=True))
+
+        # 同値の並びを安定させるため id を第2キーとする（ページ境界の重複・欠落防止）
+        column, descending = self.SORT_COLUMNS[sort]
+        sort_column = getattr(Item, column)
+        if descending:
+            query = query.order_by(sort_column.desc(), Item.id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), Item.id.asc())
+
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+
+        return query.all()
+
     def find_by_id(self, tenant_id: str, item_id: int) -> Optional[Item]:
         """
         ID別にサンプルデータを取得（テナント分離）
@@ -156,3 +233,200 @@ class ItemsRepository:
         return self.db.query(Item).filter(
             Item.tenant_id == tenant_id
         ).count()
+
+    def estimate_count_by_tenant(self, tenant_id: str) -> Optional[Tuple[int, int, str]]:
+        """
+        テナント別のデータ件数をプランナ統計から推定（PostgreSQL のみ、テーブルは走査しない）
+
+        目的: 数百万行のテナントでの COUNT(*)（インデックス全走査）を避ける（監視用の件数）
+        影響範囲: items_service.py（count_items）
+
+        Args:
+            tenant_id (str): テナントID
+
+        Returns:
+            Optional[Tuple[int, int, str]]: (推定件数, 誤差上限（±件数）, 推定方法)
+                推定方法:
+                    - "partition": テナント別パーティション（list パーティショニング）の reltuples
+                    - "mcv": pg_stats の最頻値頻度 × reltuples
+                    - "ndistinct": 最頻値以外の頻度を n_distinct で等分 × reltuples
+                推定できない場合（PostgreSQL 以外、ANALYZE 未実行）は None
+
+        誤差上限:
+            - ANALYZE 以降の変更行数（n_mod_since_analyze）を含む
+            - mcv: ANALYZE のサンプル行数（300 × default_statistics_target）による標準誤差の2倍（約95%）
+            - ndistinct: 最頻値以外の全行数（テナント間の偏りは統計から分からないため）
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return None
+
+        partition = partition_name(tenant_id)
+        row = self.db.execute(
+            text(
+                "SELECT c.reltuples, coalesce(s.n_mod_since_analyze, 0) FROM pg_class c "
+                "LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid "
+                "WHERE c.oid = to_regclass(:partition)"
+            ),
+            {"partition": partition}
+        ).first()
+        if row is not None and row[0] >= 0:
+            return int(row[0]), int(row[1]), "partition"
+
+        # 通常テーブルは自身、パーティションテーブルは全パーティションの合計
+        total, modified = self.db.execute(
+            text(
+                "SELECT coalesce(sum(greatest(c.reltuples, 0)), 0), coalesce(sum(s.n_mod_since_analyze), 0) "
+                "FROM pg_class c LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid "
+                "WHERE c.relkind = 'r' AND (c.oid = to_regclass(:table) OR c.oid IN "
+                "(SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:table)))"
+            ),
+            {"table": Item.__tablename__}
+        ).one()
+
+        # パーティションテーブルは親の統計（inherited = true）を優先
+        stats = self.db.execute(
+            text(
+                "SELECT most_common_vals::text::text[], most_common_freqs, n_distinct, null_frac, "
+                "current_setting('default_statistics_target')::int "
+                "FROM pg_stats WHERE schemaname = current_schema() "
+                "AND tablename = :table AND attname = 'tenant_id' "
+                "ORDER BY inherited DESC LIMIT 1"
+            ),
+            {"table": Item.__tablename__}
+        ).first()
+        if stats is None or total <= 0:
+            return None
+
+        values, freqs, n_distinct, null_frac, statistics_target = stats
+        values = values or []
+        freqs = freqs or []
+        total = float(total)
+        modified = int(modified)
+
+        if tenant_id in values:
+            frequency = freqs[values.index(tenant_id)]
+            sample_rows = min(total, 300.0 * statistics_target)
+            standard_error = (frequency * (1 - frequency) / sample_rows) ** 0.5 * total
+            return round(frequency * total), int(2 * standard_error) + 1 + modified, "mcv"
+
+        # 最頻値に含まれない（少数派の）テナント
+        distinct = -n_distinct * total if n_distinct < 0 else n_distinct
+        others = distinct - len(values)
+        remaining = max(0.0, 1.0 - sum(freqs) - null_frac)
+        estimate = remaining / others * total if others > 0 else 0.0
+        return round(estimate), int(remaining * total) + modified, "ndistinct"
+
+    def histogram_by_tenant(
+        self,
+        tenant_id: str,
+        bucket_seconds: int,
+        start: datetime,
+        end: datetime
+    ) -> Dict[int, int]:
+        """
+        テナント別の作成件数を時間バケットごとに集計
+
+        目的: 作成件数の時系列（ダッシュボード用）をDB側で集計し、一覧全件の転送を避ける
+        影響範囲: items_service.py（get_item_histogram）
+
+        Args:
+            tenant_id (str): テナントID
+            bucket_seconds (int): バケット幅（秒、UNIXエポックを基準に区切る）
+            start (datetime): 期間の開始（含む、UTC naive）
+            end (datetime): 期間の終了（含まない、UTC naive）
+
+        Returns:
+            Dict[int, int]: {バケット番号（エポック秒 // bucket_seconds）: 件数}（0件のバケットは含まない）
+
+        使用インデックス:
+            - idx_tenant_id_created_at（tenant_id 一致 + created_at 範囲）
+
+        注意:
+            - PostgreSQL: floor(extract(epoch) / 幅) による GROUP BY（幅が分・時・日の場合は date_trunc と同じ区切り）
+            - その他のDB: created_at のみを取得し、アプリ側で集計（開発環境用）
+        """
+        query_filter = (
+            Item.tenant_id == tenant_id,
+            Item.created_at >= start,
+            Item.created_at < end,
+        )
+
+        if self.db.get_bind().dialect.name != "postgresql":
+            counts: Dict[int, int] = {}
+            for (created_at,) in self.db.query(Item.created_at).filter(*query_filter):
+                bucket = calendar.timegm(created_at.utctimetuple()) // bucket_seconds
+                counts[bucket] = counts.get(bucket, 0) + 1
+            return counts
+
+        # bucket_seconds は呼び出し元で許可リストから選んだ整数（GROUP BY と SELECT の式を一致させるためリテラル）
+        bucket = cast(
+            func.floor(func.extract("epoch", Item.created_at) / literal_column(str(int(bucket_seconds)))),
+            BigInteger
+        )
+        rows = self.db.query(bucket, func.count(Item.id)).filter(*query_filter).group_by(bucket).all()
+        return {int(index): count for index, count in rows}
+
+    def get_tenant_validator(self, tenant_id: str) -> Tuple[int, Optional[datetime]]:
+        """
+        テナント別一覧の検証子（件数、最終更新日時）を取得（条件付きGET用）
+
+        目的: 一覧本体を取得せずにETagを計算し、未変更時は304を返す
+        影響範囲: items_service.py（get_items_validator）
+
+        Args:
+            tenant_id (str): テナントID
+
+        Returns:
+            Tuple[int, Optional[datetime]]: (件数, max(updated_at))（0件の場合 (0, None)）
+
+        パフォーマンス:
+            - 1クエリで集計（WHERE tenant_id は複合インデックス idx_tenant_id_created_at で絞り込み）
+            - 件数を含めることで、最新以外の行の削除も検知する
+        """
+        count, last_updated = self.db.query(
+            func.count(Item.id),
+            func.max(Item.updated_at)
+        ).filter(
+            Item.tenant_id == tenant_id
+        ).one()
+        return count, last_updated
+
+    def stats_by_tenants(
+        self,
+        tenant_ids: Sequence[str],
+        since: datetime
+    ) -> Dict[str, Tuple[int, Optional[datetime], int]]:
+        """
+        複数テナントの件数・最新作成日時・期間内の作成件数を1クエリで取得（テナント横断統計用）
+
+        目的: テナントごとの COUNT(*) 発行（テナント数分の往復・インデックス走査）を避ける
+        影響範囲: tenant_stats_service.py
+
+        Args:
+            tenant_ids (Sequence[str]): テナントIDリスト
+            since (datetime): 作成件数を数える期間の開始（UTC naive）
+
+        Returns:
+            Dict[str, Tuple[int, Optional[datetime], int]]:
+                {tenant_id: (件数, max(created_at), since 以降の作成件数)}（0件のテナントは含まない）
+
+        パフォーマンス:
+            - WHERE tenant_id IN (...) GROUP BY tenant_id（idx_tenant_id_created_at の走査1回）
+        """
+        if not tenant_ids:
+            return {}
+
+        rows = self.db.query(
+            Item.tenant_id,
+            func.count(Item.id),
+            func.max(Item.created_at),
+            func.sum(case((Item.created_at >= since, 1), else_=0))
+        ).filter(
+            Item.tenant_id.in_(tenant_ids)
+        ).group_by(
+            Item.tenant_id
+        ).all()
+        return {
+            tenant_id: (count, newest, int(recent or 0))
+            for tenant_id, count, newest, recent in rows
+        }
@@ -0,0 +1,609 @@
+"""
+items テーブルのテナント別パーティショニング（PostgreSQL 宣言的パーティショニング）
+
+目的: テナント単位のデータ量に比例したVACUUM・インデックス・全件スキャンコストの実現
+      （単一ヒープでは全テナントの合計データ量に比例する）
+影響範囲: database.py（init_db / initialize_schema から呼び出し）、
+          items テーブル（ItemsRepository からは透過的）
+前提条件: PostgreSQL 11 以上（ハッシュパーティション、パーティションテーブルのインデックス）
+
+方式:
+    - list: テナントごとに1パーティション（VALID_TENANTS に追従して起動時に追加）+ デフォルトパーティション
+      （デフォルトパーティションに既に行があるテナントは起動時には作成せず、CLI の ensure で行を移動して作成）
+    - hash: ITEMS_HASH_PARTITIONS 個のハッシュパーティション（テナント数が多い場合）
+    - テーブル定義は Model（Item.__table__）から生成し、主キーのみ (id, tenant_id) とする
+      （パーティションテーブルの一意制約はパーティションキーを含む必要があるため）
+
+既存テーブルのオンライン移行:
+    python -m repositories.partitioning migrate --method list
+"""
+
+import argparse
+import hashlib
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Index, MetaData, PrimaryKeyConstraint, Table, literal, text
+from sqlalchemy.engine import Connection, Engine
+
+from config.settings import settings
+from models.item import Item, PG_TRGM_EXTENSION
+from infrastructure.logger import get_logger
+
+logger = get_logger()
+
+PARTITION_METHODS = ("none", "list", "hash")
+
+ITEMS_TABLE = Item.__tablename__
+DEFAULT_PARTITION = f"{ITEMS_TABLE}_default"
+
+# オンライン移行用
+STAGING_TABLE = f"{ITEMS_TABLE}_partitioned"
+STAGING_SUFFIX = "_p"
+RETIRED_SUFFIX = "_unpartitioned"
+SYNC_TRIGGER = f"{ITEMS_TABLE}_partition_sync"
+
+# パーティション作成の排他（複数タスクの同時起動・CLI、pg_advisory_xact_lock のキー。"items" の ASCII）
+PARTITIONING_LOCK_KEY = 0x6974656D73
+
+# pg_partitioned_table.partstrat → 方式名
+_STRATEGIES = {"l": "list", "h": "hash", "r": "range"}
+
+# PostgreSQL の識別子長上限
+_MAX_IDENTIFIER_LENGTH = 63
+
+
+def validate_method(method: str) -> str:
+    """
+    パーティショニング方式を検証
+
+    Raises:
+        ValueError: 不正な方式
+    """
+    if method not in PARTITION_METHODS:
+        raise ValueError(
+            f"Invalid ITEMS_PARTITIONING: {method}. "
+            f"Valid methods: {', '.join(PARTITION_METHODS)}"
+        )
+    return method
+
+
+def partition_name(tenant_id: str) -> str:
+    """
+    テナント別パーティション名を生成
+
+    目的:
+        - テナントIDを識別子として安全な名前に変換（"tenant-a" → "items_t_tenant_a_<hash>"）
+        - 変換後の衝突（"tenant-a" と "tenant_a"）をハッシュで回避
+
+    Args:
+        tenant_id (str): テナントID
+
+    Returns:
+        str: パーティション名（63文字以内）
+    """
+    slug = re.sub(r"[^a-z0-9]+", "_", tenant_id.lower()).strip("_")[:40]
+    digest = hashlib.sha1(tenant_id.encode("utf-8")).hexdigest()[:6]
+    return f"{ITEMS_TABLE}_t_{slug}_{digest}"
+
+
+def build_partitioned_table(
+    method: str,
+    name: str = ITEMS_TABLE,
+    index_suffix: str = ""
+) -> Tuple[Table, List[Tuple[str, str]]]:
+    """
+    Model 定義からパーティションテーブル定義を生成
+
+    目的:
+        - カラム・インデックス定義を Item.__table__ と一致させる（定義の二重管理を避ける）
+
+    Args:
+        method (str): list / hash
+        name (str): テーブル名（移行時は STAGING_TABLE）
+        index_suffix (str): インデックス名・主キー制約名の接尾辞（移行時の名前衝突回避）
+
+    Returns:
+        Tuple[Table, List[Tuple[str, str]]]:
+            テーブル定義、[(作成時のインデックス名, 本来のインデックス名)]
+    """
+    table = Item.__table__.to_metadata(MetaData(), name=name)
+
+    # 主キーにパーティションキーを含める
+    table.c.tenant_id.primary_key = True
+    table.append_constraint(
+        PrimaryKeyConstraint(
+            table.c.id, table.c.tenant_id, name=f"{ITEMS_TABLE}_pkey{index_suffix}"
+        )
+    )
+    table.dialect_options["postgresql"]["partition_by"] = f"{method.upper()} (tenant_id)"
+
+    # インデックスは本来の名前（Item.__table__ 側の名前）に接尾辞を付けて作り直す
+    table.indexes.clear()
+    names: List[Tuple[str, str]] = [(f"{ITEMS_TABLE}_pkey{index_suffix}", f"{ITEMS_TABLE}_pkey")]
+    for index in sorted(Item.__table__.indexes, key=lambda i: i.name):
+        Index(
+            f"{index.name}{index_suffix}",
+            *[table.c[column.name] for column in index.columns],
+            unique=index.unique,
+            **index.dialect_kwargs
+        )
+        names.append((f"{index.name}{index_suffix}", index.name))
+
+    return table, names
+
+
+def get_partition_strategy(connection: Connection, table: str = ITEMS_TABLE) -> Optional[str]:
+    """
+    テーブルのパーティショニング状態を取得
+
+    Returns:
+        Optional[str]: None（テーブルなし）、"none"（通常テーブル）、"list" / "hash" / "range"
+    """
+    row = connection.execute(
+        text(
+            "SELECT pt.partstrat FROM pg_class c "
+            "LEFT JOIN pg_partitioned_table pt ON pt.partrelid = c.oid "
+            "WHERE c.oid = to_regclass(:table)"
+        ),
+        {"table": table}
+    ).first()
+    if row is None:
+        return None
+    return _STRATEGIES.get(row[0], "none") if row[0] else "none"
+
+
+def list_partitions(connection: Connection, parent: str = ITEMS_TABLE) -> Dict[str, str]:
+    """
+    パーティション一覧を取得
+
+    Returns:
+        Dict[str, str]: {パーティション名: 境界式（例: "FOR VALUES IN ('tenant-a')", "DEFAULT"）}
+    """
+    rows = connection.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:parent)"
+        ),
+        {"parent": parent}
+    )
+    return {name: bound for name, bound in rows}
+
+
+def _quote(connection: Connection, identifier: str) -> str:
+    return connection.dialect.identifier_preparer.quote(identifier)
+
+
+def _literal(connection: Connection, value: str) -> str:
+    # DDL（PARTITION OF ... FOR VALUES IN）はバインド変数を使えないため、方言のリテラル化を使用
+    return str(literal(value).compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def ensure_tenant_partitions(
+    connection: Connection,
+    tenant_ids: Iterable[str],
+    parent: str = ITEMS_TABLE,
+    rebalance: bool = True
+) -> List[str]:
+    """
+    list パーティショニング: デフォルトパーティションとテナント別パーティションを作成（冪等）
+
+    目的:
+        - テナント追加（VALID_TENANTS への追記）時に、次回起動でパーティションを自動作成
+
+    影響範囲:
+        - デフォルトパーティションに新テナントの行がある場合は、デタッチ → 作成 → 行移動 → 再アタッチ
+          （同一トランザクション内、対象テナントの行数に比例。デタッチ中は親テーブルを ACCESS EXCLUSIVE でロック）
+        - rebalance=False の場合は行移動を行わず、そのテナントのパーティション作成を見送る
+          （行はデフォルトパーティションに残り、クエリ結果は変わらない）
+
+    Args:
+        connection (Connection): トランザクション中の接続
+        tenant_ids (Iterable[str]): テナントIDリスト
+        parent (str): 親テーブル名
+        rebalance (bool): デフォルトパーティションの行を移動してパーティションを作成するか
+
+    Returns:
+        List[str]: 作成したパーティション名
+
+    注意:
+        - テナント削除時もパーティションは削除しない（データ保全、削除は運用判断）
+    """
+    existing = list_partitions(connection, parent)
+    quoted_parent = _quote(connection, parent)
+    quoted_default = _quote(connection, DEFAULT_PARTITION)
+    created: List[str] = []
+
+    if DEFAULT_PARTITION not in existing:
+        connection.execute(text(f"CREATE TABLE {quoted_default} PARTITION OF {quoted_parent} DEFAULT"))
+        created.append(DEFAULT_PARTITION)
+
+    for tenant_id in tenant_ids:
+        name = partition_name(tenant_id)
+        if name in existing:
+            continue
+
+        quoted_name = _quote(connection, name)
+        tenant_literal = _literal(connection, tenant_id)
+        create_partition = text(
+            f"CREATE TABLE {quoted_name} PARTITION OF {quoted_parent} FOR VALUES IN ({tenant_literal})"
+        )
+
+        has_default_rows = connection.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {quoted_default} WHERE tenant_id = :tenant_id)"),
+            {"tenant_id": tenant_id}
+        ).scalar()
+
+        if has_default_rows and not rebalance:
+            logger.warning(
+                "Tenant %s has rows in %s, skipped creating partition %s "
+                "(run: python -m repositories.partitioning ensure)",
+                tenant_id, DEFAULT_PARTITION, name,
+                extra={"tenant_id": tenant_id, "error_type": "partition_rebalance_skipped", "severity": "warning"}
+            )
+            continue
+
+        if has_default_rows:
+            # デフォルトパーティションに該当行があるとパーティションを作成できないため、移動する
+            connection.execute(text(f"ALTER TABLE {quoted_parent} DETACH PARTITION {quoted_default}"))
+            connection.execute(create_partition)
+            connection.execute(
+                text(f"INSERT INTO {quoted_name} SELECT * FROM {quoted_default} WHERE tenant_id = :tenant_id"),
+                {"tenant_id": tenant_id}
+            )
+            connection.execute(
+                text(f"DELETE FROM {quoted_default} WHERE tenant_id = :tenant_id"),
+                {"tenant_id": tenant_id}
+            )
+            connection.execute(text(f"ALTER TABLE {quoted_parent} ATTACH PARTITION {quoted_default} DEFAULT"))
+        else:
+            connection.execute(create_partition)
+
+        created.append(name)
+        logger.info(
+            "Created items partition %s for tenant %s",
+            name,
+            tenant_id,
+            extra={"tenant_id": tenant_id}
+        )
+
+    return created
+
+
+def create_hash_partitions(connection: Connection, partitions: int, parent: str = ITEMS_TABLE) -> List[str]:
+    """
+    hash パーティショニング: ハッシュパーティションを作成（冪等）
+
+    Args:
+        connection (Connection): トランザクション中の接続
+        partitions (int): パーティション数（作成後の変更は再移行が必要）
+        parent (str): 親テーブル名
+
+    Returns:
+        List[str]: 作成したパーティション名
+    """
+    if partitions < 1:
+        raise ValueError(f"Invalid ITEMS_HASH_PARTITIONS: {partitions}")
+
+    existing = list_partitions(connection, parent)
+    created: List[str] = []
+    for remainder in range(partitions):
+        name = f"{ITEMS_TABLE}_h{remainder}"
+        if name in existing:
+            continue
+        connection.execute(
+            text(
+                f"CREATE TABLE {_quote(connection, name)} PARTITION OF {_quote(connection, parent)} "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            )
+        )
+        created.append(name)
+    return created
+
+
+def create_partitioned_items(
+    connection: Connection,
+    method: str,
+    name: str = ITEMS_TABLE,
+    index_suffix: str = ""
+) -> List[Tuple[str, str]]:
+    """
+    パーティションテーブルとパーティションを作成
+
+    Args:
+        connection (Connection): トランザクション中の接続
+        method (str): list / hash
+        name (str): テーブル名
+        index_suffix (str): インデックス名の接尾辞
+
+    Returns:
+        List[Tuple[str, str]]: [(作成時のインデックス名, 本来のインデックス名)]
+    """
+    table, index_names = build_partitioned_table(method, name=name, index_suffix=index_suffix)
+
+    connection.execute(PG_TRGM_EXTENSION)
+    table.create(connection)
+
+    if method == "list":
+        ensure_tenant_partitions(connection, settings.valid_tenant_list, parent=name)
+    else:
+        create_hash_partitions(connection, settings.ITEMS_HASH_PARTITIONS, parent=name)
+
+    logger.info("Created %s-partitioned table %s", method, name)
+    return index_names
+
+
+def prepare_items_partitioning(
+    engine: Engine,
+    method: Optional[str] = None,
+    create: bool = True,
+    rebalance: bool = False
+) -> None:
+    """
+    起動時のパーティショニング準備（init_db / initialize_schema、CLI の ensure から呼び出し）
+
+    目的:
+        - items テーブル未作成時: パーティションテーブルとして作成（create=True の場合）
+        - list パーティション済みの場合: VALID_TENANTS に追加されたテナントのパーティションを作成
+
+    Args:
+        engine (Engine): SQLAlchemy エンジン
+        method (Optional[str]): none / list / hash（省略時: settings.ITEMS_PARTITIONING）
+        create (bool): テーブル未作成時に作成するか
+        rebalance (bool): デフォルトパーティションに行がある新テナントのパーティションも作成するか
+            （行移動のため親テーブルを ACCESS EXCLUSIVE でロックする。起動時は False、CLI の ensure のみ True）
+
+    Raises:
+        ValueError: 不正な方式
+
+    注意:
+        - 複数タスクの同時起動で作成が競合しないよう、トランザクション単位のアドバイザリロック
+          （PARTITIONING_LOCK_KEY）を取得してから状態を確認する
+    """
+    method = validate_method(method or settings.ITEMS_PARTITIONING)
+    if method == "none":
+        return
+
+    if engine.dialect.name != "postgresql":
+        logger.warning(
+            "ITEMS_PARTITIONING=%s is ignored on %s",
+            method, engine.dialect.name,
+            extra={"error_type": "partitioning_unsupported", "severity": "warning"}
+        )
+        return
+
+    with engine.begin() as connection:
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITIONING_LOCK_KEY})
+        strategy = get_partition_strategy(connection)
+        if strategy is None:
+            if create:
+                create_partitioned_items(connection, method)
+            return
+
+        if strategy == "list":
+            ensure_tenant_partitions(connection, settings.valid_tenant_list, rebalance=rebalance)
+
+        if strategy != method:
+            logger.warning(
+                "items table partitioning is %s, ITEMS_PARTITIONING is %s "
+                "(run: python -m repositories.partitioning migrate)",
+                strategy, method,
+                extra={"error_type": "partitioning_mismatch", "severity": "warning"}
+            )
+
+
+def _install_sync_trigger(connection: Connection, columns: List[str]) -> None:
+    # 移行中の書き込み（INSERT / UPDATE / DELETE）をステージングテーブルへ反映
+    staging = _quote(connection, STAGING_TABLE)
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"NEW.{column}" for column in columns)
+    connection.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {SYNC_TRIGGER}() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {staging} WHERE id = OLD.id AND tenant_id = OLD.tenant_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {staging} ({column_list}) VALUES ({new_values});
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """))
+    connection.execute(text(
+        f"CREATE TRIGGER {SYNC_TRIGGER} AFTER INSERT OR UPDATE OR DELETE ON {_quote(connection, ITEMS_TABLE)} "
+        f"FOR EACH ROW EXECUTE FUNCTION {SYNC_TRIGGER}()"
+    ))
+
+
+def _retired_name(name: str) -> str:
+    return f"{name[:_MAX_IDENTIFIER_LENGTH - len(RETIRED_SUFFIX)]}{RETIRED_SUFFIX}"
+
+
+def migrate_to_partitioned(
+    engine: Engine,
+    method: str,
+    batch_size: int = 5000,
+    lock_timeout_ms: int = 5000,
+    drop_old: bool = False
+) -> Dict[str, float]:
+    """
+    既存の通常 items テーブルをパーティションテーブルへオンライン移行
+
+    手順:
+        1. ステージングテーブル（items_partitioned）とパーティションを作成し、
+           同期トリガー（移行中の書き込みを反映）を items に設定
+        2. 開始時点の最大IDまでを id 順にバッチコピー（バッチごとにコミット）
+           - コピー元は FOR SHARE で読み取り、同時更新・削除との競合を防ぐ
+           - トリガーで反映済みの行は ON CONFLICT DO NOTHING でスキップ
+        3. ACCESS EXCLUSIVE ロック下で入れ替え（トリガー削除、テーブル・インデックスのリネーム、
+           ID シーケンスの付け替え）。ロック保持はカタログ操作のみ
+
+    Args:
+        engine (Engine): SQLAlchemy エンジン（PostgreSQL）
+        method (str): list / hash
+        batch_size (int): 1バッチのコピー行数
+        lock_timeout_ms (int): 入れ替え時のロック待ちタイムアウト（超過時は失敗、再実行可能）
+        drop_old (bool): 入れ替え後に旧テーブル（items_unpartitioned）を削除するか
+
+    Returns:
+        Dict[str, float]: {"copied": コピー行数, "batches": バッチ数, "copy_ms": ..., "swap_ms": ...}
+
+    Raises:
+        ValueError: PostgreSQL 以外、items が通常テーブルでない、不正な方式
+
+    注意:
+        - 失敗時はステージングテーブルと同期トリガーが残るため、
+          DROP TABLE items_partitioned CASCADE; DROP FUNCTION items_partition_sync() CASCADE; の上で再実行する
+    """
+    if validate_method(method) == "none":
+        raise ValueError("Migration target method must be list or hash")
+    if engine.dialect.name != "postgresql":
+        raise ValueError(f"Partitioning requires PostgreSQL, not {engine.dialect.name}")
+
+    columns = [column.name for column in Item.__table__.columns]
+    column_list = ", ".join(columns)
+
+    # 1. ステージングテーブル、同期トリガー
+    with engine.begin() as connection:
+        strategy = get_partition_strategy(connection)
+        if strategy != "none":
+            raise ValueError(f"items table must be an unpartitioned table (found: {strategy})")
+        index_names = create_partitioned_items(
+            connection, method, name=STAGING_TABLE, index_suffix=STAGING_SUFFIX
+        )
+        _install_sync_trigger(connection, columns)
+
+    # 2. バッチコピー（トリガー設定後の最大IDまで。以降の行はトリガーで反映される）
+    copy_started = time.perf_counter()
+    with engine.connect() as connection:
+        high_water = connection.execute(text(f"SELECT max(id) FROM {ITEMS_TABLE}")).scalar() or 0
+
+    copied = 0
+    batches = 0
+    last_id = 0
+    while last_id < high_water:
+        with engine.begin() as connection:
+            upper = connection.execute(
+                text(
+                    f"SELECT max(id) FROM (SELECT id FROM {ITEMS_TABLE} "
+                    f"WHERE id > :last_id AND id <= :high_water ORDER BY id LIMIT :batch_size) batch"
+                ),
+                {"last_id": last_id, "high_water": high_water, "batch_size": batch_size}
+            ).scalar()
+            if upper is None:
+                break
+            result = connection.execute(
+                text(
+                    f"INSERT INTO {STAGING_TABLE} ({column_list}) "
+                    f"SELECT {column_list} FROM {ITEMS_TABLE} "
+                    f"WHERE id > :last_id AND id <= :upper FOR SHARE "
+                    f"ON CONFLICT DO NOTHING"
+                ),
+                {"last_id": last_id, "upper": upper}
+            )
+        copied += result.rowcount
+        batches += 1
+        last_id = upper
+        if batches % 100 == 0:
+            logger.info("Partition migration progress: id %s/%s, %d rows copied", last_id, high_water, copied)
+    copy_ms = (time.perf_counter() - copy_started) * 1000
+
+    # 3. 入れ替え（ロック下ではカタログ操作のみ）
+    swap_started = time.perf_counter()
+    retired_table = _retired_name(ITEMS_TABLE)
+    with engine.begin() as connection:
+        connection.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+        connection.execute(text(f"LOCK TABLE {ITEMS_TABLE} IN ACCESS EXCLUSIVE MODE"))
+        connection.execute(text(f"DROP TRIGGER {SYNC_TRIGGER} ON {ITEMS_TABLE}"))
+        connection.execute(text(f"DROP FUNCTION {SYNC_TRIGGER}()"))
+
+        sequence = connection.execute(text(f"SELECT pg_get_serial_sequence('{ITEMS_TABLE}', 'id')")).scalar()
+        staging_sequence = connection.execute(
+            text(f"SELECT pg_get_serial_sequence('{STAGING_TABLE}', 'id')")
+        ).scalar()
+        old_indexes = connection.execute(
+            text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :table"),
+            {"table": ITEMS_TABLE}
+        ).scalars().all()
+
+        # 旧テーブル → items_unpartitioned
+        connection.execute(text(f"ALTER TABLE {ITEMS_TABLE} RENAME TO {retired_table}"))
+        for index_name in old_indexes:
+            connection.execute(
+                text(f"ALTER INDEX {_quote(connection, index_name)} RENAME TO {_quote(connection, _retired_name(index_name))}")
+            )
+
+        # ステージング → items
+        connection.execute(text(f"ALTER TABLE {STAGING_TABLE} RENAME TO {ITEMS_TABLE}"))
+        for created_name, original_name in index_names:
+            connection.execute(
+                text(f"ALTER INDEX {_quote(connection, created_name)} RENAME TO {_quote(connection, original_name)}")
+            )
+
+        # 既存シーケンスを引き継ぐ（旧テーブル削除時に削除されないよう所有者も付け替え）
+        connection.execute(text(f"ALTER TABLE {ITEMS_TABLE} ALTER COLUMN id SET DEFAULT nextval('{sequence}')"))
+        connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {ITEMS_TABLE}.id"))
+        connection.execute(text(f"DROP SEQUENCE {staging_sequence}"))
+    swap_ms = (time.perf_counter() - swap_started) * 1000
+
+    if drop_old:
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP TABLE {retired_table}"))
+
+    result = {
+        "copied": copied,
+        "batches": batches,
+        "copy_ms": round(copy_ms, 1),
+        "swap_ms": round(swap_ms, 1),
+    }
+    logger.info("Partition migration completed: %s", result)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    パーティショニング管理CLI
+
+    使用例:
+        python -m repositories.partitioning status
+        python -m repositories.partitioning ensure
+        python -m repositories.partitioning migrate --method list --batch-size 5000
+    """
+    parser = argparse.ArgumentParser(prog="python -m repositories.partitioning")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("status", help="パーティショニング状態とパーティション一覧を表示")
+    subcommands.add_parser(
+        "ensure", help="VALID_TENANTS のパーティションを作成（list のみ、デフォルトパーティションの行も移動）"
+    )
+    migrate = subcommands.add_parser("migrate", help="通常テーブルをパーティションテーブルへオンライン移行")
+    migrate.add_argument("--method", choices=("list", "hash"), default=None)
+    migrate.add_argument("--batch-size", type=int, default=5000)
+    migrate.add_argument("--lock-timeout-ms", type=int, default=5000)
+    migrate.add_argument("--drop-old", action="store_true")
+    args = parser.parse_args(argv)
+
+    from repositories.database import engine
+
+    if args.command == "status":
+        with engine.connect() as connection:
+            print(f"{ITEMS_TABLE}: {get_partition_strategy(connection)}")
+            for name, bound in sorted(list_partitions(connection).items()):
+                print(f"  {name}: {bound}")
+    elif args.command == "ensure":
+        prepare_items_partitioning(engine, create=False, rebalance=True)
+    else:
+        method = args.method or settings.ITEMS_PARTITIONING
+        print(migrate_to_partitioned(
+            engine,
+            method,
+            batch_size=args.batch_size,
+            lock_timeout_ms=args.lock_timeout_ms,
+            drop_old=args.drop_old
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,12 @@
 from .tenant_service import TenantService, InvalidTenantError
 from .items_service import ItemsService, ItemNotFoundError
 from .monitoring_service import MonitoringService
+from .warmup_service import WarmupService
+from .drain_service import DrainService
+from .pressure_service import PressureService, SimulationLimitError
+from .db_simulation_service import DbSimulationService
+from .tenant_stats_service import TenantStatsCache, get_tenant_stats_cache
+from .analytics_service import AnalyticsService
 
 __all__ = [
     "TenantService",
@@ -14,4 +20,12 @@ __all__ = [
     "ItemsService",
     "ItemNotFoundError",
     "MonitoringService",
+    "WarmupService",
+    "DrainService",
+    "PressureService",
+    "SimulationLimitError",
+    "DbSimulationService",
+    "TenantStatsCache",
+    "get_tenant_stats_cache",
+    "AnalyticsService",
 ]
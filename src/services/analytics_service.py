@@ -0,0 +1,302 @@
+"""
+テナント別分析スナップショットサービス
+
+目的: 名前長の分布、作成間隔、時間帯別の作成件数のパーセンタイル・ヒストグラムを、
+      ORMオブジェクトを経由せず列形式（NumPy 配列）のベクトル演算で求める
+影響範囲: items_controller.py（GET /{tenant_id}/items/analytics）
+前提条件: numpy（requirements.txt）、database.py（engine）
+
+スナップショット:
+    - テナントごとに id（int64）、created_at（int64、エポックからのマイクロ秒）、名前長（uint16）の3列を保持
+      （1行18バイト。追記用に容量を倍々で確保するため、最大で約2倍（36バイト/行）を使用）
+    - 初回は全件、以降は created_at が最後に読んだ時刻（から ANALYTICS_REFRESH_OVERLAP_SECONDS 前）
+      より後の行のみを読み込む（重複は id で除外）
+    - 削除は差分読み込みに反映されないため、ANALYTICS_REBUILD_SECONDS ごとに全件を読み直す
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import BigInteger, cast, func, select
+
+from config.settings import settings
+from models.item import Item
+from repositories.database import engine
+from infrastructure.logger import get_logger
+from infrastructure.metrics import get_metrics, tenant_tag
+
+logger = get_logger()
+metrics = get_metrics()
+
+_EPOCH = datetime(1970, 1, 1)
+
+# 読み込み時のフェッチ件数（DBAPI の行タプルを一度に保持する上限）
+_FETCH_ROWS = 50000
+
+# 分析対象の値（GET /{tenant_id}/items/analytics の metric）
+ANALYTICS_METRICS = ("name_length", "create_gap_seconds", "hourly_creates")
+
+
+class TenantSnapshot:
+    """
+    1テナント分の列形式スナップショット
+
+    責務:
+        - 3列（id, created_at, 名前長）の保持と追記（created_at, id 順）
+        - 差分読み込み（refresh）
+
+    前提条件:
+        - 読み込み・参照は TenantSnapshot の lock を取得して行う
+    """
+
+    def __init__(self, tenant_id: str):
+        self.tenant_id = tenant_id
+        self.lock = threading.Lock()
+        self.size = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._created_us = np.empty(0, dtype=np.int64)
+        self._name_lengths = np.empty(0, dtype=np.uint16)
+        self.built_at = 0.0
+        self.refreshed_at = 0.0
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self.size]
+
+    @property
+    def created_us(self) -> np.ndarray:
+        return self._created_us[:self.size]
+
+    @property
+    def name_lengths(self) -> np.ndarray:
+        return self._name_lengths[:self.size]
+
+    @property
+    def nbytes(self) -> int:
+        return self._ids.nbytes + self._created_us.nbytes + self._name_lengths.nbytes
+
+    def _reserve(self, rows: int) -> None:
+        required = self.size + rows
+        capacity = len(self._ids)
+        if required <= capacity:
+            return
+        capacity = max(required, capacity * 2, 1024)
+        for name in ("_ids", "_created_us", "_name_lengths"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def _append(self, rows: List[Any]) -> int:
+        # Row オブジェクトを直接 np.array に渡すと要素ごとの型判定で桁違いに遅いため、平坦化して読み込む
+        columns = np.fromiter(
+            (value for row in rows for value in row), dtype=np.int64, count=len(rows) * 3
+        ).reshape(-1, 3)
+        ids, created_us, name_lengths = columns[:, 0], columns[:, 1], columns[:, 2]
+
+        # 重なり期間の再読み込み分（既に保持している id）を除外
+        if self.size:
+            boundary = np.searchsorted(self.created_us, created_us.min())
+            if boundary < self.size:
+                keep = ~np.isin(ids, self.ids[boundary:])
+                ids, created_us, name_lengths = ids[keep], created_us[keep], name_lengths[keep]
+
+        count = len(ids)
+        if count == 0:
+            return 0
+        self._reserve(count)
+        end = self.size + count
+        self._ids[self.size:end] = ids
+        self._created_us[self.size:end] = created_us
+        self._name_lengths[self.size:end] = np.minimum(name_lengths, np.iinfo(np.uint16).max)
+        self.size = end
+        return count
+
+    def _sort_tail(self, start: int) -> None:
+        # 重なり期間に後からCOMMITされた行が入ると created_at 順が崩れるため、追記範囲以降を並べ直す
+        if start == 0 or start >= self.size:
+            return
+        boundary = np.searchsorted(self.created_us[:start], self._created_us[start:self.size].min())
+        if boundary >= start:
+            return
+        order = np.lexsort((self._ids[boundary:self.size], self._created_us[boundary:self.size]))
+        for array in (self._ids, self._created_us, self._name_lengths):
+            array[boundary:self.size] = array[boundary:self.size][order]
+
+    def refresh(self, rebuild: bool = False) -> int:
+        """
+        DBから差分（rebuild=True の場合は全件）を読み込む
+
+        Args:
+            rebuild (bool): 全件を読み直すか
+
+        Returns:
+            int: 追加した行数
+
+        Raises:
+            ValueError: 行数が ANALYTICS_MAX_ROWS を超える
+            SQLAlchemyError: DB接続・クエリ失敗時
+        """
+        if rebuild:
+            self.size = 0
+
+        created_us = (
+            func.extract("epoch", Item.created_at) * 1000000
+            if engine.dialect.name == "postgresql"
+            else (func.julianday(Item.created_at) - 2440587.5) * 86400000000
+        )
+        query = select(
+            Item.id, cast(func.round(created_us), BigInteger), func.length(Item.name)
+        ).where(Item.tenant_id == self.tenant_id)
+
+        if self.size:
+            since = _EPOCH + timedelta(
+                microseconds=int(self.created_us[-1])
+            ) - timedelta(seconds=settings.ANALYTICS_REFRESH_OVERLAP_SECONDS)
+            query = query.where(Item.created_at >= since)
+        query = query.order_by(Item.created_at, Item.id)
+
+        start = self.size
+        added = 0
+        try:
+            with engine.connect() as connection:
+                result = connection.execution_options(stream_results=True).execute(query)
+                while True:
+                    rows = result.fetchmany(_FETCH_ROWS)
+                    if not rows:
+                        break
+                    added += self._append(rows)
+                    if self.size > settings.ANALYTICS_MAX_ROWS:
+                        raise ValueError(
+                            f"Tenant {self.tenant_id} has more than {settings.ANALYTICS_MAX_ROWS} items "
+                            f"(ANALYTICS_MAX_ROWS)"
+                        )
+        except BaseException:
+            # 途中まで読み込んだ状態を残さない（次回は全件を読み直す）
+            self.size = 0
+            self.built_at = 0.0
+            raise
+
+        self._sort_tail(start)
+        now = time.monotonic()
+        if rebuild:
+            self.built_at = now
+        self.refreshed_at = now
+        return added
+
+
+def _summary(values: np.ndarray, percentiles: Sequence[float], bins: int) -> Dict[str, Any]:
+    if values.size == 0:
+        return {"count": 0, "percentiles": {}, "histogram": {"edges": [], "counts": []}}
+    values = values.astype(np.float64, copy=False)
+    points = np.percentile(values, percentiles)
+    counts, edges = np.histogram(values, bins=bins)
+    return {
+        "count": int(values.size),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": round(float(values.mean()), 3),
+        "percentiles": {f"p{p:g}": round(float(v), 3) for p, v in zip(percentiles, points)},
+        "histogram": {"edges": [round(float(e), 3) for e in edges], "counts": counts.tolist()},
+    }
+
+
+class AnalyticsService:
+    """
+    テナント別分析サービス
+
+    責務:
+        - テナントごとのスナップショットの保持・差分更新
+        - パーセンタイル・ヒストグラムの計算（NumPy のベクトル演算）
+
+    前提条件:
+        - tenant_id は事前にバリデーション済み
+    """
+
+    _snapshots: Dict[str, TenantSnapshot] = {}
+    _snapshots_lock = threading.Lock()
+
+    @staticmethod
+    def get_snapshot(tenant_id: str) -> TenantSnapshot:
+        """
+        テナントのスナップショットを最新化して取得
+
+        Returns:
+            TenantSnapshot: スナップショット（呼び出し元で lock を取得して参照すること）
+
+        注意:
+            - 前回の更新から ANALYTICS_REFRESH_SECONDS 以内の場合は読み込まない
+        """
+        with AnalyticsService._snapshots_lock:
+            snapshot = AnalyticsService._snapshots.get(tenant_id)
+            if snapshot is None:
+                snapshot = AnalyticsService._snapshots[tenant_id] = TenantSnapshot(tenant_id)
+
+        with snapshot.lock:
+            now = time.monotonic()
+            rebuild = snapshot.built_at == 0.0 or now - snapshot.built_at >= settings.ANALYTICS_REBUILD_SECONDS
+            if rebuild or now - snapshot.refreshed_at >= settings.ANALYTICS_REFRESH_SECONDS:
+                started = time.perf_counter()
+                added = snapshot.refresh(rebuild=rebuild)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                metrics.histogram(
+                    "analytics.refresh_ms",
+                    elapsed_ms,
+                    tags=[tenant_tag(tenant_id), f"mode:{'rebuild' if rebuild else 'incremental'}"]
+                )
+                logger.info(
+                    "Analytics snapshot %s for tenant %s: +%d rows, %d total, %.1fms",
+                    "rebuilt" if rebuild else "refreshed", tenant_id, added, snapshot.size, elapsed_ms
+                )
+        return snapshot
+
+    @staticmethod
+    def analyze(
+        tenant_id: str,
+        metric: str,
+        percentiles: Optional[Sequence[float]] = None,
+        bins: int = 20
+    ) -> Dict[str, Any]:
+        """
+        テナントの指標のパーセンタイル・ヒストグラムを計算
+
+        Args:
+            tenant_id (str): テナントID
+            metric (str): 指標
+                - name_length: 名前の文字数
+                - create_gap_seconds: 連続する作成の間隔（秒）
+                - hourly_creates: 1時間ごとの作成件数（最初から最後の作成までの各時間、0件の時間を含む）
+            percentiles (Optional[Sequence[float]]): パーセンタイル（0〜100、省略時は 50, 90, 99）
+            bins (int): ヒストグラムの区間数
+
+        Returns:
+            Dict[str, Any]: {"metric", "rows", "snapshot_bytes", "count", "min", "max", "mean",
+                             "percentiles": {"p50": ...}, "histogram": {"edges", "counts"}}
+
+        Raises:
+            ValueError: 指標・パーセンタイル・区間数が不正、行数が ANALYTICS_MAX_ROWS を超える
+        """
+        if metric not in ANALYTICS_METRICS:
+            raise ValueError(f"Invalid metric: {metric}. Valid metrics: {', '.join(ANALYTICS_METRICS)}")
+        percentiles = list(percentiles) if percentiles else [50, 90, 99]
+        if any(p < 0 or p > 100 for p in percentiles):
+            raise ValueError("percentiles must be between 0 and 100")
+        if bins < 1 or bins > 1000:
+            raise ValueError("bins must be between 1 and 1000")
+
+        snapshot = AnalyticsService.get_snapshot(tenant_id)
+        with snapshot.lock:
+            if metric == "name_length":
+                values = snapshot.name_lengths.copy()
+            elif metric == "create_gap_seconds":
+                values = np.diff(snapshot.created_us) / 1e6
+            else:
+                hours = snapshot.created_us // 3600000000
+                values = np.bincount(hours - hours.min()) if hours.size else hours
+            rows = snapshot.size
+            nbytes = snapshot.nbytes
+
+        return {"metric": metric, "rows": rows, "snapshot_bytes": nbytes, **_summary(values, percentiles, bins)}
@@ -0,0 +1,235 @@
+"""
+DB負荷シミュレーションサービス
+
+目的: 遅いクエリによる接続プール枯渇（本番で最も多い障害）を実DBで再現し、
+      チェックアウト待ち・キューイングの挙動を観測する
+影響範囲: simulate_controller.py（POST /{tenant_id}/simulate/db）
+前提条件: database.py（engine、接続プール）、pressure_service.py（ResourceBudget）
+
+モード:
+    - hold: 接続を1本チェックアウトし、duration_ms の間保持する（PostgreSQL は pg_sleep）
+    - concurrent: hold を concurrency 本同時に実行する（プール上限を超えるとチェックアウト待ち）
+    - lock: 1セッションがテナントの行を更新ロックしたまま duration_ms 保持し、
+            残りのセッションが同じ行を更新しようとして待機する（ロック待ち）
+
+安全策:
+    - テナント単位の同時接続数（SIMULATE_DB_MAX_CONNECTIONS_PER_TENANT）と保持時間
+      （SIMULATE_DB_MAX_DURATION_MS）の上限を超える場合は SimulationLimitError（→ 429）
+    - lock モードは ROLLBACK で終了する（データは変更しない）
+    - 各セッションにはリクエストのデッドライン（statement_timeout）が適用される
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text, update
+from sqlalchemy.engine import Connection
+
+from config.settings import settings
+from models.item import Item
+from repositories.database import db_circuit_breaker, engine, pool_status
+from services.pressure_service import ResourceBudget, SimulationLimitError
+from infrastructure.logger import get_logger
+from infrastructure.metrics import get_metrics, tenant_tag
+
+logger = get_logger()
+metrics = get_metrics()
+
+DB_SIMULATION_MODES = ("hold", "concurrent", "lock")
+
+
+class _SessionResult:
+    """1セッション分の計測結果"""
+
+    __slots__ = ("role", "checkout_wait_ms", "lock_wait_ms", "elapsed_ms", "rows", "error")
+
+    def __init__(self, role: str):
+        self.role = role
+        self.checkout_wait_ms: Optional[float] = None
+        self.lock_wait_ms: Optional[float] = None
+        self.elapsed_ms: Optional[float] = None
+        self.rows: Optional[int] = None
+        self.error: Optional[str] = None
+
+
+def _sleep_in_db(connection: Connection, seconds: float) -> None:
+    # PostgreSQL はサーバー側で待機（statement_timeout の対象）、その他は接続を保持したまま待機
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": seconds})
+    else:
+        time.sleep(seconds)
+
+
+def _summarize(values: List[float]) -> Optional[Dict[str, float]]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {
+        "min": round(ordered[0], 1),
+        "p50": round(ordered[len(ordered) // 2], 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+class DbSimulationService:
+    """
+    DB負荷シミュレーションサービス
+
+    責務:
+        - 接続保持・同時スロークエリ・行ロック競合の実行
+        - テナント単位の同時接続数の制限
+        - 接続プールのテレメトリ（実行前後の状態、チェックアウト待ち、最大チェックアウト数）
+
+    影響範囲:
+        - 同一タスク上の全エンドポイント（接続プールを共有するため、意図した副作用）
+    """
+
+    _budgets_lock = threading.Lock()
+    _budgets: Dict[str, ResourceBudget] = {}
+
+    @staticmethod
+    def _tenant_budget(tenant_id: str) -> ResourceBudget:
+        with DbSimulationService._budgets_lock:
+            budget = DbSimulationService._budgets.get(tenant_id)
+            if budget is None:
+                budget = ResourceBudget(
+                    f"db_connections[{tenant_id}]", settings.SIMULATE_DB_MAX_CONNECTIONS_PER_TENANT
+                )
+                DbSimulationService._budgets[tenant_id] = budget
+            return budget
+
+    @staticmethod
+    def simulate(tenant_id: str, mode: str, duration_ms: int, concurrency: int = 1) -> Dict[str, Any]:
+        """
+        DB負荷をシミュレーション（全セッションの完了まで待機）
+
+        Args:
+            tenant_id (str): テナントID
+            mode (str): "hold" / "concurrent" / "lock"
+            duration_ms (int): 接続・ロックの保持時間（ミリ秒）
+            concurrency (int): セッション数（hold は常に1、lock は保持1 + 待機 concurrency-1、最小2）
+
+        Returns:
+            Dict[str, Any]: {
+                "tenant_id", "mode", "duration_ms", "concurrency", "elapsed_ms",
+                "succeeded", "errors"（例外種別ごとの件数）,
+                "checkout_wait_ms" / "lock_wait_ms"（min / p50 / max）,
+                "pool": {"before", "after", "peak_checked_out"}
+            }
+
+        Raises:
+            ValueError: mode が不正
+            SimulationLimitError: 保持時間・テナント単位の同時接続数の上限超過
+            CircuitOpenError: DB接続のサーキットが open
+        """
+        if mode not in DB_SIMULATION_MODES:
+            raise ValueError(f"Invalid mode: {mode} ({', '.join(DB_SIMULATION_MODES)})")
+        if duration_ms > settings.SIMULATE_DB_MAX_DURATION_MS:
+            raise SimulationLimitError(f"duration_ms must be <= {settings.SIMULATE_DB_MAX_DURATION_MS}")
+        if mode == "hold":
+            concurrency = 1
+        elif mode == "lock":
+            concurrency = max(2, concurrency)
+
+        db_circuit_breaker.check()
+        budget = DbSimulationService._tenant_budget(tenant_id)
+        budget.acquire(concurrency)
+        try:
+            logger.info("Simulating DB %s: %d sessions for %sms", mode, concurrency, duration_ms)
+            return DbSimulationService._run(tenant_id, mode, duration_ms / 1000.0, concurrency)
+        finally:
+            budget.release(concurrency)
+
+    @staticmethod
+    def _run(tenant_id: str, mode: str, duration: float, concurrency: int) -> Dict[str, Any]:
+        pool_before = pool_status()
+        peak = {"checked_out": pool_before.get("checked_out", 0)}
+        peak_lock = threading.Lock()
+        locked = threading.Event()
+
+        def _session(role: str) -> _SessionResult:
+            result = _SessionResult(role)
+            started = time.perf_counter()
+            try:
+                with engine.connect() as connection:
+                    result.checkout_wait_ms = (time.perf_counter() - started) * 1000
+                    with peak_lock:
+                        peak["checked_out"] = max(peak["checked_out"], engine.pool.checkedout())
+
+                    if role == "hold":
+                        _sleep_in_db(connection, duration)
+                    else:
+                        # 行を変更しない UPDATE でテナントの行ロックを取得し、ROLLBACK で解放する
+                        statement = (
+                            update(Item)
+                            .where(Item.tenant_id == tenant_id)
+                            .values(updated_at=Item.updated_at)
+                        )
+                        lock_started = time.perf_counter()
+                        result.rows = connection.execute(statement).rowcount
+                        result.lock_wait_ms = (time.perf_counter() - lock_started) * 1000
+                        if role == "lock_holder":
+                            locked.set()
+                            _sleep_in_db(connection, duration)
+                        connection.rollback()
+            except Exception as e:
+                result.error = type(e).__name__
+            finally:
+                if role == "lock_holder":
+                    locked.set()
+                result.elapsed_ms = (time.perf_counter() - started) * 1000
+            return result
+
+        if mode == "lock":
+            roles = ["lock_holder"] + ["lock_waiter"] * (concurrency - 1)
+        else:
+            roles = ["hold"] * concurrency
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="simulate-db") as executor:
+            # 各セッションにリクエストのコンテキスト（デッドライン）を引き継ぐ
+            futures = [executor.submit(contextvars.copy_context().run, _session, roles[0])]
+            if mode == "lock":
+                # 保持側がロックを取得してから待機側を開始する
+                locked.wait()
+            futures += [
+                executor.submit(contextvars.copy_context().run, _session, role) for role in roles[1:]
+            ]
+            results = [future.result() for future in futures]
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        errors: Dict[str, int] = {}
+        for result in results:
+            if result.error is not None:
+                errors[result.error] = errors.get(result.error, 0) + 1
+
+        checkout_waits = [r.checkout_wait_ms for r in results if r.checkout_wait_ms is not None]
+        lock_waits = [r.lock_wait_ms for r in results if r.role == "lock_waiter" and r.lock_wait_ms is not None]
+        tags = [tenant_tag(tenant_id), f"mode:{mode}"]
+        for wait_ms in checkout_waits:
+            metrics.histogram("simulate.db.checkout_wait_ms", wait_ms, tags=tags)
+        for wait_ms in lock_waits:
+            metrics.histogram("simulate.db.lock_wait_ms", wait_ms, tags=tags)
+
+        response: Dict[str, Any] = {
+            "tenant_id": tenant_id,
+            "mode": mode,
+            "duration_ms": int(duration * 1000),
+            "concurrency": concurrency,
+            "elapsed_ms": round(elapsed_ms, 1),
+            "succeeded": sum(1 for result in results if result.error is None),
+            "errors": errors,
+            "checkout_wait_ms": _summarize(checkout_waits),
+            "pool": {
+                "before": pool_before,
+                "after": pool_status(),
+                "peak_checked_out": peak["checked_out"],
+            },
+        }
+        if mode == "lock":
+            response["rows_locked"] = results[0].rows
+            response["lock_wait_ms"] = _summarize(lock_waits)
+        return response
@@ -0,0 +1,185 @@
+"""
+ドレインサービス
+
+目的: デプロイ・スケールイン時に処理中リクエストを打ち切らず、DB接続を明示的にクローズして停止する
+      （RDS側にタイムアウト待ちのセッションを残さない）
+影響範囲: main.py（停止時）、admin_controller.py（POST /admin/shutdown）、readiness.py（draining へ遷移）
+前提条件: inflight.py（処理中リクエスト数）、database.py（engine）
+
+停止順序:
+    1. SIGTERM 受信時にレディネスを draining に遷移（ALBヘルスチェック GET /{tenant_id}/health・/ready は503）し、
+       DRAIN_DEREGISTRATION_DELAY_SECONDS の間は新規リクエストを受け続ける
+       （ALBのターゲット登録解除が反映されるまで。uvicorn 既定の SIGTERM 処理は受付を直ちに止めるため置き換える）
+    2. 経過後に uvicorn の停止を開始（受付停止、処理中の接続を --timeout-graceful-shutdown まで待機）
+    3. 処理中リクエストの完了を最大 DRAIN_TIMEOUT_SECONDS 待機（超過分は打ち切りとして記録）
+    4. グループコミット待ちの書き込み → カスタムメトリクス → トレース → ログの順にフラッシュ
+    5. engine.dispose()（プール内の接続をクローズ）
+"""
+
+import asyncio
+import os
+import signal
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ddtrace import tracer
+
+from config.settings import settings
+from repositories.database import engine
+from repositories.group_commit import get_group_commit_writer
+from infrastructure.inflight import inflight
+from infrastructure.readiness import readiness
+from infrastructure.logger import get_logger
+from infrastructure.metrics import get_metrics
+from infrastructure.memory_diagnostics import get_memory_sampler
+from services.tenant_stats_service import get_tenant_stats_cache
+
+logger = get_logger()
+
+# 登録解除待ちの後に uvicorn の停止を開始するタイマー（SIGTERM 受信後のみ設定）
+_exit_timer: Optional[asyncio.TimerHandle] = None
+
+
+class DrainService:
+    """
+    ドレインサービス
+
+    責務:
+        - レディネスの draining への遷移
+        - 処理中リクエストの完了待ち（上限時間付き）
+        - バッファ（書き込み・メトリクス・トレース・ログ）のフラッシュと接続プールの破棄
+        - ドレイン所要時間・打ち切りリクエスト数の記録
+
+    影響範囲:
+        - GET /{tenant_id}/health（ALBヘルスチェック）・GET /ready（draining 以降は503）
+        - アプリケーション停止時
+    """
+
+    @staticmethod
+    def drain(reason: str = "shutdown") -> Dict[str, Any]:
+        """
+        ドレインを実行する（停止時に1回呼び出す）
+
+        Args:
+            reason (str): 停止理由（ログ・レディネス用）
+
+        Returns:
+            Dict[str, Any]: {"duration_ms", "in_flight_at_start", "abandoned"}
+
+        注意:
+            - イベントループを塞がないよう、スレッドから呼び出すこと
+            - uvicorn は停止開始後に新規接続の受付を止め、処理中の接続を
+              --timeout-graceful-shutdown まで待ってから停止処理を呼び出す。
+              本処理の待機は、その後も残るスレッドプール実行中の同期ハンドラが対象
+            - SIGTERM の場合、レディネスは install_signal_handler のハンドラで遷移済み
+        """
+        started = time.monotonic()
+        readiness.mark_draining(reason)
+        in_flight_at_start = inflight.count
+
+        abandoned = inflight.wait_idle(settings.DRAIN_TIMEOUT_SECONDS)
+
+        result = {
+            "reason": reason,
+            "duration_ms": round((time.monotonic() - started) * 1000, 1),
+            "in_flight_at_start": in_flight_at_start,
+            "abandoned": abandoned,
+        }
+        if abandoned:
+            logger.warning(
+                "Drain timed out with %s requests in flight",
+                abandoned,
+                extra={"drain": result, "error_type": "drain_timeout", "severity": "warning"}
+            )
+
+        # 書き込み待ちの作成要求を先にCOMMITし、その後メトリクスを最終フラッシュ
+        get_group_commit_writer().stop()
+        get_memory_sampler().stop()
+        get_tenant_stats_cache().stop()
+        metrics = get_metrics()
+        metrics.histogram("shutdown.drain_ms", result["duration_ms"])
+        metrics.gauge("shutdown.abandoned_requests", abandoned)
+        metrics.stop()
+
+        # プール内の接続をクローズ（チェックアウト中の接続は返却時にクローズされる）
+        engine.dispose()
+
+        tracer.flush()
+        logger.info("Drain completed", extra={"drain": result})
+        for handler in logger.handlers:
+            handler.flush()
+
+        return result
+
+    @staticmethod
+    def begin_shutdown(reason: str = "admin_shutdown") -> None:
+        """
+        レディネスを draining にして自プロセスへ SIGTERM を送る（POST /admin/shutdown）
+
+        Args:
+            reason (str): 停止理由
+
+        注意:
+            - SIGTERM は install_signal_handler のハンドラが受け取るため、停止の開始は
+              DRAIN_DEREGISTRATION_DELAY_SECONDS 後になる（その間も新規リクエストを受け付ける）
+            - ALBがターゲットを unhealthy と判定するのはヘルスチェックの interval × unhealthy_threshold
+              （alb.tf: 30秒 × 3）後であり、登録解除待ちより長い。ECS 経由の停止と異なりターゲットの
+              登録解除は行われないため、停止後に振り分けられたリクエストは接続拒否（502）となり得る
+        """
+        if not readiness.mark_draining(reason):
+            return
+
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    @staticmethod
+    def install_signal_handler(loop: asyncio.AbstractEventLoop) -> bool:
+        """
+        uvicorn の SIGTERM ハンドラを、登録解除待ちを挟むハンドラに置き換える
+
+        目的:
+            - uvicorn 既定の SIGTERM 処理は直ちに受付を止めるため、ALBの登録解除が反映される前に
+              振り分けられたリクエストが接続拒否（502）になる。SIGTERM 受信時はレディネスを draining
+              （GET /{tenant_id}/health・/ready は503）にして
+              DRAIN_DEREGISTRATION_DELAY_SECONDS の間は受付を続け、その後に uvicorn の停止を開始する
+
+        Args:
+            loop (asyncio.AbstractEventLoop): uvicorn のイベントループ
+
+        Returns:
+            bool: True（置き換えた）、False（メインスレッド以外で実行中のため置き換えない）
+
+        注意:
+            - uvicorn が自身のハンドラを登録した後（起動処理）に呼び出すこと
+            - 停止の開始は自プロセスへの SIGINT（uvicorn のハンドラが受付を止め、停止処理を呼び出す）
+            - 待機中に再度 SIGTERM を受信した場合は待機を打ち切って直ちに停止を開始する
+            - TestClient 等、メインスレッド以外でイベントループを実行する場合はシグナルを扱えないため置き換えない
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return False
+
+        loop.add_signal_handler(signal.SIGTERM, DrainService._handle_sigterm, loop)
+        return True
+
+    @staticmethod
+    def _handle_sigterm(loop: asyncio.AbstractEventLoop) -> None:
+        global _exit_timer
+        if _exit_timer is not None:
+            # 2回目の SIGTERM: 登録解除待ちを打ち切る
+            _exit_timer.cancel()
+            _exit_timer = None
+            DrainService._start_server_exit()
+            return
+
+        readiness.mark_draining("sigterm")
+        logger.info(
+            "SIGTERM received, stopping in %ss",
+            settings.DRAIN_DEREGISTRATION_DELAY_SECONDS,
+            extra={"drain": {"reason": "sigterm", "delay_seconds": settings.DRAIN_DEREGISTRATION_DELAY_SECONDS}}
+        )
+        _exit_timer = loop.call_later(settings.DRAIN_DEREGISTRATION_DELAY_SECONDS, DrainService._start_server_exit)
+
+    @staticmethod
+    def _start_server_exit() -> None:
+        # uvicorn の SIGINT ハンドラ（should_exit）で停止を開始する
+        os.kill(os.getpid(), signal.SIGINT)
@@ -7,9 +7,32 @@
 """
 
 from sqlalchemy.orm import Session
+from config.settings import settings
 from repositories.items_repository import ItemsRepository
+from repositories.group_commit import get_group_commit_writer
 from models.item import Item
-from typing import List, Optional
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import calendar
+import threading
+import time
+
+# 作成件数ヒストグラムのバケット幅（GET /{tenant_id}/items/histogram の bucket）
+HISTOGRAM_BUCKETS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "6h": 21600,
+    "1d": 86400,
+}
+
+# from 省略時のバケット数
+HISTOGRAM_DEFAULT_BUCKETS = 60
+
+# 終了後もこの秒数はバケットを確定とみなさない（作成日時の採番とCOMMITのずれ、タスク間の時計のずれ）
+HISTOGRAM_CLOSE_GRACE_SECONDS = 5
 
 
 class ItemNotFoundError(Exception):
@@ -23,6 +46,101 @@ class ItemNotFoundError(Exception):
     pass
 
 
+def _to_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    タイムゾーン付き日時をUTC naive（DB保存形式）に変換
+
+    Args:
+        value (Optional[datetime]): 日時
+
+    Returns:
+        Optional[datetime]: UTC naive の日時（None の場合 None）
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class ClosedBucketCache:
+    """
+    確定済み（終了した）ヒストグラムバケットの件数キャッシュ
+
+    責務:
+        - (テナント, バケット幅, バケット番号) ごとの件数の保持（TTL、上限超過時は古い順に削除）
+        - テナント単位の無効化（削除時、世代番号の更新のみ）
+
+    前提条件:
+        - スレッドセーフ（同期エンドポイントはスレッドプールで実行される）
+
+    注意:
+        - 他のタスクでの削除は無効化されないため、確定済みバケットの件数は最大 TTL の間古い場合がある
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int, int, int], Tuple[int, float]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get_prefix(self, tenant_id: str, bucket_seconds: int, first: int, last: int) -> List[int]:
+        """
+        first から連続してキャッシュ済みのバケットの件数を取得（last まで、途中の未キャッシュで打ち切り）
+        """
+        counts: List[int] = []
+        if not self.enabled:
+            return counts
+        now = time.monotonic()
+        with self._lock:
+            generation = self._generations.get(tenant_id, 0)
+            for index in range(first, last + 1):
+                key = (tenant_id, generation, bucket_seconds, index)
+                entry = self._entries.get(key)
+                if entry is None or entry[1] <= now:
+                    break
+                self._entries.move_to_end(key)
+                counts.append(entry[0])
+        return counts
+
+    def put(self, tenant_id: str, bucket_seconds: int, first: int, counts: List[int]) -> None:
+        """
+        first から連続するバケットの件数を保存
+        """
+        if not self.enabled or not counts:
+            return
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            generation = self._generations.get(tenant_id, 0)
+            for offset, count in enumerate(counts):
+                key = (tenant_id, generation, bucket_seconds, first + offset)
+                self._entries[key] = (count, expires)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: str) -> None:
+        """
+        テナントのキャッシュを無効化（旧世代のエントリは上限超過時に削除される）
+        """
+        with self._lock:
+            self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+
+
+# シングルトンインスタンス
+histogram_cache = ClosedBucketCache(
+    ttl=settings.ITEMS_HISTOGRAM_CACHE_TTL_SECONDS,
+    max_entries=settings.ITEMS_HISTOGRAM_CACHE_MAX_ENTRIES,
+)
+
+
+def _epoch(value: datetime) -> int:
+    return calendar.timegm(value.utctimetuple())
+
+
 class ItemsService:
     """
     サンプルデータビジネスロジックサービス
@@ -64,6 +182,79 @@ class ItemsService:
         """
         return self.repository.find_by_tenant(tenant_id)
 
+    def search_items(
+        self,
+        tenant_id: str,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        name_prefix: Optional[str] = None,
+        name_contains: Optional[str] = None,
+        sort: str = "created_at_desc",
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Item]:
+        """
+        テナント別にサンプルデータを検索
+
+        目的: 検索・フィルタAPI対応（GET /{tenant_id}/items のクエリパラメータ）
+        影響範囲: items_controller.py（GET /{tenant_id}/items）
+
+        Args:
+            tenant_id (str): テナントID
+            created_after (Optional[datetime]): 作成日時の下限（タイムゾーン付きの場合はUTCに変換）
+            created_before (Optional[datetime]): 作成日時の上限（タイムゾーン付きの場合はUTCに変換）
+            name_prefix (Optional[str]): 名前の前方一致
+            name_contains (Optional[str]): 名前の部分一致
+            sort (str): ソート順（created_at_desc, created_at_asc, name_asc, name_desc）
+            limit (Optional[int]): 最大件数
+            offset (int): 読み飛ばす件数
+
+        Returns:
+            List[Item]: サンプルデータリスト
+
+        Raises:
+            ValueError: ソート順が不正、created_after >= created_before の場合
+
+        ビジネスルール:
+            - 日時はDB保存形式（UTC naive）に正規化して比較
+        """
+        if sort not in ItemsRepository.SORT_COLUMNS:
+            raise ValueError(
+                f"Invalid sort: {sort}. "
+                f"Valid sorts: {', '.join(ItemsRepository.SORT_COLUMNS)}"
+            )
+
+        created_after = _to_utc_naive(created_after)
+        created_before = _to_utc_naive(created_before)
+        if created_after and created_before and created_after >= created_before:
+            raise ValueError("created_after must be earlier than created_before")
+
+        return self.repository.search(
+            tenant_id,
+            created_after=created_after,
+            created_before=created_before,
+            name_prefix=name_prefix,
+            name_contains=name_contains,
+            sort=sort,
+            limit=limit,
+            offset=offset
+        )
+
+    def get_items_validator(self, tenant_id: str) -> Tuple[int, Optional[datetime]]:
+        """
+        テナント別一覧の検証子を取得（条件付きGET用）
+
+        目的: ETag計算（一覧本体を取得しない）
+        影響範囲: items_controller.py（GET /{tenant_id}/items）
+
+        Args:
+            tenant_id (str): テナントID
+
+        Returns:
+            Tuple[int, Optional[datetime]]: (件数, 最終更新日時)
+        """
+        return self.repository.get_tenant_validator(tenant_id)
+
     def get_item_by_id(self, tenant_id: str, item_id: int) -> Item:
         """
         ID別にサンプルデータを取得
@@ -111,6 +302,10 @@ class ItemsService:
         ビジネスルール:
             - name は必須（1文字以上100文字以下）
             - description は任意
+
+        注意:
+            - GROUP_COMMIT_ENABLED=true の場合、同時刻の作成要求とまとめてCOMMITする
+              （リクエストのセッションは使用しない、repositories/group_commit.py）
         """
         # ビジネスルール検証
         if not name or len(name.strip()) == 0:
@@ -119,6 +314,9 @@ class ItemsService:
         if len(name) > 100:
             raise ValueError("Name must be 100 characters or less")
 
+        if settings.GROUP_COMMIT_ENABLED:
+            return get_group_commit_writer().submit(tenant_id, name, description)
+
         return self.repository.create(tenant_id, name, description)
 
     def delete_item(self, tenant_id: str, item_id: int) -> bool:
@@ -135,7 +333,11 @@ class ItemsService:
         Returns:
             bool: True（削除成功）、False（データ未存在）
         """
-        return self.repository.delete(tenant_id, item_id)
+        deleted = self.repository.delete(tenant_id, item_id)
+        if deleted:
+            # 確定済みバケットの件数が変わるため、ヒストグラムのキャッシュを無効化
+            histogram_cache.invalidate(tenant_id)
+        return deleted
 
     def count_items(self, tenant_id: str) -> int:
         """
@@ -151,3 +353,128 @@ class ItemsService:
             int: データ件数
         """
         return self.repository.count_by_tenant(tenant_id)
+
+    def get_item_count(self, tenant_id: str, exact: bool = False) -> Dict[str, Any]:
+        """
+        テナント別のデータ件数を取得（推定値または正確な値）
+
+        目的: 件数API対応（監視用途では推定値で十分なため、大規模テナントの COUNT(*) を避ける）
+        影響範囲: items_controller.py（GET /{tenant_id}/items/count）
+
+        Args:
+            tenant_id (str): テナントID
+            exact (bool): True の場合は常に COUNT(*) で数える
+
+        Returns:
+            Dict[str, Any]: {
+                "count": 件数,
+                "exact": 正確な値か,
+                "error_bound": 誤差上限（±件数、正確な値の場合 0）,
+                "method": "exact" / "partition" / "mcv" / "ndistinct"
+            }
+
+        ビジネスルール:
+            - 推定値が ITEMS_APPROX_COUNT_MIN_ROWS 未満の場合は COUNT(*) で数える
+              （小さいテナントは走査コストが小さく、推定の相対誤差が大きいため）
+            - 推定できない場合（PostgreSQL 以外、ANALYZE 未実行）も COUNT(*) で数える
+        """
+        if not exact:
+            estimate = self.repository.estimate_count_by_tenant(tenant_id)
+            if estimate is not None and estimate[0] >= settings.ITEMS_APPROX_COUNT_MIN_ROWS:
+                count, error_bound, method = estimate
+                return {"count": count, "exact": False, "error_bound": error_bound, "method": method}
+
+        return {
+            "count": self.repository.count_by_tenant(tenant_id),
+            "exact": True,
+            "error_bound": 0,
+            "method": "exact",
+        }
+
+    def get_item_histogram(
+        self,
+        tenant_id: str,
+        bucket: str = "1h",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        テナント別の作成件数を時間バケットごとに取得（列形式）
+
+        目的: ダッシュボードの分・時間単位の作成件数（一覧全件を取得してクライアントで集計しない）
+        影響範囲: items_controller.py（GET /{tenant_id}/items/histogram）
+
+        Args:
+            tenant_id (str): テナントID
+            bucket (str): バケット幅（HISTOGRAM_BUCKETS のキー）
+            start (Optional[datetime]): 期間の開始（省略時は end の HISTOGRAM_DEFAULT_BUCKETS バケット前）
+            end (Optional[datetime]): 期間の終了（省略時は現在）
+
+        Returns:
+            Dict[str, Any]: {
+                "bucket": バケット幅,
+                "bucket_seconds": バケット幅（秒）,
+                "start": 最初のバケットの開始（ISO 8601）,
+                "end": 最後のバケットの終了（ISO 8601）,
+                "counts": バケットごとの件数（0件のバケットを含む、i 番目は start + i × bucket_seconds）,
+                "total": 合計,
+                "cached_buckets": キャッシュから返したバケット数
+            }
+
+        Raises:
+            ValueError: バケット幅が不正、start >= end、バケット数が ITEMS_HISTOGRAM_MAX_BUCKETS を超える
+
+        ビジネスルール:
+            - 期間はバケットの境界に広げる（start は切り捨て、end は切り上げ）
+            - 終了したバケット（確定済み）はキャッシュし、再要求時は未確定のバケットのみ集計する
+        """
+        bucket_seconds = HISTOGRAM_BUCKETS.get(bucket)
+        if bucket_seconds is None:
+            raise ValueError(
+                f"Invalid bucket: {bucket}. "
+                f"Valid buckets: {', '.join(HISTOGRAM_BUCKETS)}"
+            )
+
+        now = datetime.utcnow()
+        end = _to_utc_naive(end) or now
+        start = _to_utc_naive(start) or end - timedelta(seconds=bucket_seconds * HISTOGRAM_DEFAULT_BUCKETS)
+        if start >= end:
+            raise ValueError("from must be earlier than to")
+
+        first = _epoch(start) // bucket_seconds
+        last = -(-_epoch(end) // bucket_seconds) - 1
+        last = max(first, last)
+        if last - first + 1 > settings.ITEMS_HISTOGRAM_MAX_BUCKETS:
+            raise ValueError(
+                f"Too many buckets: {last - first + 1} "
+                f"(max {settings.ITEMS_HISTOGRAM_MAX_BUCKETS}, use a wider bucket or a shorter range)"
+            )
+
+        # 確定済みの最後のバケット
+        closed_last = min(last, (_epoch(now) - HISTOGRAM_CLOSE_GRACE_SECONDS) // bucket_seconds - 1)
+
+        counts = histogram_cache.get_prefix(tenant_id, bucket_seconds, first, closed_last)
+        cached = len(counts)
+        query_first = first + cached
+        if query_first <= last:
+            rows = self.repository.histogram_by_tenant(
+                tenant_id,
+                bucket_seconds,
+                datetime.utcfromtimestamp(query_first * bucket_seconds),
+                datetime.utcfromtimestamp((last + 1) * bucket_seconds)
+            )
+            computed = [rows.get(index, 0) for index in range(query_first, last + 1)]
+            histogram_cache.put(
+                tenant_id, bucket_seconds, query_first, computed[:max(0, closed_last - query_first + 1)]
+            )
+            counts.extend(computed)
+
+        return {
+            "bucket": bucket,
+            "bucket_seconds": bucket_seconds,
+            "start": datetime.utcfromtimestamp(first * bucket_seconds).isoformat() + "Z",
+            "end": datetime.utcfromtimestamp((last + 1) * bucket_seconds).isoformat() + "Z",
+            "counts": counts,
+            "total": sum(counts),
+            "cached_buckets": cached,
+        }
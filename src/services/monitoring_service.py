@@ -10,8 +10,10 @@ import time
 import random
 from typing import Dict, Any
 from infrastructure.logger import get_logger
+from infrastructure.metrics import get_metrics, tenant_tag
 
 logger = get_logger()
+metrics = get_metrics()
 
 
 class MonitoringService:
@@ -63,11 +65,10 @@ class MonitoringService:
 
         # 構造化ログ出力
         logger.error(
-            f"Simulating error: {error_message}",
+            "Simulating error: %s",
+            error_message,
             extra={
-                "tenant_id": tenant_id,
                 "error_type": error_type,
-                "simulation": True,
                 "severity": "error"
             }
         )
@@ -102,14 +103,7 @@ class MonitoringService:
             - ログ（severity: info, latency_ms: int）
         """
         # 構造化ログ出力
-        logger.info(
-            f"Simulating latency: {duration_ms}ms for tenant {tenant_id}",
-            extra={
-                "tenant_id": tenant_id,
-                "latency_ms": duration_ms,
-                "simulation": True
-            }
-        )
+        logger.info("Simulating latency: %sms for tenant %s", duration_ms, tenant_id)
 
         # 指定時間スリープ
         time.sleep(duration_ms / 1000.0)
@@ -139,12 +133,16 @@ class MonitoringService:
                 "metric_value": float,
                 "timestamp": float
             }
+
+        監視項目:
+            - DogStatsD ゲージ demo_api.random_metric（tenant タグ付き）
         """
         metric_value = random.uniform(0, 100)
+        metrics.gauge("random_metric", metric_value, tags=[tenant_tag(tenant_id)])
 
         return {
             "tenant_id": tenant_id,
-            "metric_name": "demo.random_metric",
+            "metric_name": f"{metrics.prefix}random_metric",
             "metric_value": metric_value,
             "timestamp": time.time()
         }
@@ -0,0 +1,356 @@
+"""
+リソース負荷シミュレーションサービス
+
+目的: CPU飽和・メモリ増加・GIL競合・GC負荷を制御された範囲で再現し、
+      オートスケーリング、Datadogモニター、実エンドポイントのテールレイテンシを検証する
+影響範囲: simulate_controller.py（POST /{tenant_id}/simulate/cpu, memory, gc）
+前提条件: なし
+
+安全策:
+    - 実行時間・ワーカー数・保持メモリは設定値で上限を設け、上限超過は SimulationLimitError（→ 429）
+    - メモリ保持は期限到達で自動解放（プロセス停止時はプロセスごと解放）
+"""
+
+import gc
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+from infrastructure.logger import get_logger
+from infrastructure.metrics import get_metrics, tenant_tag
+
+logger = get_logger()
+metrics = get_metrics()
+
+_PAGE_SIZE = 4096
+
+# process モードの子プロセスで実行するCPU消費ループ（アプリケーションをインポートせず即座に開始する）
+_BURN_SCRIPT = """
+import sys, time
+deadline = time.perf_counter() + float(sys.argv[1])
+iterations = value = 0
+while time.perf_counter() < deadline:
+    for i in range(1000):
+        value = (value * 31 + i) % 1000003
+    iterations += 1000
+print(iterations)
+"""
+
+
+class SimulationLimitError(Exception):
+    """
+    シミュレーション上限超過エラー
+
+    発生条件:
+        - 実行中のシミュレーションと合わせて上限（ワーカー数、保持メモリ等）を超える
+    """
+    pass
+
+
+class ResourceBudget:
+    """
+    シミュレーション用リソース枠（ワーカー数、MB 等の単位で計数）
+
+    責務:
+        - 上限を超えない範囲での枠の予約と解放（待機せず即座に成否を返す）
+
+    前提条件:
+        - スレッドセーフ（同期エンドポイントはスレッドプールで実行される）
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._in_use = 0
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def acquire(self, amount: int) -> None:
+        """
+        枠を予約（呼び出し元は release で必ず解放する）
+
+        Raises:
+            SimulationLimitError: 予約すると上限を超える
+        """
+        with self._lock:
+            if self._in_use + amount > self.limit:
+                raise SimulationLimitError(
+                    f"{self.name} limit exceeded: requested {amount}, "
+                    f"in use {self._in_use}, limit {self.limit}"
+                )
+            self._in_use += amount
+
+    def release(self, amount: int) -> None:
+        with self._lock:
+            self._in_use = max(0, self._in_use - amount)
+
+
+def _burn(duration: float) -> int:
+    """
+    指定時間、純Pythonのループで CPU を消費する（GILを保持し続ける）
+
+    Returns:
+        int: ループ回数
+    """
+    deadline = time.perf_counter() + duration
+    iterations = 0
+    value = 0
+    while time.perf_counter() < deadline:
+        for i in range(1000):
+            value = (value * 31 + i) % 1000003
+        iterations += 1000
+    return iterations
+
+
+class _MemoryHold:
+    """保持中のメモリ（解放タイマー付き）"""
+
+    __slots__ = ("hold_id", "tenant_id", "size_mb", "expires_at", "buffer", "timer")
+
+    def __init__(self, tenant_id: str, size_mb: int, hold_seconds: float):
+        self.hold_id = uuid.uuid4().hex[:12]
+        self.tenant_id = tenant_id
+        self.size_mb = size_mb
+        self.expires_at = time.time() + hold_seconds
+        self.buffer: Optional[bytearray] = bytearray(size_mb * 1024 * 1024)
+        # ページに書き込んで実メモリ（RSS）を確保する（ゼロ初期化のみでは割り当てられない場合がある）
+        self.buffer[::_PAGE_SIZE] = b"\x01" * len(range(0, len(self.buffer), _PAGE_SIZE))
+        self.timer: Optional[threading.Timer] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hold_id": self.hold_id,
+            "tenant_id": self.tenant_id,
+            "size_mb": self.size_mb,
+            "expires_at": self.expires_at,
+        }
+
+
+class PressureService:
+    """
+    リソース負荷シミュレーションサービス
+
+    責務:
+        - CPU負荷（スレッド: GIL競合 / プロセス: CPU飽和）
+        - メモリ確保と期限付き保持（自動解放）
+        - GC負荷（循環参照を含む短命オブジェクトの大量生成）
+
+    影響範囲:
+        - 同一タスク上の全エンドポイントのレイテンシ（意図した副作用）
+    """
+
+    cpu_budget = ResourceBudget("cpu_workers", settings.SIMULATE_CPU_MAX_WORKERS)
+    memory_budget = ResourceBudget("memory_mb", settings.SIMULATE_MEMORY_MAX_MB)
+
+    _holds_lock = threading.Lock()
+    _holds: Dict[str, _MemoryHold] = {}
+
+    @staticmethod
+    def _check_duration(duration_ms: int) -> float:
+        limit_ms = int(settings.SIMULATE_MAX_DURATION_SECONDS * 1000)
+        if duration_ms > limit_ms:
+            raise SimulationLimitError(f"duration_ms must be <= {limit_ms}")
+        return duration_ms / 1000.0
+
+    @staticmethod
+    def burn_cpu(tenant_id: str, workers: int, duration_ms: int, mode: str = "thread") -> Dict[str, Any]:
+        """
+        CPU負荷をシミュレーション（完了まで待機）
+
+        Args:
+            tenant_id (str): テナントID
+            workers (int): ワーカー数
+            duration_ms (int): 実行時間（ミリ秒）
+            mode (str): "thread"（GIL競合、他リクエストの処理も遅延する）、
+                        "process"（別プロセスでCPUコアを飽和させる）
+
+        Returns:
+            Dict[str, Any]: {"tenant_id", "mode", "workers", "duration_ms", "elapsed_ms", "iterations"}
+
+        Raises:
+            ValueError: mode が不正
+            SimulationLimitError: 実行時間・同時ワーカー数の上限超過
+        """
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Invalid mode: {mode} (thread, process)")
+        duration = PressureService._check_duration(duration_ms)
+
+        PressureService.cpu_budget.acquire(workers)
+        started = time.perf_counter()
+        try:
+            logger.info("Simulating CPU burn: %d %s workers for %sms", workers, mode, duration_ms)
+            if mode == "process":
+                iterations = PressureService._burn_processes(workers, duration)
+            else:
+                results: List[int] = [0] * workers
+
+                def _worker(index: int) -> None:
+                    results[index] = _burn(duration)
+
+                threads = [
+                    threading.Thread(target=_worker, args=(i,), name=f"simulate-cpu-{i}", daemon=True)
+                    for i in range(workers)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                iterations = results
+        finally:
+            PressureService.cpu_budget.release(workers)
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        metrics.histogram(
+            "simulate.cpu.elapsed_ms", elapsed_ms, tags=[tenant_tag(tenant_id), f"mode:{mode}"]
+        )
+        return {
+            "tenant_id": tenant_id,
+            "mode": mode,
+            "workers": workers,
+            "duration_ms": duration_ms,
+            "elapsed_ms": elapsed_ms,
+            "iterations": sum(iterations),
+        }
+
+    @staticmethod
+    def _burn_processes(workers: int, duration: float) -> List[int]:
+        # fork（スレッド実行中のプロセスでは安全でない）を避け、独立したインタプリタを起動する
+        processes = [
+            subprocess.Popen(
+                [sys.executable, "-c", _BURN_SCRIPT, str(duration)],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )
+            for _ in range(workers)
+        ]
+        iterations: List[int] = []
+        for process in processes:
+            try:
+                stdout, _ = process.communicate(timeout=duration + 5)
+                iterations.append(int(stdout.strip() or 0))
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                iterations.append(0)
+        return iterations
+
+    @staticmethod
+    def hold_memory(tenant_id: str, size_mb: int, hold_seconds: int) -> Dict[str, Any]:
+        """
+        メモリを確保し、指定時間保持する（即座に返り、期限到達で自動解放）
+
+        Args:
+            tenant_id (str): テナントID
+            size_mb (int): 確保サイズ（MB）
+            hold_seconds (int): 保持時間（秒）
+
+        Returns:
+            Dict[str, Any]: {"hold_id", "tenant_id", "size_mb", "expires_at", "held_mb"}
+
+        Raises:
+            SimulationLimitError: 保持時間（SIMULATE_MEMORY_MAX_HOLD_SECONDS）・
+                                  保持メモリ合計（SIMULATE_MEMORY_MAX_MB）の上限超過
+        """
+        if hold_seconds > settings.SIMULATE_MEMORY_MAX_HOLD_SECONDS:
+            raise SimulationLimitError(
+                f"hold_seconds must be <= {settings.SIMULATE_MEMORY_MAX_HOLD_SECONDS}"
+            )
+        PressureService.memory_budget.acquire(size_mb)
+        try:
+            hold = _MemoryHold(tenant_id, size_mb, hold_seconds)
+        except MemoryError:
+            PressureService.memory_budget.release(size_mb)
+            raise SimulationLimitError(f"Could not allocate {size_mb}MB")
+
+        with PressureService._holds_lock:
+            PressureService._holds[hold.hold_id] = hold
+        hold.timer = threading.Timer(hold_seconds, PressureService._release_hold, args=(hold.hold_id,))
+        hold.timer.daemon = True
+        hold.timer.start()
+
+        held_mb = PressureService.memory_budget.in_use
+        metrics.gauge("simulate.memory.held_mb", held_mb)
+        logger.info(
+            "Simulating memory hold: %sMB for %ss (held %sMB)", size_mb, hold_seconds, held_mb
+        )
+        return {**hold.to_dict(), "held_mb": held_mb}
+
+    @staticmethod
+    def _release_hold(hold_id: str) -> Optional[_MemoryHold]:
+        with PressureService._holds_lock:
+            hold = PressureService._holds.pop(hold_id, None)
+        if hold is None:
+            return None
+        if hold.timer is not None:
+            hold.timer.cancel()
+        hold.buffer = None
+        PressureService.memory_budget.release(hold.size_mb)
+        metrics.gauge("simulate.memory.held_mb", PressureService.memory_budget.in_use)
+        return hold
+
+    @staticmethod
+    def release_memory(tenant_id: str) -> Dict[str, Any]:
+        """
+        テナントが保持中のメモリを期限前に解放する
+
+        Returns:
+            Dict[str, Any]: {"tenant_id", "released_mb", "held_mb"}
+        """
+        with PressureService._holds_lock:
+            hold_ids = [h.hold_id for h in PressureService._holds.values() if h.tenant_id == tenant_id]
+        released = [PressureService._release_hold(hold_id) for hold_id in hold_ids]
+        return {
+            "tenant_id": tenant_id,
+            "released_mb": sum(hold.size_mb for hold in released if hold is not None),
+            "held_mb": PressureService.memory_budget.in_use,
+        }
+
+    @staticmethod
+    def gc_pressure(tenant_id: str, duration_ms: int, objects_per_cycle: int) -> Dict[str, Any]:
+        """
+        GC負荷をシミュレーション（循環参照を含む短命オブジェクトを指定時間生成し続ける）
+
+        Args:
+            tenant_id (str): テナントID
+            duration_ms (int): 実行時間（ミリ秒）
+            objects_per_cycle (int): 1サイクルで生成するオブジェクト数
+
+        Returns:
+            Dict[str, Any]: {"tenant_id", "duration_ms", "cycles", "collections"（世代別のGC回数）}
+
+        Raises:
+            SimulationLimitError: 実行時間・同時実行数の上限超過
+        """
+        duration = PressureService._check_duration(duration_ms)
+        PressureService.cpu_budget.acquire(1)
+        before = [stats["collections"] for stats in gc.get_stats()]
+        cycles = 0
+        try:
+            deadline = time.perf_counter() + duration
+            while time.perf_counter() < deadline:
+                garbage = []
+                for i in range(objects_per_cycle):
+                    node: Dict[str, Any] = {"i": i}
+                    node["self"] = node
+                    garbage.append(node)
+                del garbage
+                cycles += 1
+        finally:
+            PressureService.cpu_budget.release(1)
+
+        collections = {
+            f"gen{generation}": stats["collections"] - before[generation]
+            for generation, stats in enumerate(gc.get_stats())
+        }
+        return {
+            "tenant_id": tenant_id,
+            "duration_ms": duration_ms,
+            "cycles": cycles,
+            "collections": collections,
+        }
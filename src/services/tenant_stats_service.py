@@ -0,0 +1,195 @@
+"""
+テナント横断統計サービス
+
+目的: 全テナントの件数・最新作成日時・書き込みレートを、ダッシュボードのポーリングごとにDBへ問い合わせずに返す
+影響範囲: stats_controller.py（GET /stats/tenants）、warmup_service.py（事前計算）、main.py（更新スレッド起動）、
+          drain_service.py（更新スレッド停止）
+前提条件: items_repository.py（stats_by_tenants）、tenant_service.py（テナント一覧）
+
+動作:
+    - 1回の GROUP BY クエリで全テナント分を集計し、プロセス内にキャッシュする
+    - TENANT_STATS_REFRESH_SECONDS > 0 の場合は更新スレッドが定期的に再計算する
+      （リクエストはキャッシュのみを参照し、未計算の場合のみその場で計算する）
+    - 0 の場合はキャッシュが TENANT_STATS_TTL_SECONDS を過ぎた最初のリクエストが再計算する
+      （同時リクエストは計算完了を待って同じ結果を使う）
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from config.settings import settings
+from repositories.database import SessionLocal
+from repositories.items_repository import ItemsRepository
+from services.tenant_service import TenantService
+from infrastructure.logger import get_logger
+from infrastructure.metrics import get_metrics
+
+logger = get_logger()
+metrics = get_metrics()
+
+
+class TenantStatsCache:
+    """
+    テナント横断統計のキャッシュ
+
+    責務:
+        - 統計の計算（1クエリ）と保持
+        - TTL 切れ時の再計算（同時に1つのみ）
+        - 更新スレッドによる定期的な再計算
+
+    前提条件:
+        - スレッドセーフ（同期エンドポイントはスレッドプールで実行される）
+    """
+
+    def __init__(self, ttl: float, refresh_interval: float, rate_window: float):
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.rate_window = max(1.0, rate_window)
+        self._refresh_lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._computed_at = 0.0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _compute(self) -> Dict[str, Any]:
+        tenant_ids = TenantService.get_valid_tenants()
+        now = datetime.utcnow()
+        started = time.perf_counter()
+
+        db = SessionLocal()
+        try:
+            rows = ItemsRepository(db).stats_by_tenants(
+                tenant_ids, now - timedelta(seconds=self.rate_window)
+            )
+        finally:
+            db.close()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        metrics.histogram("tenant_stats.refresh_ms", elapsed_ms)
+
+        tenants = []
+        for tenant_id in tenant_ids:
+            # 0件のテナントも0として返す（GROUP BY の結果に含まれない）
+            count, newest, recent = rows.get(tenant_id, (0, None, 0))
+            tenants.append({
+                "tenant_id": tenant_id,
+                "item_count": count,
+                "newest_created_at": newest.isoformat() + "Z" if newest else None,
+                "writes_per_minute": round(recent * 60 / self.rate_window, 3),
+            })
+
+        return {
+            "generated_at": now.isoformat() + "Z",
+            "rate_window_seconds": self.rate_window,
+            "query_ms": round(elapsed_ms, 3),
+            "tenants": tenants,
+        }
+
+    def refresh(self) -> Dict[str, Any]:
+        """
+        統計を再計算してキャッシュを更新する
+
+        Returns:
+            Dict[str, Any]: 計算した統計
+
+        Raises:
+            SQLAlchemyError: DB接続・クエリ失敗時（キャッシュは更新しない）
+        """
+        with self._refresh_lock:
+            snapshot = self._compute()
+            self._snapshot = snapshot
+            self._computed_at = time.monotonic()
+            return snapshot
+
+    def get(self) -> Dict[str, Any]:
+        """
+        キャッシュ済みの統計を取得（未計算・TTL切れの場合は再計算）
+
+        Returns:
+            Dict[str, Any]: {"generated_at", "age_seconds", "rate_window_seconds", "query_ms", "tenants": [...]}
+
+        Raises:
+            SQLAlchemyError: 再計算が必要で、かつ失敗した場合（古い統計がある場合はそれを返す）
+
+        注意:
+            - 更新スレッドの実行中は TTL 切れでも再計算せず、最後の統計を返す
+        """
+        snapshot = self._snapshot
+        if snapshot is None or (self._thread is None and self._age() >= self.ttl):
+            snapshot = self._refresh_if_stale(snapshot)
+        return {**snapshot, "age_seconds": round(self._age(), 3)}
+
+    def _refresh_if_stale(self, seen: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        with self._refresh_lock:
+            # 待っている間に別のリクエストが再計算していればその結果を使う
+            if self._snapshot is not None and self._snapshot is not seen:
+                return self._snapshot
+            try:
+                snapshot = self._compute()
+            except Exception as e:
+                if self._snapshot is None:
+                    raise
+                logger.warning(
+                    "Tenant stats refresh failed, serving stale stats: %s",
+                    e,
+                    extra={"error_type": "tenant_stats_refresh_failed", "severity": "warning"}
+                )
+                return self._snapshot
+            self._snapshot = snapshot
+            self._computed_at = time.monotonic()
+            return snapshot
+
+    def _age(self) -> float:
+        return time.monotonic() - self._computed_at
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(
+                    "Tenant stats refresh failed: %s",
+                    e,
+                    extra={"error_type": "tenant_stats_refresh_failed", "severity": "warning"}
+                )
+
+    def start(self) -> None:
+        """
+        更新スレッドを開始（TENANT_STATS_REFRESH_SECONDS <= 0・起動済みの場合は何もしない）
+        """
+        if self.refresh_interval <= 0 or self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="tenant-stats-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        更新スレッドを停止
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.refresh_interval)
+            self._thread = None
+
+
+_cache: Optional[TenantStatsCache] = None
+
+
+def get_tenant_stats_cache() -> TenantStatsCache:
+    """
+    グローバルテナント統計キャッシュを取得（シングルトン）
+
+    Returns:
+        TenantStatsCache: TENANT_STATS_* で設定済みのキャッシュ
+    """
+    global _cache
+    if _cache is None:
+        _cache = TenantStatsCache(
+            ttl=settings.TENANT_STATS_TTL_SECONDS,
+            refresh_interval=settings.TENANT_STATS_REFRESH_SECONDS,
+            rate_window=settings.TENANT_STATS_RATE_WINDOW_SECONDS,
+        )
+    return _cache
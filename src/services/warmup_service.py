@@ -0,0 +1,182 @@
+"""
+ウォームアップサービス
+
+目的: 新規ECSタスクがALBトラフィックを受ける前に接続プールとキャッシュを準備（デプロイ・スケールアウト時のp99スパイク抑制）
+影響範囲: main.py（起動時にバックグラウンド実行）、readiness.py（完了時に ready へ遷移）
+前提条件: database.py（engine, SessionLocal）、tenant_service.py（テナント一覧）
+"""
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List
+
+from config.settings import settings
+from repositories.database import engine, SessionLocal
+from services.items_service import ItemsService
+from services.tenant_service import TenantService
+from services.tenant_stats_service import get_tenant_stats_cache
+from infrastructure.readiness import readiness
+from infrastructure.logger import get_logger
+
+logger = get_logger()
+
+
+class WarmupService:
+    """
+    ウォームアップサービス
+
+    責務:
+        - 接続プールの事前接続（TCP + TLS + 認証を並列に実施）
+        - テナント別ホットクエリの事前実行（RDS側バッファキャッシュのプライム）
+        - テナント横断統計の事前計算
+        - 完了時にレディネスを ready に遷移
+
+    影響範囲:
+        - GET /{tenant_id}/health（ALBヘルスチェック）・GET /ready（完了まで503）
+
+    前提条件:
+        - バックグラウンドスレッドから呼び出される（イベントループを塞がない）
+    """
+
+    @staticmethod
+    def _close_when_done(future: Future) -> None:
+        # タイムアウト後に確立した接続もプールへ返却する
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    @staticmethod
+    def warm_pool(connections: int, timeout: float) -> Dict[str, int]:
+        """
+        接続プールに指定数の接続を並列に確立する
+
+        目的:
+            - 初回リクエストが接続確立コストを払わないようにする
+
+        Args:
+            connections (int): 事前接続数（DB_POOL_SIZE を上限とする）
+            timeout (float): タイムアウト（秒）
+
+        Returns:
+            Dict[str, int]: {"opened": 成功数, "failed": 失敗数}
+
+        注意:
+            - 全接続を同時に保持してから返却する（逐次だと同じ接続が再利用されるため）
+            - pool_size を超えた接続は返却時に破棄されるため、上限を pool_size とする
+        """
+        connections = max(0, min(connections, settings.DB_POOL_SIZE))
+        if connections == 0:
+            return {"opened": 0, "failed": 0}
+
+        executor = ThreadPoolExecutor(max_workers=connections, thread_name_prefix="warmup-pool")
+        futures = [executor.submit(engine.connect) for _ in range(connections)]
+        done, not_done = wait(futures, timeout=timeout)
+        executor.shutdown(wait=False)
+
+        opened: List[Any] = []
+        failed = 0
+        for future in done:
+            if future.exception() is None:
+                opened.append(future.result())
+            else:
+                failed += 1
+                logger.warning(
+                    "Warm-up connection failed: %s",
+                    future.exception(),
+                    extra={"error_type": "warmup_connection_failed", "severity": "warning"}
+                )
+
+        for future in not_done:
+            failed += 1
+            future.add_done_callback(WarmupService._close_when_done)
+
+        for connection in opened:
+            connection.close()
+
+        return {"opened": len(opened), "failed": failed}
+
+    @staticmethod
+    def prime_queries(tenant_ids: List[str], deadline: float) -> Dict[str, int]:
+        """
+        テナント別のホットクエリ（一覧検証子、一覧取得）を事前実行する
+
+        注意:
+            - 一覧取得は LIMIT 1（件数の多いテナントでも全件を読み込まない。
+              接続・プリペアドステートメント・ORM のマッピング準備が目的のため1件で足りる）
+
+        Args:
+            tenant_ids (List[str]): テナントIDリスト
+            deadline (float): 打ち切り時刻（time.monotonic() 基準）
+
+        Returns:
+            Dict[str, int]: {"primed": 成功テナント数, "failed": 失敗テナント数}
+        """
+        primed = 0
+        failed = 0
+        for tenant_id in tenant_ids:
+            if time.monotonic() >= deadline:
+                break
+            db = SessionLocal()
+            try:
+                items_service = ItemsService(db)
+                items_service.get_items_validator(tenant_id)
+                items_service.search_items(tenant_id, limit=1)
+                primed += 1
+            except Exception as e:
+                failed += 1
+                logger.warning(
+                    "Warm-up query failed for tenant %s: %s",
+                    tenant_id, e,
+                    extra={
+                        "tenant_id": tenant_id,
+                        "error_type": "warmup_query_failed",
+                        "severity": "warning"
+                    }
+                )
+            finally:
+                db.close()
+
+        return {"primed": primed, "failed": failed}
+
+    @staticmethod
+    def run() -> Dict[str, Any]:
+        """
+        ウォームアップを実行し、完了後にレディネスを ready へ遷移する
+
+        目的:
+            - 接続プール事前接続 → ホットクエリ事前実行・テナント横断統計の事前計算 → ready
+
+        Returns:
+            Dict[str, Any]: ウォームアップ結果（/ready レスポンスにも含まれる）
+
+        注意:
+            - 失敗してもタスクを永久に非readyにしない（DB障害はヘルスチェック側で検知する）
+        """
+        readiness.mark_warming_up()
+        deadline = time.monotonic() + settings.WARMUP_TIMEOUT_SECONDS
+        result: Dict[str, Any] = {}
+
+        try:
+            result["pool"] = WarmupService.warm_pool(
+                settings.WARMUP_POOL_CONNECTIONS,
+                timeout=settings.WARMUP_TIMEOUT_SECONDS
+            )
+
+            if settings.WARMUP_PRIME_QUERIES:
+                result["queries"] = WarmupService.prime_queries(
+                    TenantService.get_valid_tenants(), deadline
+                )
+                # テナント横断統計（GET /stats/tenants の初回リクエストで集計しない）
+                result["tenant_stats_ms"] = get_tenant_stats_cache().refresh()["query_ms"]
+        except Exception as e:
+            result["error"] = str(e)
+            logger.error(
+                "Warm-up failed: %s",
+                e,
+                exc_info=True,
+                extra={"error_type": "warmup_failed", "severity": "error"}
+            )
+        finally:
+            readiness.mark_ready(result)
+
+        logger.info("Warm-up completed", extra={"warmup": readiness.snapshot()})
+        return result
@@ -0,0 +1,66 @@
+"""
+テスト共通設定
+
+目的: src/ をインポートパスに追加し、アプリの設定（環境変数）をテスト用に固定する
+影響範囲: tests/ 配下のすべてのテスト
+前提条件: requirements.txt の依存関係（pytest、httpx を含む）
+
+実行（リポジトリのルートで実行）:
+    python -m pytest -q tests
+
+注意:
+    - 設定はインポート時に環境変数から読み込まれるため、アプリのモジュールより先に環境変数を設定する
+    - DB は既定で一時ディレクトリの SQLite（TEST_DATABASE_URL で PostgreSQL も指定可能。
+      PostgreSQL 専用のテストは SQLite ではスキップされる）
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(REPO_ROOT, "src")
+sys.path.insert(0, SRC_DIR)
+
+_workdir = tempfile.mkdtemp(prefix="demo-api-test-")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{os.path.join(_workdir, 'test.db')}"
+os.environ.setdefault("DD_TRACE_ENABLED", "false")
+os.environ.setdefault("DD_METRICS_ENABLED", "false")
+os.environ.setdefault("DD_PATCH_MODULES", "")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("VALID_TENANTS", "tenant-a,tenant-b,tenant-c")
+os.environ.setdefault("ADMIN_TOKEN", "test-admin-token")
+# リクエスト外でクエリを発行する更新スレッドを止める（query_budget はエンジン全体の発行分を数える）
+os.environ.setdefault("TENANT_STATS_REFRESH_SECONDS", "0")
+
+
+@pytest.fixture(scope="session")
+def app():
+    """
+    FastAPI アプリケーション（セッション内で1つ）
+    """
+    from main import app as application
+    return application
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """
+    起動処理（スキーマ作成・ウォームアップ）を実行済みの TestClient
+
+    注意:
+        - ウォームアップ（バックグラウンドスレッド）の完了を待ってから返す
+        - 停止処理（ドレイン）はセッション終了時に1回だけ実行される
+    """
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as test_client:
+        deadline = time.monotonic() + 30
+        while test_client.get("/ready").status_code != 200:
+            if time.monotonic() >= deadline:
+                pytest.fail("Application did not become ready within 30s")
+            time.sleep(0.05)
+        yield test_client
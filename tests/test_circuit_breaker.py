@@ -0,0 +1,177 @@
+"""
+サーキットブレーカー（DB接続）
+
+目的: 状態遷移（closed → open → half_open → closed、試行失敗での再 open）、Retry-After の値、
+      get_db での 503 + Retry-After への変換を確認する
+影響範囲: circuit_breaker.py、database.py（get_db）、error_handler.py
+前提条件: conftest.py（client）
+
+注意:
+    - 時刻は time.monotonic をモンキーパッチした仮想時刻で進める（実際には待たない）
+"""
+
+import pytest
+
+from infrastructure import circuit_breaker as circuit_breaker_module
+from infrastructure.circuit_breaker import CircuitBreaker, CircuitOpenError
+from repositories.database import db_circuit_breaker
+
+TENANT_ID = "tenant-c"
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker_module.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker(clock) -> CircuitBreaker:
+    return CircuitBreaker("test", failure_threshold=3, reset_timeout=10.0, half_open_max_probes=1)
+
+
+def _fail(breaker: CircuitBreaker, times: int) -> None:
+    for _ in range(times):
+        breaker.before_call()
+        breaker.record_failure(ConnectionError("connection refused"))
+
+
+def test_closed_open_half_open_closed(breaker, clock):
+    _fail(breaker, 2)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    _fail(breaker, 1)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # reset_timeout 経過後の最初の呼び出しが試行（half_open）になり、成功で closed に戻る
+    clock.advance(10.0)
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot()["consecutive_failures"] == 0
+
+    # closed に戻った後は再び閾値まで失敗を許容する
+    _fail(breaker, 2)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_success_resets_consecutive_failures(breaker):
+    _fail(breaker, 2)
+    breaker.before_call()
+    breaker.record_success()
+    _fail(breaker, 2)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens(breaker, clock):
+    _fail(breaker, 3)
+    clock.advance(10.0)
+
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_failure(ConnectionError("still down"))
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # 再 open 時点から reset_timeout を数え直す
+    clock.advance(9.0)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.advance(1.0)
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_half_open_limits_concurrent_probes(breaker, clock):
+    _fail(breaker, 3)
+    clock.advance(10.0)
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_after == 1
+
+
+@pytest.mark.parametrize("elapsed, expected", [(0.0, 10), (0.5, 10), (4.0, 6), (9.2, 1), (9.99, 1)])
+def test_retry_after_is_remaining_open_time_rounded_up(breaker, clock, elapsed, expected):
+    _fail(breaker, 3)
+    clock.advance(elapsed)
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_after == expected
+    assert excinfo.value.name == "test"
+
+    # check()（試行枠を消費しない確認）も同じ値
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.check()
+    assert excinfo.value.retry_after == expected
+
+
+def test_check_does_not_consume_probe(breaker, clock):
+    _fail(breaker, 3)
+    clock.advance(10.0)
+
+    breaker.check()
+    breaker.check()
+    assert breaker.state == CircuitBreaker.OPEN
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_disabled_breaker_never_opens(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, enabled=False)
+    _fail(breaker, 5)
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.check()
+    breaker.before_call()
+
+
+@pytest.fixture
+def open_db_circuit(client, clock):
+    """
+    DB接続のサーキットを open にする（テスト後に元の状態へ戻す）
+    """
+    saved = {
+        name: getattr(db_circuit_breaker, name)
+        for name in ("enabled", "_state", "_failures", "_opened_at", "_probes")
+    }
+    db_circuit_breaker.enabled = True
+    with db_circuit_breaker._lock:
+        db_circuit_breaker._failures = db_circuit_breaker.failure_threshold
+        db_circuit_breaker._opened_at = clock.now
+        db_circuit_breaker._transition(CircuitBreaker.OPEN, ConnectionError("test"))
+    clock.advance(db_circuit_breaker.reset_timeout - 2.5)
+    try:
+        yield db_circuit_breaker
+    finally:
+        for name, value in saved.items():
+            setattr(db_circuit_breaker, name, value)
+
+
+def test_get_db_maps_open_circuit_to_503(client, open_db_circuit):
+    response = client.get(f"/{TENANT_ID}/items")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    body = response.json()
+    assert body["error_type"] == "service_unavailable"
+    assert "database is unavailable (circuit open)" in body["message"]
+
+
+def test_readiness_does_not_depend_on_db_circuit(client, open_db_circuit):
+    assert client.get("/ready").status_code == 200
@@ -0,0 +1,146 @@
+"""
+停止時のドレイン（SIGTERM → 登録解除待ち → uvicorn の停止 → DrainService.drain）
+
+目的: 停止中に送られたリクエストが打ち切られないこと、登録解除待ちの間は ALB のヘルスチェック
+      （GET /{tenant_id}/health）・/ready が503で、新規リクエストの受付を続けることを確認する
+影響範囲: drain_service.py、main.py（起動・停止処理）
+前提条件: requirements.txt の依存関係（uvicorn、httpx）
+
+注意:
+    - シグナルハンドラはメインスレッドでのみ登録されるため、TestClient ではなく uvicorn のサブプロセスで検証する
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEREGISTRATION_DELAY_SECONDS = 1.5
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def server(tmp_path):
+    port = _free_port()
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.path.join(REPO_ROOT, "src"),
+        DATABASE_URL=f"sqlite:///{tmp_path / 'drain.db'}",
+        DRAIN_DEREGISTRATION_DELAY_SECONDS=str(DEREGISTRATION_DELAY_SECONDS),
+        DRAIN_TIMEOUT_SECONDS="5",
+        LOG_LEVEL="INFO",
+    )
+    log = tempfile.TemporaryFile(dir=tmp_path)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--timeout-graceful-shutdown", "10"],
+        cwd=os.path.join(REPO_ROOT, "src"),
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            if httpx.get(f"{base_url}/ready").status_code == 200:
+                break
+        except httpx.TransportError:
+            pass
+        if process.poll() is not None or time.monotonic() >= deadline:
+            process.kill()
+            log.seek(0)
+            pytest.fail(f"Server did not become ready:\n{log.read().decode(errors='replace')}")
+        time.sleep(0.1)
+
+    try:
+        yield process, base_url, log
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        log.close()
+
+
+def _read_log(log) -> str:
+    log.seek(0)
+    return log.read().decode(errors="replace")
+
+
+def test_requests_in_flight_and_during_deregistration_delay_complete(server):
+    process, base_url, log = server
+    results = {}
+
+    def slow_request(name: str) -> None:
+        try:
+            response = httpx.post(
+                f"{base_url}/tenant-a/simulate/latency", json={"duration_ms": 2000}, timeout=10
+            )
+            results[name] = response.status_code
+        except httpx.HTTPError as exc:
+            results[name] = repr(exc)
+
+    in_flight = threading.Thread(target=slow_request, args=("in_flight",))
+    in_flight.start()
+    time.sleep(0.3)
+
+    signaled_at = time.monotonic()
+    process.send_signal(signal.SIGTERM)
+    time.sleep(0.3)
+
+    # 登録解除待ちの間: ALBのヘルスチェック・レディネスは503、新規リクエストは受け付けて処理する
+    tenant_health = httpx.get(f"{base_url}/tenant-a/health")
+    assert tenant_health.status_code == 503
+    assert tenant_health.json()["readiness"] == "draining"
+    ready = httpx.get(f"{base_url}/ready")
+    assert ready.status_code == 503
+    assert ready.json()["status"] == "draining"
+    assert httpx.get(f"{base_url}/health").status_code == 200
+    during_delay = threading.Thread(target=slow_request, args=("during_delay",))
+    during_delay.start()
+
+    in_flight.join()
+    during_delay.join()
+    assert process.wait(timeout=20) == 0
+    elapsed = time.monotonic() - signaled_at
+
+    assert results == {"in_flight": 200, "during_delay": 200}
+    assert elapsed >= DEREGISTRATION_DELAY_SECONDS
+    output = _read_log(log)
+    assert "SIGTERM received" in output
+    assert "Drain completed" in output
+
+
+def test_new_connections_refused_after_delay(server):
+    process, base_url, log = server
+    process.send_signal(signal.SIGTERM)
+    time.sleep(DEREGISTRATION_DELAY_SECONDS + 1)
+
+    assert process.wait(timeout=20) == 0
+    with pytest.raises(httpx.TransportError):
+        httpx.get(f"{base_url}/health")
+    assert "Drain completed" in _read_log(log)
+
+
+def test_second_sigterm_skips_delay(server):
+    process, base_url, log = server
+    process.send_signal(signal.SIGTERM)
+    time.sleep(0.2)
+    signaled_at = time.monotonic()
+    process.send_signal(signal.SIGTERM)
+
+    assert process.wait(timeout=20) == 0
+    assert time.monotonic() - signaled_at < DEREGISTRATION_DELAY_SECONDS
+    assert "Drain completed" in _read_log(log)
@@ -0,0 +1,92 @@
+"""
+グループコミットのCOMMIT待ちとリクエストデッドライン
+
+目的: COMMIT完了の待ちがリクエストの残り時間で打ち切られ、DeadlineExceeded になることを確認する
+      （書き込み前に打ち切った要求は書き込まれない）
+影響範囲: group_commit.py、deadline.py
+前提条件: conftest.py（client: スキーマ作成済み）
+"""
+
+import threading
+import time
+
+import pytest
+
+from infrastructure.deadline import DeadlineExceeded, set_deadline
+from repositories.group_commit import GroupCommitWriter
+
+
+@pytest.fixture
+def writer(client, monkeypatch):
+    """
+    1回目のバッチの書き込みが release まで終わらないライター
+    """
+    release = threading.Event()
+    written = []
+    original = GroupCommitWriter._insert
+
+    def slow_insert(rows):
+        written.append([row["name"] for row in rows])
+        release.wait(5)
+        return original(rows)
+
+    monkeypatch.setattr(GroupCommitWriter, "_insert", staticmethod(slow_insert))
+    group_writer = GroupCommitWriter(window_ms=0, max_batch=10)
+    group_writer.start()
+    group_writer.release = release
+    group_writer.written = written
+    yield group_writer
+    release.set()
+    group_writer.stop()
+
+
+def _submit_in_thread(writer, name):
+    thread = threading.Thread(target=writer.submit, args=("tenant-a", name))
+    thread.start()
+    return thread
+
+
+def test_submit_without_deadline_waits_for_commit(writer):
+    writer.release.set()
+
+    item = writer.submit("tenant-a", "group commit item")
+
+    assert item.id is not None
+    assert item.name == "group commit item"
+
+
+def test_submit_raises_deadline_exceeded_and_skips_the_write(writer):
+    blocking = _submit_in_thread(writer, "in-flight batch")
+    deadline = time.monotonic() + 5
+    while not writer.written and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    set_deadline(0.1)
+    started = time.monotonic()
+    try:
+        with pytest.raises(DeadlineExceeded):
+            writer.submit("tenant-a", "timed out")
+    finally:
+        set_deadline(None)
+    elapsed = time.monotonic() - started
+
+    writer.release.set()
+    blocking.join(5)
+    writer.stop()
+
+    assert elapsed < 1.0
+    assert writer.written == [["in-flight batch"]]
+
+
+def test_submit_without_time_left_does_not_enqueue(writer):
+    set_deadline(0)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            writer.submit("tenant-a", "no time left")
+    finally:
+        set_deadline(None)
+
+    writer.release.set()
+    writer.stop()
+
+    assert writer.written == []
@@ -0,0 +1,279 @@
+"""
+冪等キー（Idempotency-Key）による作成の重複排除
+
+目的: POST /{tenant_id}/items の再送・同時実行・キーの再利用・失敗時の解放・テナント別のスコープと、
+      プロセス内ストアの TTL・件数上限（処理中のキーは削除しない）、シングルトンの作成を確認する
+影響範囲: idempotency.py、items_controller.py（create_item）、error_handler.py（409 / 422）
+前提条件: conftest.py（client）
+"""
+
+import threading
+import time
+import uuid
+
+import pytest
+
+import infrastructure.idempotency as idempotency
+from config.settings import settings
+from infrastructure.circuit_breaker import CircuitOpenError
+from infrastructure.idempotency import (
+    IdempotencyInProgressError,
+    IdempotencyKeyReusedError,
+    InMemoryIdempotencyStore,
+    StoredResponse,
+)
+from infrastructure.query_stats import query_budget
+from repositories.database import db_circuit_breaker
+from services.items_service import ItemsService
+
+TENANT_ID = "tenant-a"
+
+
+@pytest.fixture
+def key() -> str:
+    return f"test-{uuid.uuid4()}"
+
+
+def _post(client, key, name="idempotent", tenant_id=TENANT_ID):
+    return client.post(f"/{tenant_id}/items", json={"name": name}, headers={"Idempotency-Key": key})
+
+
+@pytest.fixture
+def blocked_create(monkeypatch):
+    """
+    作成（ItemsService.create_item）を release まで止める
+
+    Returns:
+        (started, release): 作成開始の通知、作成の再開
+    """
+    started = threading.Event()
+    release = threading.Event()
+    original = ItemsService.create_item
+
+    def create_item(self, *args, **kwargs):
+        started.set()
+        release.wait(5)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(ItemsService, "create_item", create_item)
+    yield started, release
+    release.set()
+
+
+def _post_in_thread(client, key, results, name):
+    thread = threading.Thread(target=lambda: results.__setitem__(name, _post(client, key)))
+    thread.start()
+    return thread
+
+
+# --- HTTP ---------------------------------------------------------------------
+
+
+def test_replay_returns_stored_response_without_sql(client, key):
+    first = _post(client, key)
+    assert first.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+
+    with query_budget(0):
+        replay = _post(client, key)
+
+    assert replay.status_code == 201
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json() == first.json()
+
+
+def test_replay_succeeds_while_db_circuit_is_open(client, key, monkeypatch):
+    first = _post(client, key)
+    assert first.status_code == 201
+
+    def circuit_open():
+        raise CircuitOpenError("database", 5)
+
+    monkeypatch.setattr(db_circuit_breaker, "check", circuit_open)
+
+    replay = _post(client, key)
+    assert replay.status_code == 201
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json() == first.json()
+    # 再送でないリクエストはサーキットにより失敗する
+    assert _post(client, f"{key}-new").status_code == 503
+
+
+def test_concurrent_request_waits_for_first(client, key, blocked_create):
+    started, release = blocked_create
+    results = {}
+    first = _post_in_thread(client, key, results, "first")
+    assert started.wait(5)
+    second = _post_in_thread(client, key, results, "second")
+    time.sleep(0.2)
+    release.set()
+    first.join(10)
+    second.join(10)
+
+    assert results["first"].status_code == 201
+    assert results["second"].status_code == 201
+    assert results["second"].headers["Idempotent-Replayed"] == "true"
+    assert results["second"].json()["id"] == results["first"].json()["id"]
+
+
+def test_concurrent_request_times_out_with_409(client, key, blocked_create, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 0.1)
+    started, release = blocked_create
+    results = {}
+    first = _post_in_thread(client, key, results, "first")
+    assert started.wait(5)
+
+    second = _post(client, key)
+    release.set()
+    first.join(10)
+
+    assert second.status_code == 409
+    assert second.headers["Retry-After"] == "1"
+    assert second.json()["error_type"] == "idempotency_in_progress"
+    assert results["first"].status_code == 201
+
+
+def test_same_key_with_different_body_is_rejected(client, key):
+    assert _post(client, key, name="original").status_code == 201
+
+    response = _post(client, key, name="changed")
+
+    assert response.status_code == 422
+
+
+def test_key_is_released_after_failed_create(client, key, monkeypatch):
+    original = ItemsService.create_item
+    calls = []
+
+    def create_item(self, *args, **kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise ValueError("simulated failure")
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(ItemsService, "create_item", create_item)
+
+    failed = _post(client, key)
+    retried = _post(client, key)
+
+    assert failed.status_code == 400
+    assert retried.status_code == 201
+    assert "Idempotent-Replayed" not in retried.headers
+    assert len(calls) == 2
+    assert client.get(f"/{TENANT_ID}/items/{retried.json()['id']}").status_code == 200
+
+
+def test_keys_are_scoped_per_tenant(client, key):
+    tenant_a = _post(client, key, tenant_id="tenant-a")
+    tenant_b = _post(client, key, tenant_id="tenant-b")
+
+    assert tenant_a.status_code == 201
+    assert tenant_b.status_code == 201
+    assert "Idempotent-Replayed" not in tenant_b.headers
+    assert tenant_b.json()["tenant_id"] == "tenant-b"
+    assert tenant_b.json()["id"] != tenant_a.json()["id"]
+
+
+# --- InMemoryIdempotencyStore ---------------------------------------------------
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(idempotency.time, "monotonic", fake)
+    return fake
+
+
+def _store_response(store, key, status_code=201):
+    assert store.begin(key, "fp", timeout=0) is None
+    store.complete(key, StoredResponse(status_code, {"key": key}))
+
+
+def test_store_replays_until_ttl_expires(clock):
+    store = InMemoryIdempotencyStore(max_keys=10, ttl_seconds=60)
+    _store_response(store, "k1")
+
+    clock.advance(59)
+    assert store.begin("k1", "fp", timeout=0) == StoredResponse(201, {"key": "k1"})
+
+    clock.advance(2)
+    assert store.begin("k1", "fp", timeout=0) is None
+
+
+def test_store_rejects_different_fingerprint(clock):
+    store = InMemoryIdempotencyStore()
+    _store_response(store, "k1")
+
+    with pytest.raises(IdempotencyKeyReusedError):
+        store.begin("k1", "other", timeout=0)
+
+
+def test_store_evicts_oldest_completed_over_max_keys(clock):
+    store = InMemoryIdempotencyStore(max_keys=2, ttl_seconds=60)
+    for key in ("k1", "k2", "k3"):
+        _store_response(store, key)
+
+    # 登録前の削除で最も古い k1 が削除される
+    assert store.begin("k1", "fp", timeout=0) is None
+    assert store.begin("k3", "fp", timeout=0) == StoredResponse(201, {"key": "k3"})
+
+
+def test_store_never_evicts_in_progress_keys(clock):
+    store = InMemoryIdempotencyStore(max_keys=1, ttl_seconds=60)
+    assert store.begin("k1", "fp", timeout=0) is None
+    assert store.begin("k2", "fp", timeout=0) is None
+
+    # 件数上限・TTL を超えても処理中のキーは残る
+    clock.advance(120)
+    assert store.begin("k3", "fp", timeout=0) is None
+    with pytest.raises(IdempotencyInProgressError):
+        store.begin("k1", "fp", timeout=0)
+
+    # 完了したキーは件数上限を超えていれば削除される（処理中の k2 / k3 は残る）
+    store.complete("k1", StoredResponse(201, {"key": "k1"}))
+    assert store.begin("k1", "fp", timeout=0) is None
+    with pytest.raises(IdempotencyInProgressError):
+        store.begin("k2", "fp", timeout=0)
+
+
+def test_concurrent_first_calls_share_one_store(monkeypatch):
+    created = []
+    original = idempotency.InMemoryIdempotencyStore
+
+    def slow_store(*args, **kwargs):
+        # 作成中に他のスレッドが割り込む時間を作る
+        time.sleep(0.05)
+        store = original(*args, **kwargs)
+        created.append(store)
+        return store
+
+    monkeypatch.setattr(idempotency, "_store", None)
+    monkeypatch.setattr(idempotency, "InMemoryIdempotencyStore", slow_store)
+
+    barrier = threading.Barrier(8)
+    results = []
+
+    def get_store():
+        barrier.wait()
+        results.append(idempotency.get_idempotency_store())
+
+    threads = [threading.Thread(target=get_store) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(created) == 1
+    assert len(results) == 8
+    assert all(store is created[0] for store in results)
@@ -0,0 +1,137 @@
+"""
+一覧検索（GET /{tenant_id}/items のフィルタ）のインデックス使用
+
+目的: 各フィルタの SQL が想定したインデックスで実行されることを EXPLAIN で確認する
+      （名前の前方一致 → テナント + pg_trgm、部分一致 → pg_trgm、作成日時範囲 → (tenant_id, created_at)）
+影響範囲: items_repository.py（search）、models/item.py（インデックス定義）
+前提条件: conftest.py（client）、TEST_DATABASE_URL に PostgreSQL（pg_trgm 拡張）を指定
+
+注意:
+    - SQLite（既定）ではスキップする（pg_trgm GIN インデックスは PostgreSQL のみ作成される）
+    - 件数の少ないテーブルではシーケンシャルスキャンが選ばれるため、enable_seqscan = off で
+      「インデックスを使用できるか」を検証する（実データ量でのコスト比較は対象外）
+    - パーティション分割時は子テーブルのインデックス名が自動で付くため、
+      プランのインデックス名ではなく pg_indexes の定義（列・演算子クラス）で判定する
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from sqlalchemy import event, text
+
+from models.item import Item
+from repositories.database import SessionLocal, engine
+from repositories.items_repository import ItemsRepository
+
+TENANT_ID = "tenant-b"
+
+pytestmark = pytest.mark.skipif(
+    engine.dialect.name != "postgresql",
+    reason="EXPLAIN-based index tests require PostgreSQL (set TEST_DATABASE_URL)",
+)
+
+
+@pytest.fixture(scope="module")
+def seeded(client):
+    db = SessionLocal()
+    try:
+        base = datetime(2025, 1, 1)
+        db.add_all(
+            Item(
+                tenant_id=TENANT_ID,
+                name=f"indexed item {i:05d}",
+                description="explain",
+                created_at=base + timedelta(minutes=i),
+            )
+            for i in range(2000)
+        )
+        db.commit()
+        db.execute(text("ANALYZE items"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _capture_search(**filters: Any) -> Tuple[str, Any]:
+    """
+    ItemsRepository.search が発行する SELECT とパラメータを取得
+    """
+    captured: List[Tuple[str, Any]] = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before)
+    db = SessionLocal()
+    try:
+        ItemsRepository(db).search(TENANT_ID, **filters)
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", _before)
+
+    assert len(captured) == 1
+    return captured[0]
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+def _explain(**filters: Any) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    検索 SQL の実行計画を取得
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, str]]: (プランノードのリスト, 使用インデックス名 → 定義)
+    """
+    statement, parameters = _capture_search(**filters)
+    with engine.connect() as conn:
+        with conn.begin():
+            conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            result = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+            nodes = _plan_nodes(result[0]["Plan"])
+            index_names = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+            definitions = dict(conn.execute(
+                text("SELECT indexname, indexdef FROM pg_indexes WHERE indexname = ANY(:names)"),
+                {"names": index_names},
+            ).all())
+    return nodes, definitions
+
+
+def _assert_no_seq_scan(nodes: List[Dict[str, Any]]) -> None:
+    scans = [node for node in nodes if node["Node Type"] == "Seq Scan"]
+    assert not scans, f"sequential scan on {[node.get('Relation Name') for node in scans]}"
+
+
+def test_name_prefix_uses_trigram_index(seeded):
+    nodes, definitions = _explain(name_prefix="indexed item 0001", limit=20)
+
+    _assert_no_seq_scan(nodes)
+    assert any("gin_trgm_ops" in definition for definition in definitions.values()), definitions
+
+
+def test_name_contains_uses_trigram_index(seeded):
+    nodes, definitions = _explain(name_contains="item 0001", limit=20)
+
+    _assert_no_seq_scan(nodes)
+    assert any("gin_trgm_ops" in definition for definition in definitions.values()), definitions
+
+
+def test_created_at_range_uses_tenant_created_at_index(seeded):
+    nodes, definitions = _explain(
+        created_after=datetime(2025, 1, 1, 1),
+        created_before=datetime(2025, 1, 1, 2),
+        limit=20,
+    )
+
+    _assert_no_seq_scan(nodes)
+    assert any("(tenant_id, created_at)" in definition for definition in definitions.values()), definitions
+    # 範囲条件がインデックス条件として使われている（取得後のフィルタではない）
+    index_conditions = " ".join(node.get("Index Cond", "") for node in nodes)
+    assert "created_at" in index_conditions
+
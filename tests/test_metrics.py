@@ -0,0 +1,173 @@
+"""
+DogStatsD カスタムメトリクス（クライアント側集約）
+
+目的: 集約（counter 合算、gauge 最終値、histogram / distribution のサンプル）、パケット分割、
+      カーディナリティガードを、ローカルのUDP受信（scripts/fake_datadog_agent.py）で受け取った行で確認する
+影響範囲: metrics.py
+前提条件: msgpack（fake_datadog_agent.py のインポートに必要）
+
+注意:
+    - 受信側は空きポート（0 指定）で起動する（実 Agent・他のテストと衝突しない）
+"""
+
+import os
+import sys
+import time
+from typing import List
+
+import pytest
+
+from infrastructure.metrics import MetricsClient, tenant_tag
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from fake_datadog_agent import FakeAgent  # noqa: E402
+
+CONSTANT_TAGS = ["service:demo-api", "env:test"]
+
+
+@pytest.fixture(scope="module")
+def running_agent():
+    fake = FakeAgent(trace_port=0, statsd_port=0).start()
+    try:
+        yield fake
+    finally:
+        fake.stop()
+
+
+@pytest.fixture
+def agent(running_agent):
+    running_agent.stats.reset()
+    return running_agent
+
+
+def _client(agent: FakeAgent, **kwargs) -> MetricsClient:
+    host, port = agent.addresses[1]
+    options = dict(namespace="demo", constant_tags=CONSTANT_TAGS, flush_interval=60.0)
+    options.update(kwargs)
+    return MetricsClient(host, port, **options)
+
+
+def _received(agent: FakeAgent, lines: int, timeout: float = 2.0) -> List[str]:
+    deadline = time.monotonic() + timeout
+    while agent.stats.metric_lines < lines and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return list(agent.stats.recent_lines)
+
+
+def test_counters_are_summed_per_tag_set(agent):
+    client = _client(agent)
+    for _ in range(3):
+        client.increment("items.created", tags=["tenant:tenant-a"])
+    client.increment("items.created", 2, tags=["tenant:tenant-b"])
+
+    assert client.flush() == 1
+    lines = _received(agent, 2)
+    assert sorted(lines) == [
+        "demo.items.created:2|c|#service:demo-api,env:test,tenant:tenant-b",
+        "demo.items.created:3|c|#service:demo-api,env:test,tenant:tenant-a",
+    ]
+    assert agent.stats.metric_packets == 1
+
+
+def test_gauge_sends_last_value(agent):
+    client = _client(agent, constant_tags=None)
+    client.gauge("queue.depth", 5)
+    client.gauge("queue.depth", 2.5)
+
+    client.flush()
+    assert _received(agent, 1) == ["demo.queue.depth:2.5|g"]
+
+
+def test_histogram_and_distribution_send_all_samples(agent):
+    client = _client(agent, constant_tags=None)
+    for value in (1, 2, 3):
+        client.histogram("list.size", value)
+    client.distribution("latency_ms", 12.5)
+
+    client.flush()
+    assert sorted(_received(agent, 2)) == ["demo.latency_ms:12.5|d", "demo.list.size:1:2:3|h"]
+
+
+def test_samples_over_limit_carry_sample_rate(agent):
+    client = _client(agent, constant_tags=None, max_samples=10)
+    for value in range(40):
+        client.histogram("list.size", value)
+
+    client.flush()
+    (line,) = _received(agent, 1)
+    name, _, rest = line.partition(":")
+    values, metric_type, rate = rest.split("|")
+    assert name == "demo.list.size"
+    assert metric_type == "h"
+    assert len(values.split(":")) == 10
+    assert rate == "@0.25"
+
+
+def test_packets_stay_within_max_packet_size(agent):
+    client = _client(agent, max_packet_size=512)
+    for index in range(200):
+        client.increment(f"metric.{index}")
+
+    packets = client.flush()
+    lines = _received(agent, 200)
+    assert len(lines) == 200
+    assert agent.stats.metric_packets == packets > 1
+    assert agent.stats.metric_bytes <= packets * 512
+
+
+def test_nothing_is_resent_after_flush(agent):
+    client = _client(agent)
+    client.increment("items.created")
+    client.flush()
+    _received(agent, 1)
+
+    assert client.flush() == 0
+    time.sleep(0.1)
+    assert agent.stats.metric_lines == 1
+
+
+def test_cardinality_overflow(agent):
+    client = _client(agent, constant_tags=None, max_contexts_per_metric=2)
+    for index in range(5):
+        client.increment("requests", tags=[f"user:{index}"])
+
+    client.flush()
+    assert sorted(_received(agent, 4)) == [
+        "demo.metrics.cardinality_overflow:3|c",
+        "demo.requests:1|c|#user:0",
+        "demo.requests:1|c|#user:1",
+        "demo.requests:3|c|#cardinality:overflow",
+    ]
+
+
+def test_tenant_tag_only_allows_valid_tenants():
+    assert tenant_tag("tenant-a") == "tenant:tenant-a"
+    assert tenant_tag("../../etc/passwd") == "tenant:unknown"
+
+
+def test_disabled_client_sends_nothing(agent):
+    client = _client(agent, enabled=False)
+    client.increment("items.created")
+    client.histogram("list.size", 1)
+
+    assert client.flush() == 0
+    time.sleep(0.1)
+    assert agent.stats.metric_packets == 0
+
+
+def test_stop_flushes_remaining_metrics(agent):
+    client = _client(agent, constant_tags=None)
+    client.start()
+    client.increment("shutdown.flushed")
+    client.stop()
+
+    assert _received(agent, 1) == ["demo.shutdown.flushed:1|c"]
+
+
+def test_unreachable_agent_does_not_raise():
+    client = MetricsClient("agent.invalid", 8125, flush_interval=60.0)
+    client.increment("items.created")
+
+    assert client.flush() == 1
+    assert client._send_errors == 1
@@ -0,0 +1,114 @@
+"""
+サンプリングプロファイラ（POST /admin/diagnostics/profile）
+
+目的: CPU を使い続けるハンドラを実行中にプロファイルを取得し、その関数が出力の先頭に現れることを確認する
+影響範囲: profiler.py、diagnostics_controller.py
+前提条件: conftest.py（client、ADMIN_TOKEN）
+"""
+
+import threading
+import time
+
+import pytest
+from fastapi import APIRouter
+
+from infrastructure.profiler import ProfilerBusyError, SamplingProfiler
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-admin-token"}
+
+synthetic_router = APIRouter()
+
+
+def synthetic_hot_function(seconds: float) -> int:
+    # 関数呼び出しを含まないループ（サンプルの先端が常にこの関数になる）
+    deadline = time.perf_counter() + seconds
+    iterations = 0
+    while time.perf_counter() < deadline:
+        iterations += 1
+    return iterations
+
+
+@synthetic_router.get("/test-only/cpu")
+def synthetic_cpu_handler(seconds: float = 1.5):
+    return {"iterations": synthetic_hot_function(seconds)}
+
+
+@pytest.fixture(scope="module")
+def cpu_client(app, client):
+    app.include_router(synthetic_router)
+    return client
+
+
+def _leaf_samples(collapsed: str):
+    """
+    collapsed stacks を (先端の関数名, サンプル数) のリストに変換（出力順を保つ）
+    """
+    result = []
+    for line in collapsed.strip().splitlines():
+        stack, _, count = line.rpartition(" ")
+        leaf = stack.split(";")[-1].split(" (")[0]
+        result.append((leaf, int(count)))
+    return result
+
+
+def test_profile_finds_hot_function(cpu_client):
+    handler = threading.Thread(target=cpu_client.get, args=("/test-only/cpu?seconds=1.5",))
+    handler.start()
+    time.sleep(0.2)
+    try:
+        response = cpu_client.post(
+            "/admin/diagnostics/profile",
+            params={"seconds": 1, "interval_ms": 5},
+            headers=ADMIN_HEADERS,
+        )
+    finally:
+        handler.join()
+
+    assert response.status_code == 200
+    samples = _leaf_samples(response.text)
+    assert samples, "profile returned no samples"
+
+    # 最も多いスタックの先端が合成ハンドラのホット関数
+    assert samples[0][0] == "synthetic_hot_function"
+    hot = sum(count for leaf, count in samples if leaf == "synthetic_hot_function")
+    assert hot / sum(count for _, count in samples) > 0.5
+    assert int(response.headers["X-Profile-Samples"]) == sum(count for _, count in samples)
+
+
+def test_profile_speedscope_output(cpu_client):
+    response = cpu_client.post(
+        "/admin/diagnostics/profile",
+        params={"seconds": 0.1, "output": "speedscope", "idle": True},
+        headers=ADMIN_HEADERS,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+    assert body["profiles"]
+    frames = body["shared"]["frames"]
+    for profile in body["profiles"]:
+        assert len(profile["samples"]) == len(profile["weights"])
+        assert all(index < len(frames) for stack in profile["samples"] for index in stack)
+
+
+def test_profile_requires_admin_token(cpu_client):
+    response = cpu_client.post("/admin/diagnostics/profile", params={"seconds": 0.1})
+    assert response.status_code == 401
+
+
+def test_profile_duration_cap(cpu_client):
+    response = cpu_client.post("/admin/diagnostics/profile", params={"seconds": 100000}, headers=ADMIN_HEADERS)
+    assert response.status_code == 400
+
+
+def test_only_one_profile_at_a_time():
+    profiler = SamplingProfiler()
+    runner = threading.Thread(target=profiler.run, args=(0.5,))
+    runner.start()
+    time.sleep(0.1)
+    try:
+        with pytest.raises(ProfilerBusyError):
+            profiler.run(0.1)
+    finally:
+        runner.join()
+    assert not profiler.running
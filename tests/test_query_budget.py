@@ -0,0 +1,87 @@
+"""
+エンドポイント別のクエリ数上限（query_budget）
+
+目的: 各エンドポイントが発行する statement 数を固定し、N+1 等によるクエリ数の増加を回帰として検出する
+影響範囲: items_controller.py、items_service.py、items_repository.py
+前提条件: conftest.py（client）
+
+注意:
+    - 上限を変更する場合は、増えた statement（QueryBudgetExceeded のメッセージに一覧が出る）を確認すること
+    - 更新（update）の操作は API・サービスともに存在しないため対象外。
+      削除は HTTP エンドポイントがないため ItemsService.delete_item を直接検証する
+"""
+
+import pytest
+
+from infrastructure.query_stats import QueryBudgetExceeded, query_budget
+from repositories.database import SessionLocal
+from services.items_service import ItemsService
+
+TENANT_ID = "tenant-c"
+
+
+@pytest.fixture
+def item_id(client) -> int:
+    response = client.post(f"/{TENANT_ID}/items", json={"name": "budget", "description": "query budget"})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_list_items_budget(client, item_id):
+    # 検証子（件数・最終更新日時）+ 一覧
+    with query_budget(2):
+        response = client.get(f"/{TENANT_ID}/items")
+    assert response.status_code == 200
+    assert any(item["id"] == item_id for item in response.json())
+
+
+def test_list_items_not_modified_budget(client, item_id):
+    etag = client.get(f"/{TENANT_ID}/items").headers["ETag"]
+    # 304 の場合は検証子のみ（一覧は読み込まない）
+    with query_budget(1):
+        response = client.get(f"/{TENANT_ID}/items", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_search_items_budget(client, item_id):
+    with query_budget(2):
+        response = client.get(f"/{TENANT_ID}/items", params={"name_prefix": "budg", "limit": 10})
+    assert response.status_code == 200
+
+
+def test_create_item_budget(client):
+    # INSERT + 採番値・既定値の再読み込み
+    with query_budget(2):
+        response = client.post(f"/{TENANT_ID}/items", json={"name": "created"})
+    assert response.status_code == 201
+
+
+def test_get_item_budget(client, item_id):
+    with query_budget(1):
+        response = client.get(f"/{TENANT_ID}/items/{item_id}")
+    assert response.status_code == 200
+
+
+def test_get_missing_item_budget(client):
+    with query_budget(1):
+        response = client.get(f"/{TENANT_ID}/items/999999999")
+    assert response.status_code == 404
+
+
+def test_delete_item_budget(client, item_id):
+    db = SessionLocal()
+    try:
+        # 存在確認の SELECT + DELETE
+        with query_budget(2):
+            assert ItemsService(db).delete_item(TENANT_ID, item_id) is True
+    finally:
+        db.close()
+
+
+def test_budget_exceeded_lists_statements(client, item_id):
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        with query_budget(1):
+            client.get(f"/{TENANT_ID}/items")
+    message = str(excinfo.value)
+    assert "Expected at most 1 queries, 2 were executed" in message
+    assert "FROM items" in message
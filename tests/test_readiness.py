@@ -0,0 +1,49 @@
+"""
+レディネスによるALBヘルスチェックの制御
+
+目的: ウォームアップ未完了・ドレイン中は ALB のヘルスチェック（GET /{tenant_id}/health）が503を返し、
+      DBへ問い合わせないことを確認する（ライブネス GET /health は影響を受けない）
+影響範囲: health_controller.py、readiness.py
+前提条件: conftest.py（client）
+"""
+
+import pytest
+
+from infrastructure.query_stats import query_budget
+from infrastructure.readiness import ReadinessState, readiness
+
+
+@pytest.fixture
+def readiness_status():
+    """
+    レディネスの状態を一時的に変更する（テスト後に元へ戻す）
+    """
+    original = readiness._status
+
+    def set_status(status: str) -> None:
+        readiness._status = status
+
+    yield set_status
+    readiness._status = original
+
+
+def test_tenant_health_is_ok_when_ready(client):
+    with query_budget(1):
+        response = client.get("/tenant-a/health")
+
+    assert response.status_code == 200
+    assert response.json()["database"] == "connected"
+
+
+@pytest.mark.parametrize("status", [ReadinessState.WARMING_UP, ReadinessState.DRAINING])
+def test_tenant_health_fails_until_ready(client, readiness_status, status):
+    readiness_status(status)
+
+    with query_budget(0):
+        response = client.get("/tenant-a/health")
+
+    assert response.status_code == 503
+    assert response.json()["readiness"] == status
+    assert client.get("/ready").status_code == 503
+    # ライブネス（コンテナのヘルスチェック）は再起動させない
+    assert client.get("/health").status_code == 200
@@ -0,0 +1,75 @@
+"""
+スレッドプールの上限・待ち時間計測
+
+目的: THREADPOOL_LIMIT が AnyIO の公開APIで設定され、FastAPI の同期処理の待ち時間が
+      timed_run_in_threadpool で計測されることを確認する
+      （FastAPI が run_in_threadpool の参照元を変えた場合に失敗する）
+影響範囲: runtime_monitor.py、main.py（startup イベントの configure_threadpool）
+前提条件: conftest.py（client）
+"""
+
+import threading
+import time
+
+import anyio
+import anyio.to_thread
+import pytest
+
+import infrastructure.runtime_monitor as runtime_monitor
+from config.settings import settings
+from infrastructure.runtime_monitor import _THREADPOOL_CALLERS, timed_run_in_threadpool
+
+
+@pytest.fixture
+def wait_samples(monkeypatch):
+    """
+    threadpool.wait_ms に記録された値（ms）
+    """
+    samples = []
+    original = runtime_monitor.metrics.histogram
+
+    def histogram(name, value, *args, **kwargs):
+        if name == "threadpool.wait_ms":
+            samples.append(value)
+        return original(name, value, *args, **kwargs)
+
+    monkeypatch.setattr(runtime_monitor.metrics, "histogram", histogram)
+    return samples
+
+
+def test_threadpool_limit_is_configured(client):
+    async def total_tokens():
+        return anyio.to_thread.current_default_thread_limiter().total_tokens
+
+    assert client.portal.call(total_tokens) == settings.THREADPOOL_LIMIT
+
+
+@pytest.mark.parametrize("module", _THREADPOOL_CALLERS, ids=lambda module: module.__name__)
+def test_fastapi_runs_sync_code_through_timed_wrapper(client, module):
+    assert module.run_in_threadpool is timed_run_in_threadpool
+
+
+def test_sync_endpoint_records_wait(client, wait_samples):
+    response = client.get("/tenant-a/items?limit=1")
+
+    assert response.status_code == 200
+    # 依存関係（get_db）とエンドポイントの少なくとも2回
+    assert len(wait_samples) >= 2
+
+
+def test_wait_includes_time_for_a_free_worker(wait_samples):
+    release = threading.Event()
+
+    async def scenario():
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 1
+        async with anyio.create_task_group() as tasks:
+            tasks.start_soon(timed_run_in_threadpool, release.wait, 5)
+            await anyio.sleep(0.05)
+            tasks.start_soon(timed_run_in_threadpool, time.sleep, 0)
+            await anyio.sleep(0.2)
+            release.set()
+
+    anyio.run(scenario)
+
+    assert len(wait_samples) == 2
+    assert wait_samples[1] >= 150